@@ -0,0 +1,96 @@
+"""
+Shows how many queries a single event loop keeps in flight at the same time.
+
+Two scenarios are measured against the local database:
+
+1. ``--concurrency`` coroutines each run a query that takes ``--query-ms`` on the
+   server, first through a blocking psycopg connection (the event loop waits for
+   each query in turn) and then through the async engine (queries overlap, limited only
+   by DB_POOL_MAX_SIZE).
+2. GET /orders/ is called ``--requests`` times with ``--concurrency`` requests in
+   flight against one in-process instance of the app.
+
+Usage:
+    python benchmarks/bench_async_engine.py [--concurrency 50] [--query-ms 20] [--requests 1000]
+"""
+
+import argparse
+import asyncio
+import time
+
+import bench_utils
+
+
+async def blocking_query(seconds: float) -> None:
+    import psycopg
+    from db.db_sql_connection import get_conninfo
+
+    with psycopg.connect(get_conninfo()) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT pg_sleep(%s);", (seconds,))
+
+
+async def async_query(seconds: float) -> None:
+    from db.db_sql_connection import async_connect
+
+    async with async_connect() as conn:
+        async with conn.cursor() as cursor:
+            await cursor.execute("SELECT pg_sleep(%s);", (seconds,))
+
+
+async def run_slow_queries(concurrency: int, seconds: float) -> None:
+    from db.db_sql_connection import get_async_pool, DB_POOL_MAX_SIZE
+
+    pool = await get_async_pool()
+    await pool.wait()
+
+    for label, query in (("blocking driver", blocking_query), ("async engine", async_query)):
+        start = time.perf_counter()
+        await asyncio.gather(*(query(seconds) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        print(
+            f"{concurrency} x {seconds * 1000:.0f} ms queries, {label:<18} "
+            f"{elapsed * 1000:>9.1f} ms total   (pool max_size={DB_POOL_MAX_SIZE})"
+        )
+
+
+async def run_orders(concurrency: int, requests: int) -> None:
+    import httpx
+    from main import app
+
+    headers = bench_utils.auth_headers()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+
+        async def one_request() -> None:
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get("/orders/", headers=headers)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        await one_request()
+        latencies.clear()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one_request() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    bench_utils.summarize(f"GET /orders/, {concurrency} in flight", latencies, elapsed)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--query-ms", type=float, default=20)
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    await run_slow_queries(args.concurrency, args.query_ms / 1000)
+    await run_orders(args.concurrency, args.requests)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,117 @@
+"""
+Measures onboarding a venue's products and customers one call at a time vs.
+with the admin bulk-import endpoints.
+
+One call at a time is POST /products/ per product and POST /auth/register per
+customer. The bulk runs upload the same rows as CSV to POST /admin/import/products
+and POST /admin/import/customers. Requests go through ASGI to one in-process
+instance of the app; every row created is deleted at the end.
+
+Customer imports are dominated by bcrypt: their time depends on
+PASSWORD_HASH_WORKERS (the number of CPUs by default).
+
+Usage:
+    python benchmarks/bench_bulk_import.py [--products 500] [--customers 100]
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import time
+import uuid
+
+import bench_utils
+
+ADMIN_EMAIL = "marcos@example.com"
+PRODUCT_FIELDS = ["name", "description", "base_price", "category", "active"]
+CUSTOMER_FIELDS = ["full_name", "email", "phone", "address", "cpf_cnpj", "password_hash", "role"]
+
+
+def make_products(count: int):
+    categories = ["drink", "structure", "service"]
+    return [
+        {"name": f"Bulk product {index}", "description": "Imported", "base_price": 10 + index % 90,
+         "category": categories[index % 3], "active": True}
+        for index in range(count)
+    ]
+
+
+def make_customers(count: int, tag: str):
+    from tests.utils.utils import generate_cpf
+
+    return [
+        {"full_name": f"Bulk Customer {index}", "email": f"bulk-{tag}-{index}@example.com", "phone": "11999990000",
+         "address": "Rua do Teste, 1", "cpf_cnpj": generate_cpf(), "password_hash": "Bulk123!", "role": "customer"}
+        for index in range(count)
+    ]
+
+
+def to_csv(rows, fields) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields)
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue().encode()
+
+
+async def run(products: int, customers: int) -> None:
+    import httpx
+    import psycopg
+    from main import app
+    from db.db_sql_connection import get_conninfo
+
+    headers = bench_utils.auth_headers(ADMIN_EMAIL, "admin")
+    tag = uuid.uuid4().hex[:8]
+    created_products, created_customers = [], []
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None) as client:
+        rows = make_products(products)
+        start = time.perf_counter()
+        for row in rows:
+            response = await client.post("/products/", headers=headers, json=row)
+            response.raise_for_status()
+            created_products.append(response.json()["product"]["id"])
+        one_by_one = time.perf_counter() - start
+
+        start = time.perf_counter()
+        response = await client.post(
+            "/admin/import/products", headers=headers, files={"file": ("products.csv", to_csv(rows, PRODUCT_FIELDS), "text/csv")}
+        )
+        response.raise_for_status()
+        bulk = time.perf_counter() - start
+        created_products.extend(response.json()["ids"])
+        print(f"{products} products: {one_by_one * 1000:.0f} ms one call at a time, {bulk * 1000:.0f} ms bulk import")
+
+        rows = make_customers(customers, tag + "a")
+        start = time.perf_counter()
+        for row in rows:
+            response = await client.post("/auth/register", json=row)
+            response.raise_for_status()
+        one_by_one = time.perf_counter() - start
+
+        rows = make_customers(customers, tag + "b")
+        start = time.perf_counter()
+        response = await client.post(
+            "/admin/import/customers", headers=headers, files={"file": ("customers.csv", to_csv(rows, CUSTOMER_FIELDS), "text/csv")}
+        )
+        response.raise_for_status()
+        bulk = time.perf_counter() - start
+        print(f"{customers} customers: {one_by_one * 1000:.0f} ms one call at a time, {bulk * 1000:.0f} ms bulk import "
+              f"({response.json()['failed']} rows rejected)")
+
+    async with await psycopg.AsyncConnection.connect(get_conninfo()) as conn:
+        await conn.execute("DELETE FROM products WHERE id = ANY(%s);", (created_products,))
+        await conn.execute("DELETE FROM customers WHERE email LIKE %s;", (f"bulk-{tag}%",))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=500)
+    parser.add_argument("--customers", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(run(args.products, args.customers))
+
+
+if __name__ == "__main__":
+    main()
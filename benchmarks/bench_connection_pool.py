@@ -0,0 +1,59 @@
+"""
+Compares GET /orders/ throughput with and without the connection pool.
+
+Each mode runs in its own process because DB_POOL_ENABLED is read at import time.
+
+Usage:
+    python benchmarks/bench_connection_pool.py [--requests 500]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import bench_utils
+
+
+def run_child(requests: int) -> None:
+    from fastapi.testclient import TestClient
+    from main import app
+
+    headers = bench_utils.auth_headers()
+    with TestClient(app) as client:
+        latencies = bench_utils.measure(
+            lambda: client.get("/orders/", headers=headers).raise_for_status(), requests
+        )
+    print(json.dumps(latencies))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.requests)
+        return
+
+    results = {}
+    for label, enabled in (("without pool", "false"), ("with pool", "true")):
+        env = {**os.environ, "DB_POOL_ENABLED": enabled}
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", "--requests", str(args.requests)],
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        latencies = json.loads(output.strip().splitlines()[-1])
+        results[label] = bench_utils.summarize(f"GET /orders/ {label}", latencies)
+
+    speedup = results["with pool"]["rps"] / results["without pool"]["rps"]
+    print(f"speedup: {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
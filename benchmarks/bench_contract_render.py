@@ -0,0 +1,109 @@
+"""
+Measures contract rendering (POST /contracts/{id}/render) and downloads
+(GET /contracts/download/).
+
+For an existing contract (``--contract-id``), ``--renders`` times each:
+
+- renders the template text, parsing the source every time vs. the template
+  precompiled once (compile_contract_templates + ModuleLoader);
+- renders the contract with ContractRenderer, forced (query, render on a worker
+  process, store) vs. unchanged data (query and a cache hit in the store);
+- downloads it through ASGI: the whole file, a 1 KiB Range and a revalidation
+  with If-None-Match (304).
+
+The store and the compiled templates go to a temporary folder. The contract's
+pdf_file is restored at the end.
+
+Usage:
+    python benchmarks/bench_contract_render.py [--renders 500] [--contract-id 8001] [--workers 1]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import bench_utils
+
+
+async def run(renders: int, contract_id: int, workers: int) -> None:
+    directory = tempfile.mkdtemp()
+    os.environ.update(
+        CONTRACT_STORE_DIR=os.path.join(directory, "store"),
+        CONTRACT_TEMPLATE_CACHE_DIR=os.path.join(directory, "templates"),
+        CONTRACT_RENDER_WORKERS=str(workers),
+        INVOICE_RENDER_ENABLED="false",
+    )
+    import httpx
+    from jinja2 import FileSystemLoader
+    from main import app
+    from db.CRUD.read import get_contract_pdf, get_contract_render_data
+    from db.CRUD.update import update_contract_pdf
+    from utils.utils_contract_renderer import (
+        CONTRACT_TEMPLATE,
+        CONTRACT_TEMPLATE_DIR,
+        contract_environment,
+        contract_renderer,
+        load_contract_template,
+    )
+
+    original = await get_contract_pdf(contract_id)
+    if original is None:
+        raise SystemExit(f"Contract {contract_id} not found; load database/02_base_data.sql first.")
+    data = await get_contract_render_data(contract_id)
+    data.pop("pdf_file")
+
+    async def time_calls(label: str, call) -> None:
+        latencies = []
+        for _ in range(renders):
+            start = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - start)
+        bench_utils.summarize(label, latencies)
+
+    async with app.router.lifespan_context(app):
+        print(f"--- template text, contract {contract_id} ---")
+        source = open(os.path.join(CONTRACT_TEMPLATE_DIR, CONTRACT_TEMPLATE), encoding="utf-8").read()
+        env = contract_environment(FileSystemLoader(CONTRACT_TEMPLATE_DIR))
+        compiled = load_contract_template(contract_renderer._compile())
+
+        async def parse_and_render():
+            env.from_string(source).render(**data)
+
+        async def precompiled():
+            compiled.render(**data)
+
+        await time_calls("parsed on every render", parse_and_render)
+        await time_calls("precompiled", precompiled)
+
+        print(f"\n--- ContractRenderer, {workers} workers ---")
+        await contract_renderer.render(contract_id, force=True)  # start the worker processes
+        await time_calls("forced render", lambda: contract_renderer.render(contract_id, force=True))
+        await time_calls("unchanged data (cache hit)", lambda: contract_renderer.render(contract_id))
+
+        print("\n--- GET /contracts/download/ ---")
+        headers = bench_utils.auth_headers()
+        url = f"/contracts/download/?contract_id={contract_id}"
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            response = await client.get(url, headers=headers)
+            response.raise_for_status()
+            etag, size = response.headers["etag"], len(response.content)
+            await time_calls(f"whole file ({size / 1024:.1f} KiB)", lambda: client.get(url, headers=headers))
+            await time_calls("Range bytes=0-1023", lambda: client.get(url, headers={**headers, "Range": "bytes=0-1023"}))
+            await time_calls("If-None-Match (304)", lambda: client.get(url, headers={**headers, "If-None-Match": etag}))
+
+        await update_contract_pdf(contract_id, original["pdf_file"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--renders", type=int, default=500)
+    parser.add_argument("--contract-id", type=int, default=8001)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(run(args.renders, args.contract_id, args.workers))
+
+
+if __name__ == "__main__":
+    main()
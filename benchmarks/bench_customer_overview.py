@@ -0,0 +1,48 @@
+"""
+Compares loading a customer page with six requests against GET /customers/{id}/overview.
+
+The six requests are the per-collection endpoints of route_customers_data.py
+(events, orders, payments, invoices, contracts and order_items), called one after
+the other as the frontend does. Latency is per page load.
+
+Usage:
+    python benchmarks/bench_customer_overview.py [--customer-id 1001] [--iterations 300]
+"""
+
+import argparse
+
+import bench_utils
+
+COLLECTIONS = ("events", "orders", "payments", "invoices", "contracts", "order_items")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--customer-id", type=int, default=1001)
+    parser.add_argument("--iterations", type=int, default=300)
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+    from main import app
+
+    headers = bench_utils.auth_headers()
+    base = f"/customers/{args.customer_id}"
+
+    def six_calls() -> None:
+        for collection in COLLECTIONS:
+            response = client.get(f"{base}/{collection}", headers=headers)
+            if response.status_code not in (200, 404):
+                response.raise_for_status()
+
+    def overview() -> None:
+        client.get(f"{base}/overview", headers=headers).raise_for_status()
+
+    with TestClient(app) as client:
+        separate = bench_utils.summarize("six separate calls", bench_utils.measure(six_calls, args.iterations))
+        single = bench_utils.summarize("GET /overview", bench_utils.measure(overview, args.iterations))
+
+    print(f"speedup: {single['rps'] / separate['rps']:.2f}x page loads per second")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Measures GET /events/availability and the overlap check of event bookings at 1M
+events, before and after database/migrations/005_events_no_overlap.sql.
+
+The script creates a scratch schema from database/01_tables.sql (plus the
+calendar index of migration 004) with ``--events`` non-overlapping events spread
+over three years and ``--locations`` locations. It times the bookings query of
+one location over a random month, and single-event inserts, first without any
+overlap check (the availability query then filters on event_date), then with the
+migration applied, which also times rejected conflicting inserts. The migration
+uses the btree_gist exclusion constraint when the extension is available and the
+trigger fallback otherwise; the script prints which one ran. The scratch schema is
+dropped at the end, so the data in the public schema is not touched.
+
+Usage:
+    python benchmarks/bench_events_availability.py [--events 1000000] [--locations 200] [--repeat 50]
+"""
+
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import psycopg
+
+import bench_utils  # noqa: F401  (adds src/ to sys.path)
+from db.db_sql_connection import get_conninfo
+from utils.utils_scheduling import free_slots
+
+DATABASE_DIR = Path(__file__).resolve().parent.parent / "database"
+SCHEMA = "bench_events_availability"
+START = datetime(2024, 1, 1)
+DAYS = 3 * 365
+
+# Bookings of a location without the period index: a range on event_date
+BOOKINGS_BEFORE = """
+    SELECT id, event_date AS start, event_date + duration_hours * INTERVAL '1 hour' AS "end"
+    FROM events
+    WHERE location = %(location)s
+      AND event_date < %(date_to)s
+      AND event_date + duration_hours * INTERVAL '1 hour' > %(date_from)s
+    ORDER BY event_date;
+"""
+# Same statement as get_location_bookings
+BOOKINGS_AFTER = """
+    SELECT id, event_date AS start, upper(event_period(event_date, duration_hours)) AS "end"
+    FROM events
+    WHERE location = %(location)s
+      AND event_period(event_date, duration_hours) && tsrange(%(date_from)s, %(date_to)s)
+      AND id <> 0
+    ORDER BY event_date;
+"""
+INSERT = """
+    INSERT INTO events (customer_id, event_type, event_date, location, guest_count, duration_hours)
+    VALUES (1, 'wedding', %(event_date)s, %(location)s, 100, %(duration_hours)s) RETURNING id;
+"""
+
+
+def create_schema(conn: psycopg.Connection, events: int, locations: int) -> None:
+    """
+    Loads events back to back per location: each location gets one event every
+    `slot` hours, lasting 1 to slot - 1 hours, so none of them overlap.
+    """
+    slot_hours = max(DAYS * 24 * locations // events, 2)
+    conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;")
+    conn.execute(f"CREATE SCHEMA {SCHEMA};")
+    conn.execute(f"SET search_path TO {SCHEMA}, public;")
+    conn.execute((DATABASE_DIR / "01_tables.sql").read_text())
+    conn.execute((DATABASE_DIR / "migrations" / "004_events_calendar_index.sql").read_text())
+    conn.execute(
+        """
+        INSERT INTO customers (full_name, email, cpf_cnpj, password_hash)
+        VALUES ('Customer', 'customer@example.com', '00000000001', 'hash');
+        """
+    )
+    conn.execute(
+        """
+        INSERT INTO events (customer_id, event_type, event_date, location, guest_count, duration_hours)
+        SELECT 1, 'wedding', %(start)s + (g / %(locations)s) * %(slot)s * INTERVAL '1 hour',
+               'Location ' || g %% %(locations)s, 100, 1 + g %% (%(slot)s - 1)
+        FROM generate_series(0, %(events)s - 1) g;
+        """,
+        {"start": START, "events": events, "locations": locations, "slot": slot_hours},
+    )
+    conn.execute("VACUUM ANALYZE events;")
+
+
+def random_month(locations: int) -> dict:
+    date_from = START + timedelta(days=random.randint(0, DAYS - 31))
+    return {"date_from": date_from, "date_to": date_from + timedelta(days=30),
+            "location": f"Location {random.randint(0, locations - 1)}"}
+
+
+def plan_summary(conn: psycopg.Connection, query: str, params: dict) -> str:
+    rows = conn.execute(f"EXPLAIN (ANALYZE, COSTS OFF, TIMING OFF) {query}", params).fetchall()
+    return "; ".join(row[0].strip().lstrip("-> ") for row in rows if "Scan" in row[0])
+
+
+def time_availability(conn: psycopg.Connection, label: str, query: str, locations: int, repeat: int) -> None:
+    latencies, slots = [], []
+    for _ in range(repeat):
+        params = random_month(locations)
+        start = time.perf_counter()
+        cursor = conn.execute(query, params)
+        columns = [desc[0] for desc in cursor.description]
+        bookings = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        free = free_slots(bookings, params["date_from"], params["date_to"])
+        latencies.append((time.perf_counter() - start) * 1000)
+        slots.append(len(free))
+    print(f"{label:<36} p50 {statistics.median(latencies):>8.2f} ms   ({statistics.median(slots):.0f} free slots)")
+    print(f"    plan: {plan_summary(conn, query, random_month(locations))}")
+
+
+def time_inserts(conn: psycopg.Connection, label: str, repeat: int, conflicting: bool = False) -> None:
+    """
+    Books a new location `repeat` times (or a conflicting slot at a busy one) and
+    prints the median latency. Inserted rows are deleted afterwards.
+    """
+    latencies, ids, rejected = [], [], 0
+    for n in range(repeat):
+        params = {"event_date": START + timedelta(days=n), "location": "Location 0" if conflicting else "New venue",
+                  "duration_hours": 4}
+        start = time.perf_counter()
+        try:
+            with conn.transaction():
+                ids.append(conn.execute(INSERT, params).fetchone()[0])
+        except psycopg.errors.ExclusionViolation:
+            rejected += 1
+        latencies.append((time.perf_counter() - start) * 1000)
+    conn.execute("DELETE FROM events WHERE id = ANY(%s);", (ids,))
+    print(f"{label:<36} p50 {statistics.median(latencies):>8.3f} ms   ({rejected} rejected)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--locations", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    # prepared statements would outlive the scratch schema
+    with psycopg.connect(get_conninfo(), autocommit=True, prepare_threshold=None) as conn:
+        try:
+            start = time.perf_counter()
+            create_schema(conn, args.events, args.locations)
+            print(f"=== {args.events:,} events at {args.locations} locations, "
+                  f"loaded in {time.perf_counter() - start:.1f} s ===")
+
+            print("\n--- without overlap check ---")
+            time_availability(conn, "availability, one location, 30 days", BOOKINGS_BEFORE, args.locations, args.repeat)
+            time_inserts(conn, "insert event", args.repeat)
+
+            start = time.perf_counter()
+            conn.execute((DATABASE_DIR / "migrations" / "005_events_no_overlap.sql").read_text())
+            conn.execute("VACUUM ANALYZE events;")
+            mode = conn.execute(
+                "SELECT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'events_no_overlap');"
+            ).fetchone()[0]
+            print(f"\n--- with {'exclusion constraint' if mode else 'trigger fallback (no btree_gist)'}, "
+                  f"migration {time.perf_counter() - start:.1f} s ---")
+            time_availability(conn, "availability, one location, 30 days", BOOKINGS_AFTER, args.locations, args.repeat)
+            time_inserts(conn, "insert event", args.repeat)
+            time_inserts(conn, "insert conflicting event", args.repeat, conflicting=True)
+        finally:
+            conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;")
+
+
+if __name__ == "__main__":
+    main()
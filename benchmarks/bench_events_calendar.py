@@ -0,0 +1,148 @@
+"""
+Measures GET /events/calendar queries at 1M events, without and with the
+(event_date, location) index of database/migrations/004_events_calendar_index.sql,
+in full and compact mode, against the previous approach of reading every event
+with get_all_events and filtering in the client.
+
+The script creates a scratch schema from database/01_tables.sql with ``--events``
+events spread over three years and ``--locations`` locations, and times the
+statements built by get_events_calendar for random months: one location over a
+whole month, and the first page (201 rows) of a month over every location. The
+plan and the JSON size of each response are printed. The scratch schema is
+dropped at the end, so the data in the public schema is not touched.
+
+Usage:
+    python benchmarks/bench_events_calendar.py [--events 1000000] [--locations 200] [--repeat 20]
+"""
+
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import psycopg
+
+import bench_utils  # noqa: F401  (adds src/ to sys.path)
+from db.db_sql_connection import get_conninfo
+from db.CRUD.read import CALENDAR_COLUMNS, CALENDAR_COMPACT_COLUMNS
+from utils.utils_json import dumps
+
+DATABASE_DIR = Path(__file__).resolve().parent.parent / "database"
+SCHEMA = "bench_events_calendar"
+START = datetime(2024, 1, 1)
+DAYS = 3 * 365
+
+# Same statements as get_events_calendar builds
+LOCATION_MONTH = """
+    SELECT {columns} FROM events
+    WHERE event_date >= %(date_from)s AND event_date < %(date_to)s AND location = %(location)s
+    ORDER BY event_date, id LIMIT %(limit)s;
+"""
+MONTH_PAGE = """
+    SELECT {columns} FROM events
+    WHERE event_date >= %(date_from)s AND event_date < %(date_to)s
+    ORDER BY event_date, id LIMIT %(limit)s;
+"""
+
+
+def create_schema(conn: psycopg.Connection, events: int, locations: int) -> None:
+    conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;")
+    conn.execute(f"CREATE SCHEMA {SCHEMA};")
+    conn.execute(f"SET search_path TO {SCHEMA}, public;")
+    conn.execute((DATABASE_DIR / "01_tables.sql").read_text())
+    conn.execute(
+        """
+        INSERT INTO customers (full_name, email, cpf_cnpj, password_hash)
+        SELECT 'Customer ' || g, 'customer' || g || '@example.com', lpad(g::text, 11, '0'), 'hash'
+        FROM generate_series(1, 1000) g;
+        """
+    )
+    conn.execute(
+        """
+        INSERT INTO events (customer_id, event_type, event_date, location, guest_count, duration_hours)
+        SELECT 1 + g %% 1000, (ARRAY['wedding', 'corporate', 'debutante', 'other'])[1 + g %% 4]::event_type,
+               %(start)s + random() * %(days)s * INTERVAL '1 day',
+               'Location ' || (random() * (%(locations)s - 1))::int, 50 + g %% 300, 5
+        FROM generate_series(1, %(events)s) g;
+        """,
+        {"start": START, "days": DAYS, "events": events, "locations": locations},
+    )
+    conn.execute("VACUUM ANALYZE events;")
+
+
+def random_month(locations: int) -> dict:
+    day = START + timedelta(days=random.randint(0, DAYS - 31))
+    date_from = day.replace(day=1)
+    date_to = (date_from + timedelta(days=32)).replace(day=1)
+    return {"date_from": date_from, "date_to": date_to,
+            "location": f"Location {random.randint(0, locations - 1)}", "limit": None}
+
+
+def plan_summary(conn: psycopg.Connection, query: str, params: dict) -> str:
+    rows = conn.execute(f"EXPLAIN (ANALYZE, COSTS OFF, TIMING OFF) {query}", params).fetchall()
+    nodes = [row[0].strip().lstrip("-> ") for row in rows if "Scan" in row[0] or "Sort" in row[0]]
+    return "; ".join(nodes)
+
+
+def time_query(conn: psycopg.Connection, label: str, query: str, locations: int, repeat: int, limit=None) -> None:
+    latencies, sizes = [], []
+    for _ in range(repeat):
+        params = {**random_month(locations), "limit": limit}
+        start = time.perf_counter()
+        cursor = conn.execute(query, params)
+        columns = [desc[0] for desc in cursor.description]
+        rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        latencies.append((time.perf_counter() - start) * 1000)
+        sizes.append(len(dumps(rows)))
+    print(f"{label:<44} p50 {statistics.median(latencies):>8.2f} ms   "
+          f"{statistics.median(sizes) / 1024:>7.1f} KiB")
+    print(f"    plan: {plan_summary(conn, query, {**random_month(locations), 'limit': limit})}")
+
+
+def run_queries(conn: psycopg.Connection, locations: int, repeat: int) -> None:
+    for mode, columns in (("full", CALENDAR_COLUMNS), ("compact", CALENDAR_COMPACT_COLUMNS)):
+        time_query(conn, f"one location, whole month, {mode}", LOCATION_MONTH.format(columns=columns), locations, repeat)
+        time_query(conn, f"all locations, first page of month, {mode}", MONTH_PAGE.format(columns=columns),
+                   locations, repeat, limit=201)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--locations", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    # prepared statements would outlive the scratch schema
+    with psycopg.connect(get_conninfo(), autocommit=True, prepare_threshold=None) as conn:
+        try:
+            start = time.perf_counter()
+            create_schema(conn, args.events, args.locations)
+            print(f"=== {args.events:,} events, loaded in {time.perf_counter() - start:.1f} s ===")
+
+            start = time.perf_counter()
+            cursor = conn.execute(f"SELECT {CALENDAR_COLUMNS} FROM events ORDER BY id;")
+            columns = [desc[0] for desc in cursor.description]
+            month = random_month(args.locations)
+            matches = [
+                row for row in (dict(zip(columns, values)) for values in cursor)
+                if month["date_from"] <= row["event_date"] < month["date_to"] and row["location"] == month["location"]
+            ]
+            print(f"get_all_events + client filter: {(time.perf_counter() - start) * 1000:.0f} ms "
+                  f"for {len(matches)} events")
+
+            print("\n--- without the calendar index ---")
+            run_queries(conn, args.locations, args.repeat)
+
+            conn.execute((DATABASE_DIR / "migrations" / "004_events_calendar_index.sql").read_text())
+            conn.execute("VACUUM ANALYZE events;")
+            print("\n--- with idx_events_event_date_location ---")
+            run_queries(conn, args.locations, args.repeat)
+        finally:
+            conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Measures time to first byte and peak Python memory of the streaming exports.
+
+With ``--seed N`` the script first inserts N synthetic orders (attached to the
+first event in the database) and removes them at the end, so the export is run
+against a table of known size.
+
+Usage:
+    python benchmarks/bench_exports.py [--seed 200000] [--format ndjson]
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+import bench_utils
+
+
+async def seed_orders(count: int) -> int:
+    from db.db_sql_connection import async_connect
+
+    async with async_connect() as conn:
+        async with conn.cursor() as cursor:
+            # The seed file inserts explicit ids, so move the sequence past them first
+            await cursor.execute("SELECT setval(pg_get_serial_sequence('orders', 'id'), (SELECT MAX(id) FROM orders));")
+            await cursor.execute(
+                """
+                INSERT INTO orders (event_id, total_amount, status)
+                SELECT (SELECT MIN(id) FROM events), (random() * 10000)::numeric(10, 2), 'pending'
+                FROM generate_series(1, %s)
+                RETURNING id;
+                """,
+                (count,),
+            )
+            return min(row[0] for row in await cursor.fetchall())
+
+
+async def remove_seeded_orders(first_id: int) -> None:
+    from db.db_sql_connection import async_connect
+
+    async with async_connect() as conn:
+        async with conn.cursor() as cursor:
+            await cursor.execute("DELETE FROM orders WHERE id >= %s;", (first_id,))
+
+
+async def stream_once(app, path: str, headers: dict, trace_memory: bool) -> dict:
+    """
+    Calls the ASGI app directly so chunks are observed as they are sent (an HTTP
+    client test transport would buffer the whole body) and discarded right away.
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path.split("?")[0],
+        "raw_path": path.split("?")[0].encode(),
+        "query_string": path.split("?")[1].encode() if "?" in path else b"",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        "server": ("bench", 80),
+        "client": ("127.0.0.1", 12345),
+    }
+    result = {"first_byte": None, "size": 0, "status": None}
+    request_sent = False
+    finished = asyncio.Event()
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Block like a real server until the response is complete
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            result["status"] = message["status"]
+        elif message["type"] == "http.response.body" and message.get("body"):
+            if result["first_byte"] is None:
+                result["first_byte"] = time.perf_counter() - start
+            result["size"] += len(message["body"])
+        if message["type"] == "http.response.body" and not message.get("more_body", False):
+            finished.set()
+
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    await app(scope, receive, send)
+    result["total"] = time.perf_counter() - start
+    if trace_memory:
+        result["peak"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    if result["status"] != 200:
+        raise RuntimeError(f"{path} returned HTTP {result['status']}")
+    return result
+
+
+async def run_export(export_format: str, seed: int) -> None:
+    from main import app
+    from db.db_sql_connection import close_async_pool, get_async_pool
+
+    await get_async_pool()
+    first_id = await seed_orders(seed) if seed else None
+    try:
+        await export_orders(app, export_format)
+    finally:
+        if first_id is not None:
+            await remove_seeded_orders(first_id)
+        await close_async_pool()
+
+
+async def export_orders(app, export_format: str) -> None:
+    headers = bench_utils.auth_headers(email="marcos@example.com", role="admin")
+    path = f"/exports/orders?format={export_format}"
+
+    timing = await stream_once(app, path, headers, trace_memory=False)
+    memory = await stream_once(app, path, headers, trace_memory=True)
+
+    print(path)
+    print(f"  time to first byte: {timing['first_byte'] * 1000:.1f} ms")
+    print(f"  total time:         {timing['total']:.2f} s for {timing['size'] / 1e6:.1f} MB")
+    print(f"  peak Python memory: {memory['peak'] / 1e6:.1f} MB (measured in a second run)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson")
+    args = parser.parse_args()
+
+    asyncio.run(run_export(args.format, args.seed))
+
+
+if __name__ == "__main__":
+    main()
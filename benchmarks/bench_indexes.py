@@ -0,0 +1,182 @@
+"""
+Measures the customer-scoped queries of db/CRUD/read.py before and after the
+foreign key indexes of database/migrations/001_foreign_key_indexes.sql.
+
+For each scale the script creates a scratch schema from database/01_tables.sql,
+fills it with synthetic rows (``scale`` orders, one order item, payment and
+invoice per order, four orders per event and five events per customer), runs
+every query ``--repeat`` times for random customers, applies the migration and
+runs them again. The plan of each query is printed for both runs. The scratch
+schema is dropped at the end, so the data in the public schema is not touched.
+
+Usage:
+    python benchmarks/bench_indexes.py [--scales 10000 100000 1000000] [--repeat 20]
+"""
+
+import argparse
+import random
+import statistics
+import time
+from pathlib import Path
+
+import psycopg
+
+import bench_utils  # noqa: F401  (adds src/ to sys.path)
+from db.db_sql_connection import get_conninfo
+
+DATABASE_DIR = Path(__file__).resolve().parent.parent / "database"
+SCHEMA = "bench_indexes"
+
+# Same statements as the *_by_customer_id readers in db/CRUD/read.py
+QUERIES = {
+    "events": "SELECT * FROM events WHERE customer_id = %s;",
+    "orders": """
+        SELECT o.* FROM orders o
+        JOIN events e ON o.event_id = e.id
+        WHERE e.customer_id = %s;
+    """,
+    "payments": """
+        SELECT p.* FROM payments p
+        JOIN orders o ON p.order_id = o.id
+        JOIN events e ON o.event_id = e.id
+        WHERE e.customer_id = %s;
+    """,
+    "invoices": """
+        SELECT i.* FROM invoices i
+        JOIN orders o ON i.order_id = o.id
+        JOIN events e ON o.event_id = e.id
+        WHERE e.customer_id = %s;
+    """,
+    "contracts": """
+        SELECT c.* FROM contracts c
+        JOIN events e ON c.event_id = e.id
+        WHERE e.customer_id = %s;
+    """,
+    "order_items": """
+        SELECT oi.* FROM order_items oi
+        JOIN orders o ON oi.order_id = o.id
+        JOIN events e ON o.event_id = e.id
+        WHERE e.customer_id = %s;
+    """,
+}
+
+LOAD_STATEMENTS = [
+    """
+    INSERT INTO customers (full_name, email, cpf_cnpj, password_hash)
+    SELECT 'Customer ' || g, 'customer' || g || '@example.com', lpad(g::text, 11, '0'), 'hash'
+    FROM generate_series(1, %(customers)s) g;
+    """,
+    """
+    INSERT INTO products (name, base_price, category)
+    SELECT 'Product ' || g, 10 + g, (ARRAY['drink', 'structure', 'service'])[1 + g %% 3]::product_type
+    FROM generate_series(1, 50) g;
+    """,
+    """
+    INSERT INTO events (customer_id, event_type, event_date, location, guest_count, duration_hours)
+    SELECT 1 + g %% %(customers)s, 'wedding', NOW() + g * INTERVAL '1 hour', 'Location ' || g %% 100, 100, 5
+    FROM generate_series(1, %(events)s) g;
+    """,
+    """
+    INSERT INTO orders (event_id, total_amount)
+    SELECT 1 + g %% %(events)s, 100
+    FROM generate_series(1, %(orders)s) g;
+    """,
+    """
+    INSERT INTO order_items (order_id, product_id, quantity, unit_price, total_price)
+    SELECT g, 1 + g %% 50, 2, 50, 100 FROM generate_series(1, %(orders)s) g;
+    """,
+    """
+    INSERT INTO payments (order_id, amount, payment_method)
+    SELECT g, 100, 'pix' FROM generate_series(1, %(orders)s) g;
+    """,
+    """
+    INSERT INTO invoices (order_id, invoice_number, issue_date, total_amount)
+    SELECT g, 'INV-' || g, NOW(), 100 FROM generate_series(1, %(orders)s) g;
+    """,
+    """
+    INSERT INTO contracts (event_id) SELECT g FROM generate_series(1, %(events)s) g;
+    """,
+]
+
+
+def create_schema(conn: psycopg.Connection, scale: int) -> int:
+    """
+    Creates the scratch schema, loads the synthetic rows and returns the customer count.
+    """
+    sizes = {"orders": scale, "events": max(scale // 4, 1)}
+    sizes["customers"] = max(sizes["events"] // 5, 1)
+
+    conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;")
+    conn.execute(f"CREATE SCHEMA {SCHEMA};")
+    conn.execute(f"SET search_path TO {SCHEMA}, public;")
+    conn.execute((DATABASE_DIR / "01_tables.sql").read_text())
+    for statement in LOAD_STATEMENTS:
+        conn.execute(statement, sizes)
+    conn.execute("ANALYZE;")
+    return sizes["customers"]
+
+
+def plan_summary(conn: psycopg.Connection, query: str, customer_id: int) -> str:
+    """
+    Returns the scan and join nodes of the query plan, one per line.
+    """
+    rows = conn.execute(f"EXPLAIN (ANALYZE, COSTS OFF, TIMING OFF) {query}", (customer_id,)).fetchall()
+    nodes = [row[0].strip().lstrip("-> ") for row in rows if "Scan" in row[0] or "Join" in row[0] or "Loop" in row[0]]
+    return "\n".join(f"      {node}" for node in nodes)
+
+
+def time_queries(conn: psycopg.Connection, customers: int, repeat: int) -> dict:
+    """
+    Runs every query for random customers and returns the median latency in milliseconds.
+    """
+    results = {}
+    for name, query in QUERIES.items():
+        latencies = []
+        for _ in range(repeat):
+            customer_id = random.randint(1, customers)
+            start = time.perf_counter()
+            conn.execute(query, (customer_id,)).fetchall()
+            latencies.append((time.perf_counter() - start) * 1000)
+        results[name] = statistics.median(latencies)
+    return results
+
+
+def run_scale(conn: psycopg.Connection, scale: int, repeat: int) -> None:
+    start = time.perf_counter()
+    customers = create_schema(conn, scale)
+    print(f"\n=== {scale:,} orders ({customers:,} customers), loaded in {time.perf_counter() - start:.1f} s ===")
+
+    probe_customer = random.randint(1, customers)
+    plans_before = {name: plan_summary(conn, query, probe_customer) for name, query in QUERIES.items()}
+    before = time_queries(conn, customers, repeat)
+
+    conn.execute((DATABASE_DIR / "migrations" / "001_foreign_key_indexes.sql").read_text())
+    conn.execute("ANALYZE;")
+
+    plans_after = {name: plan_summary(conn, query, probe_customer) for name, query in QUERIES.items()}
+    after = time_queries(conn, customers, repeat)
+
+    for name in QUERIES:
+        print(f"{name:<12} before {before[name]:>10.2f} ms   after {after[name]:>8.2f} ms   "
+              f"({before[name] / after[name]:.0f}x)")
+        print(f"    plan before:\n{plans_before[name]}")
+        print(f"    plan after:\n{plans_after[name]}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    # prepared statements would outlive the scratch schema that is recreated per scale
+    with psycopg.connect(get_conninfo(), autocommit=True, prepare_threshold=None) as conn:
+        try:
+            for scale in args.scales:
+                run_scale(conn, scale, args.repeat)
+        finally:
+            conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;")
+
+
+if __name__ == "__main__":
+    main()
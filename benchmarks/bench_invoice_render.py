@@ -0,0 +1,111 @@
+"""
+Measures the throughput of the invoice PDF pipeline (POST /invoices/{id}/render)
+on 10k invoices.
+
+The script adds ``--invoices`` invoices (numbered BENCH-n) to an existing order,
+then:
+
+- renders their data on the event loop and on process pools of ``--workers``
+  processes, without the database, to isolate the rendering cost;
+- queues a job per invoice and drains the queue with InvoiceRenderer, end to end
+  (claim, one data query per batch, render on the pool, record the results);
+- sends ``--concurrent`` simultaneous render requests for one invoice and counts
+  the jobs created, to check the deduplication.
+
+PDFs are written to a temporary folder. The invoices (and their jobs) are deleted
+at the end.
+
+Usage:
+    python benchmarks/bench_invoice_render.py [--invoices 10000] [--workers 1 2 4] [--order-id 3001]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import bench_utils  # noqa: F401  (adds src/ to sys.path)
+
+
+async def run(invoices: int, workers: list, order_id: int, batch_size: int, concurrent: int) -> None:
+    from db.db_sql_connection import async_connect, close_async_pool
+    from db.CRUD.create import create_invoice_render_job
+    from db.CRUD.read import get_invoice_render_data
+    from utils.utils_invoice_renderer import InvoiceRenderer, render_invoice_files
+
+    # explicit ids: the seed data leaves the invoices sequence behind
+    async with async_connect() as conn:
+        cursor = await conn.execute(
+            """
+            INSERT INTO invoices (id, order_id, invoice_number, issue_date, total_amount)
+            SELECT (SELECT COALESCE(MAX(id), 0) FROM invoices) + g, %s, 'BENCH-' || g, NOW(), 100 + g %% 1000
+            FROM generate_series(1, %s) g
+            RETURNING id;
+            """,
+            (order_id, invoices),
+        )
+        invoice_ids = [row[0] for row in await cursor.fetchall()]
+        await conn.commit()
+
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            print(f"=== {invoices:,} invoices of order {order_id} ===")
+
+            data = await get_invoice_render_data(invoice_ids)
+            batch = [{**invoice, "job_id": invoice["id"]} for invoice in data]
+            start = time.perf_counter()
+            render_invoice_files(batch, directory)
+            elapsed = time.perf_counter() - start
+            size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+            print(f"\n--- rendering only (average PDF {size / len(batch) / 1024:.1f} KiB) ---")
+            print(f"{'on the event loop':<36} {elapsed:>6.2f} s   {len(batch) / elapsed:>8,.0f} invoices/s")
+            for count in workers:
+                with ProcessPoolExecutor(max_workers=count) as executor:
+                    # start the processes before timing
+                    list(executor.map(abs, range(count)))
+                    start = time.perf_counter()
+                    chunks = [batch[n:n + batch_size] for n in range(0, len(batch), batch_size)]
+                    list(executor.map(render_invoice_files, chunks, [directory] * len(chunks)))
+                    elapsed = time.perf_counter() - start
+                print(f"{f'process pool, {count} workers':<36} {elapsed:>6.2f} s   {len(batch) / elapsed:>8,.0f} invoices/s")
+
+            print("\n--- queue to files (InvoiceRenderer) ---")
+            for count in workers:
+                async with async_connect() as conn:
+                    await conn.execute(
+                        "INSERT INTO invoice_render_jobs (invoice_id) SELECT unnest(%s::int[]);", (invoice_ids,)
+                    )
+                    await conn.commit()
+                renderer = InvoiceRenderer(directory, workers=count, batch_size=batch_size, poll_seconds=1,
+                                           stale_seconds=300, max_attempts=3)
+                start = time.perf_counter()
+                await renderer.run_pending()
+                elapsed = time.perf_counter() - start
+                await renderer.stop()
+                print(f"{f'{count} workers, batches of {batch_size}':<36} {elapsed:>6.2f} s   "
+                      f"{renderer.rendered / elapsed:>8,.0f} invoices/s   ({renderer.failed} failed)")
+
+            jobs = await asyncio.gather(*(create_invoice_render_job(invoice_ids[0]) for _ in range(concurrent)))
+            print(f"\n{concurrent} concurrent requests for one invoice: {len({job['id'] for job in jobs})} job queued")
+    finally:
+        async with async_connect() as conn:
+            await conn.execute("DELETE FROM invoices WHERE id = ANY(%s);", (invoice_ids,))
+            await conn.commit()
+        await close_async_pool()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--invoices", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--order-id", type=int, default=3001)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--concurrent", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.invoices, args.workers, args.order_id, args.batch_size, args.concurrent))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Measures the time to serialize a get_all_orders payload into a response body.
+
+Compares FastAPI's previous path (jsonable_encoder followed by the stdlib json
+module in JSONResponse) with FastJSONResponse (orjson, no jsonable_encoder pass).
+If the database holds fewer than ``--rows`` orders, the rows read are repeated
+with new IDs until the payload has the requested size.
+
+Usage:
+    python benchmarks/bench_json_response.py [--rows 10000] [--iterations 50]
+"""
+
+import argparse
+import asyncio
+
+import bench_utils
+
+
+async def load_orders(rows: int):
+    from db.CRUD.read import get_all_orders
+
+    orders = await get_all_orders(limit=rows)
+    if not orders:
+        raise SystemExit("The orders table is empty; load database/02_base_data.sql first.")
+
+    payload = list(orders)
+    while len(payload) < rows:
+        template = orders[len(payload) % len(orders)]
+        payload.append({**template, "id": len(payload) + 1})
+    return payload, len(orders)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from utils.utils_json import FastJSONResponse
+
+    orders, read = asyncio.run(load_orders(args.rows))
+    print(f"payload: {len(orders):,} orders ({read:,} read from the database)")
+
+    page = {"items": orders, "next_cursor": None}
+    stdlib = bench_utils.summarize(
+        "jsonable_encoder + json",
+        bench_utils.measure(lambda: JSONResponse(jsonable_encoder(page)), args.iterations, warmup=2),
+    )
+    fast = bench_utils.summarize(
+        "FastJSONResponse (orjson)",
+        bench_utils.measure(lambda: FastJSONResponse(page), args.iterations, warmup=2),
+    )
+    print(f"speedup: {stdlib['p50_ms'] / fast['p50_ms']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Measures the per-request overhead of MetricsMiddleware and the per-statement
+overhead of the instrumented database cursor.
+
+A minimal FastAPI app with one parametrized route is called directly through
+ASGI (no network, no database), with and without the middleware, so the
+difference is the cost of the metrics themselves. The cursor overhead is the
+cost of resolving the CRUD function name and recording one observation.
+
+Usage:
+    python benchmarks/bench_metrics_overhead.py [--requests 20000]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import bench_utils  # noqa: F401  (adds src/ to sys.path)
+
+
+def build_app(with_metrics: bool):
+    from fastapi import FastAPI
+    from utils.utils_metrics import MetricsMiddleware
+
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        return {"item_id": item_id}
+
+    if with_metrics:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def time_requests(app, requests: int) -> float:
+    """
+    Calls GET /items/{id} through ASGI and returns the median latency in microseconds.
+    """
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    latencies = []
+    for index in range(requests):
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": f"/items/{index}", "raw_path": f"/items/{index}".encode(),
+            "query_string": b"", "headers": [], "client": ("bench", 1), "server": ("bench", 80),
+        }
+        start = time.perf_counter()
+        await app(scope, receive, send)
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies[requests // 10:]) * 1_000_000
+
+
+def time_cursor_instrumentation(statements: int) -> float:
+    """
+    Returns the cost in microseconds of naming the caller and recording one statement.
+    """
+    from db.db_instrumentation import _caller_name
+    from utils.utils_metrics import db_query_duration_seconds
+
+    def get_all_orders():
+        return _caller_name()
+
+    def execute():
+        function = get_all_orders()
+        start = time.perf_counter()
+        db_query_duration_seconds.observe((function,), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(statements):
+        execute()
+    return (time.perf_counter() - start) / statements * 1_000_000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20_000)
+    args = parser.parse_args()
+
+    plain = await time_requests(build_app(False), args.requests)
+    metered = await time_requests(build_app(True), args.requests)
+    print(f"request without metrics   {plain:>8.1f} µs (median)")
+    print(f"request with metrics      {metered:>8.1f} µs (median)")
+    print(f"middleware overhead       {metered - plain:>8.1f} µs per request")
+    print(f"cursor instrumentation    {time_cursor_instrumentation(args.requests):>8.1f} µs per statement")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
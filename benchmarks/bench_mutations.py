@@ -0,0 +1,90 @@
+"""
+Measures the latency of one update/delete when the route looks the row up first
+vs. when the UPDATE/DELETE ... RETURNING call reports a missing row itself.
+
+"lookup + mutation" reproduces the previous routes: get_*_by_id on one connection,
+then update_* / delete_* on another. "single call" is what modify_order,
+modify_event, modify_product and the remove_* routes do now. Orders, events and
+products are updated in place (with their current values); deletes run against
+rows created for the benchmark.
+
+Usage:
+    python benchmarks/bench_mutations.py [--iterations 500] [--order-id 3001] [--event-id 2001] [--product-id 4001]
+"""
+
+import argparse
+import asyncio
+import time
+
+import bench_utils
+
+
+async def timed(label: str, call, iterations: int) -> None:
+    for _ in range(10):
+        await call()
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await call()
+        latencies.append(time.perf_counter() - start)
+    bench_utils.summarize(label, latencies)
+
+
+async def run(iterations: int, order_id: int, event_id: int, product_id: int) -> None:
+    from db.CRUD.create import create_product
+    from db.CRUD.read import get_event_by_id, get_order_by_id, get_product_by_id
+    from db.CRUD.update import update_event, update_order, update_product
+    from db.CRUD.delete import delete_product
+    from db.db_sql_connection import close_async_pool
+
+    order = await get_order_by_id(order_id)
+    order_data = {key: order[key] for key in ("event_id", "order_date", "total_amount", "status")}
+    event = await get_event_by_id(event_id)
+    event_data = {key: event[key] for key in ("event_type", "event_date", "location", "guest_count", "duration_hours", "budget_approved")}
+    product = await get_product_by_id(product_id)
+    product_data = {key: product[key] for key in ("name", "description", "base_price", "category", "active")}
+
+    async def lookup_then(lookup, mutation, row_id, data):
+        if await lookup(row_id):
+            await mutation(row_id, dict(data))
+
+    mutations = [
+        ("update order", get_order_by_id, update_order, order_id, order_data),
+        ("update event", get_event_by_id, update_event, event_id, event_data),
+        ("update product", get_product_by_id, update_product, product_id, product_data),
+    ]
+    for name, lookup, mutation, row_id, data in mutations:
+        await timed(f"{name}, lookup + mutation", lambda: lookup_then(lookup, mutation, row_id, data), iterations)
+        await timed(f"{name}, single call", lambda: mutation(row_id, dict(data)), iterations)
+
+    async def delete_with_lookup():
+        created = await create_product(dict(product_data))
+        start = time.perf_counter()
+        if await get_product_by_id(created["id"]):
+            await delete_product(created["id"])
+        return time.perf_counter() - start
+
+    async def delete_single():
+        created = await create_product(dict(product_data))
+        start = time.perf_counter()
+        await delete_product(created["id"])
+        return time.perf_counter() - start
+
+    for label, delete in (("delete product, lookup + mutation", delete_with_lookup), ("delete product, single call", delete_single)):
+        bench_utils.summarize(label, [await delete() for _ in range(iterations // 5 or 1)])
+
+    await close_async_pool()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--order-id", type=int, default=3001)
+    parser.add_argument("--event-id", type=int, default=2001)
+    parser.add_argument("--product-id", type=int, default=4001)
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations, args.order_id, args.event_id, args.product_id))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Measures placing an order item by item vs. with POST /orders/batch.
+
+Item by item is what clients do today: POST /orders/ then one POST /order_items/
+per item, each with its own authentication, product lookup and connection. The
+batch endpoint sends the order and its items at once. Requests go through ASGI to
+one in-process instance of the app; the number of database statements comes from
+the db_query_duration_seconds histogram. The orders created are deleted at the end.
+
+Usage:
+    python benchmarks/bench_order_batch.py [--items 30] [--orders 20] [--event-id 2001]
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+import bench_utils
+
+
+def statements() -> int:
+    from utils.utils_metrics import db_query_duration_seconds
+
+    return sum(db_query_duration_seconds.count(labels) for labels in list(db_query_duration_seconds._values))
+
+
+async def run(items: int, orders: int, event_id: int) -> None:
+    import httpx
+    from main import app
+    from db.CRUD.delete import delete_order
+
+    headers = bench_utils.auth_headers()
+    product_ids = [4001, 4002, 4003, 4004, 4005]
+    lines = [{"product_id": product_ids[index % len(product_ids)], "quantity": 1 + index % 3} for index in range(items)]
+    created = []
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+
+        async def item_by_item() -> None:
+            response = await client.post("/orders/", headers=headers, json={
+                "event_id": event_id, "order_date": datetime.now().isoformat(), "total_amount": 1, "status": "pending",
+            })
+            response.raise_for_status()
+            order_id = response.json()["order"]["order_id"]
+            created.append(order_id)
+            for line in lines:
+                response = await client.post("/order_items/", headers=headers, json={"order_id": order_id, **line})
+                response.raise_for_status()
+
+        async def batch() -> None:
+            response = await client.post("/orders/batch", headers=headers, json={"event_id": event_id, "items": lines})
+            response.raise_for_status()
+            created.append(response.json()["order_id"])
+
+        for label, place_order in (("item by item", item_by_item), ("POST /orders/batch", batch)):
+            await place_order()
+            latencies = []
+            before = statements()
+            for _ in range(orders):
+                start = time.perf_counter()
+                await place_order()
+                latencies.append(time.perf_counter() - start)
+            per_order = (statements() - before) / orders
+            bench_utils.summarize(f"{items}-item order, {label}", latencies)
+            print(f"{'':<40} {per_order:.0f} database statements per order")
+
+    for order_id in created:
+        await delete_order(order_id)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=30)
+    parser.add_argument("--orders", type=int, default=20)
+    parser.add_argument("--event-id", type=int, default=2001)
+    args = parser.parse_args()
+    asyncio.run(run(args.items, args.orders, args.event_id))
+
+
+if __name__ == "__main__":
+    main()
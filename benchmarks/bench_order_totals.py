@@ -0,0 +1,210 @@
+"""
+Measures the cost of keeping orders.total_amount equal to the sum of its items,
+with database/migrations/006_order_totals.sql, on orders with hundreds of items.
+
+The script creates a scratch schema from database/01_tables.sql with ``--orders``
+orders of ``--items-per-order`` items each. It times writing one order of
+``--items`` items (in one multi-row statement, as POST /orders/batch does, and
+one item per statement), re-pricing and deleting all of its items, first without
+any trigger, then with a row-level trigger that updates the order for every item,
+then with the statement-level triggers of the migration. Finally it corrupts 1% of
+the totals and times the set-based recompute of update.recompute_order_totals.
+The scratch schema is dropped at the end, so the data in the public schema is not
+touched.
+
+Usage:
+    python benchmarks/bench_order_totals.py [--orders 100000] [--items-per-order 10] [--items 500] [--repeat 10]
+"""
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+import psycopg
+
+import bench_utils  # noqa: F401  (adds src/ to sys.path)
+from db.db_sql_connection import get_conninfo
+
+DATABASE_DIR = Path(__file__).resolve().parent.parent / "database"
+SCHEMA = "bench_order_totals"
+PRODUCTS = 100
+
+# The alternative to the migration: one UPDATE of the order per item written
+ROW_LEVEL_TRIGGER = """
+    CREATE FUNCTION order_items_apply_totals_row() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE orders SET total_amount = total_amount - OLD.total_price, updated_at = NOW() WHERE id = OLD.order_id;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            UPDATE orders SET total_amount = total_amount + NEW.total_price, updated_at = NOW() WHERE id = NEW.order_id;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    CREATE TRIGGER order_items_totals_row AFTER INSERT OR UPDATE OR DELETE ON order_items
+        FOR EACH ROW EXECUTE FUNCTION order_items_apply_totals_row();
+"""
+DROP_ROW_LEVEL_TRIGGER = """
+    DROP TRIGGER order_items_totals_row ON order_items;
+    DROP FUNCTION order_items_apply_totals_row();
+"""
+# Same statement as recompute_order_totals
+RECOMPUTE = """
+    UPDATE orders o
+    SET total_amount = t.total, updated_at = NOW()
+    FROM (
+        SELECT o.id, COALESCE(i.total, 0) AS total
+        FROM orders o
+        LEFT JOIN (
+            SELECT order_id, SUM(total_price) AS total FROM order_items GROUP BY order_id
+        ) i ON i.order_id = o.id
+    ) t
+    WHERE o.id = t.id AND o.total_amount <> t.total
+    RETURNING o.id;
+"""
+INSERT_ITEMS = """
+    INSERT INTO order_items (order_id, product_id, quantity, unit_price, total_price)
+    SELECT %(order_id)s, 1 + g %% 100, 1 + g %% 5, 10 + g %% 100, (1 + g %% 5) * (10 + g %% 100)
+    FROM generate_series(1, %(items)s) g;
+"""
+INSERT_ITEM = """
+    INSERT INTO order_items (order_id, product_id, quantity, unit_price, total_price)
+    VALUES (%(order_id)s, 1 + %(n)s %% 100, 2, 10, 20);
+"""
+
+
+def create_schema(conn: psycopg.Connection, orders: int, items_per_order: int) -> None:
+    conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;")
+    conn.execute(f"CREATE SCHEMA {SCHEMA};")
+    conn.execute(f"SET search_path TO {SCHEMA}, public;")
+    conn.execute((DATABASE_DIR / "01_tables.sql").read_text())
+    conn.execute((DATABASE_DIR / "migrations" / "001_foreign_key_indexes.sql").read_text())
+    conn.execute(
+        """
+        INSERT INTO customers (full_name, email, cpf_cnpj, password_hash)
+        VALUES ('Customer', 'customer@example.com', '00000000001', 'hash');
+        INSERT INTO events (customer_id, event_type, event_date, location, guest_count, duration_hours)
+        VALUES (1, 'wedding', '2025-01-01', 'Location', 100, 5);
+        """
+    )
+    conn.execute(
+        """
+        INSERT INTO products (name, base_price, category)
+        SELECT 'Product ' || g, 10 + g, 'service' FROM generate_series(1, %(products)s) g;
+        """,
+        {"products": PRODUCTS},
+    )
+    conn.execute(
+        """
+        INSERT INTO orders (event_id, order_date, total_amount, status)
+        SELECT 1, '2025-01-01', 0, 'pending' FROM generate_series(1, %(orders)s);
+        """,
+        {"orders": orders},
+    )
+    conn.execute(
+        """
+        INSERT INTO order_items (order_id, product_id, quantity, unit_price, total_price)
+        SELECT o, 1 + (o + g) %% 100, 1 + g %% 5, 10 + (o + g) %% 100, (1 + g %% 5) * (10 + (o + g) %% 100)
+        FROM generate_series(1, %(orders)s) o, generate_series(1, %(items)s) g;
+        """,
+        {"orders": orders, "items": items_per_order},
+    )
+    conn.execute(
+        "UPDATE orders o SET total_amount = i.total "
+        "FROM (SELECT order_id, SUM(total_price) AS total FROM order_items GROUP BY order_id) i "
+        "WHERE o.id = i.order_id;"
+    )
+    conn.execute("VACUUM ANALYZE;")
+
+
+def timed(conn: psycopg.Connection, statements) -> float:
+    """Runs the statements in one transaction and returns the elapsed milliseconds."""
+    start = time.perf_counter()
+    with conn.transaction():
+        for query, params in statements:
+            conn.execute(query, params)
+    return (time.perf_counter() - start) * 1000
+
+
+def time_writes(conn: psycopg.Connection, label: str, items: int, repeat: int) -> None:
+    """
+    Times, on a fresh order each round: inserting `items` items in one statement,
+    re-pricing all of them, deleting them, and inserting them one per statement.
+    """
+    latencies = {"insert, one statement": [], "update all items": [], "delete all items": [],
+                 "insert, one per statement": []}
+    consistent = True
+    for _ in range(repeat):
+        order_id = conn.execute(
+            "INSERT INTO orders (event_id, order_date, total_amount, status) "
+            "VALUES (1, '2025-01-01', 0, 'pending') RETURNING id;"
+        ).fetchone()[0]
+        params = {"order_id": order_id, "items": items}
+        latencies["insert, one statement"].append(timed(conn, [(INSERT_ITEMS, params)]))
+        latencies["update all items"].append(timed(conn, [(
+            "UPDATE order_items SET total_price = total_price * 1.1 WHERE order_id = %(order_id)s;", params
+        )]))
+        consistent &= conn.execute(
+            "SELECT o.total_amount = COALESCE(SUM(i.total_price), 0) FROM orders o "
+            "LEFT JOIN order_items i ON i.order_id = o.id WHERE o.id = %s GROUP BY o.id;", (order_id,)
+        ).fetchone()[0]
+        latencies["delete all items"].append(timed(conn, [(
+            "DELETE FROM order_items WHERE order_id = %(order_id)s;", params
+        )]))
+        latencies["insert, one per statement"].append(timed(
+            conn, [(INSERT_ITEM, {"order_id": order_id, "n": n}) for n in range(items)]
+        ))
+        conn.execute("DELETE FROM orders WHERE id = %s;", (order_id,))
+
+    print(f"\n--- {label} ---")
+    for name, values in latencies.items():
+        print(f"{name:<40} p50 {statistics.median(values):>8.2f} ms")
+    if label != "no trigger":
+        print(f"{'totals match the items':<40} {consistent}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--items-per-order", type=int, default=10)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    # prepared statements would outlive the scratch schema
+    with psycopg.connect(get_conninfo(), autocommit=True, prepare_threshold=None) as conn:
+        try:
+            start = time.perf_counter()
+            create_schema(conn, args.orders, args.items_per_order)
+            print(f"=== {args.orders:,} orders of {args.items_per_order} items, "
+                  f"loaded in {time.perf_counter() - start:.1f} s; timing orders of {args.items} items ===")
+
+            time_writes(conn, "no trigger", args.items, args.repeat)
+
+            conn.execute(ROW_LEVEL_TRIGGER)
+            time_writes(conn, "row-level trigger", args.items, args.repeat)
+            conn.execute(DROP_ROW_LEVEL_TRIGGER)
+
+            conn.execute((DATABASE_DIR / "migrations" / "006_order_totals.sql").read_text())
+            time_writes(conn, "statement-level triggers (006)", args.items, args.repeat)
+
+            print("\n--- recompute ---")
+            drifted = conn.execute(
+                "UPDATE orders SET total_amount = total_amount + 1 WHERE id % 100 = 0 RETURNING id;"
+            ).rowcount
+            conn.execute("VACUUM ANALYZE orders;")
+            start = time.perf_counter()
+            fixed = len(conn.execute(RECOMPUTE).fetchall())
+            print(f"{'recompute, 1% drifted':<40} {(time.perf_counter() - start) * 1000:>12.0f} ms   "
+                  f"({fixed:,} of {drifted:,} fixed)")
+            start = time.perf_counter()
+            fixed = len(conn.execute(RECOMPUTE).fetchall())
+            print(f"{'recompute, no drift':<40} {(time.perf_counter() - start) * 1000:>12.0f} ms   ({fixed} fixed)")
+        finally:
+            conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;")
+
+
+if __name__ == "__main__":
+    main()
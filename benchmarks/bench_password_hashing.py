@@ -0,0 +1,132 @@
+"""
+Measures how a login storm affects unrelated requests on the same worker.
+
+While ``--logins`` POST /auth/login requests run with ``--concurrency`` in flight,
+GET /products/ is called back to back and its latency recorded. Two modes run in
+separate processes because PASSWORD_HASH_WORKERS is read at import time:
+
+- inline: PASSWORD_HASH_WORKERS=0, bcrypt runs on the event loop (previous behaviour)
+- worker pool: bcrypt runs on the password hashing pool
+
+Usage:
+    python benchmarks/bench_password_hashing.py [--logins 64] [--concurrency 16]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+import bench_utils
+
+BENCH_LOGIN_EMAIL = "bench.login@example.com"
+BENCH_LOGIN_PASSWORD = "BenchPass123!"
+
+
+async def create_login_user() -> None:
+    from db.db_sql_connection import async_connect
+    from utils.utils_validation import get_password_hash
+
+    async with async_connect() as conn:
+        async with conn.cursor() as cursor:
+            await cursor.execute(
+                """
+                INSERT INTO customers (full_name, email, cpf_cnpj, password_hash, role)
+                VALUES ('Bench Login', %s, %s, %s, 'customer')
+                ON CONFLICT (email) DO UPDATE SET password_hash = EXCLUDED.password_hash;
+                """,
+                (BENCH_LOGIN_EMAIL, f"bench-login-{os.getpid()}", get_password_hash(BENCH_LOGIN_PASSWORD)),
+            )
+
+
+async def delete_login_user() -> None:
+    from db.db_sql_connection import async_connect
+
+    async with async_connect() as conn:
+        async with conn.cursor() as cursor:
+            await cursor.execute("DELETE FROM customers WHERE email = %s;", (BENCH_LOGIN_EMAIL,))
+
+
+async def run_child(logins: int, concurrency: int) -> None:
+    import httpx
+    from main import app
+
+    await create_login_user()
+    headers = bench_utils.auth_headers()
+    form = {"username": BENCH_LOGIN_EMAIL, "password": BENCH_LOGIN_PASSWORD, "role": "customer"}
+    semaphore = asyncio.Semaphore(concurrency)
+    probe_latencies = []
+    login_statuses = []
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+
+        async def one_login() -> None:
+            async with semaphore:
+                response = await client.post("/auth/login", data=form)
+                login_statuses.append(response.status_code)
+
+        async def probe(done: asyncio.Event) -> None:
+            while not done.is_set():
+                start = time.perf_counter()
+                response = await client.get("/products/", headers=headers)
+                response.raise_for_status()
+                probe_latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.005)
+
+        for _ in range(5):
+            await client.get("/products/", headers=headers)
+
+        done = asyncio.Event()
+        probing = asyncio.create_task(probe(done))
+        start = time.perf_counter()
+        await asyncio.gather(*(one_login() for _ in range(logins)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await probing
+
+    await delete_login_user()
+    print(json.dumps({
+        "probe": probe_latencies,
+        "login_elapsed": elapsed,
+        "ok": login_statuses.count(200),
+        "rejected": login_statuses.count(503),
+    }))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        asyncio.run(run_child(args.logins, args.concurrency))
+        return
+
+    modes = (
+        ("inline", {"PASSWORD_HASH_WORKERS": "0"}),
+        ("worker pool", {"PASSWORD_HASH_QUEUE_LIMIT": str(max(args.logins, 1))}),
+    )
+    for label, overrides in modes:
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", "--logins", str(args.logins),
+             "--concurrency", str(args.concurrency)],
+            env={**os.environ, **overrides},
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        bench_utils.summarize(f"GET /products/ during logins, {label}", result["probe"])
+        print(
+            f"{'':<40} {result['ok']} logins in {result['login_elapsed']:.2f} s"
+            f" ({result['ok'] / result['login_elapsed']:.1f}/s), {result['rejected']} rejected"
+        )
+
+
+if __name__ == "__main__":
+    main()
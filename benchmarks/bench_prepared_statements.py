@@ -0,0 +1,96 @@
+"""
+Measures what preparing the hot statements saves per execution.
+
+For every statement registered with db.db_prepared_statements.prepared(), the
+script reports the server's planning time (EXPLAIN (ANALYZE, SUMMARY)) and the
+median client-side latency of the statement sent unprepared (parsed and planned
+on every call, as behind a transaction pooler) vs. prepared once on the
+connection. Both runs use one direct connection, so the pool is not involved.
+The planning time shown is only part of the saving: parsing and analysis are
+skipped as well.
+
+Usage:
+    python benchmarks/bench_prepared_statements.py [--iterations 2000] [--customer-id 1001]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import bench_utils  # noqa: F401  (adds src/ to sys.path)
+
+
+def sample_params(customer_id: int):
+    by_id = {"order_id": 3001}
+    return {
+        "get_customer_by_email": ("ana@example.com",),
+        "get_event_by_id": (2001,),
+        "get_order_by_id": by_id,
+        "get_customer_by_id": (customer_id,),
+        "get_product_by_id": (4001,),
+        "get_order_item_by_id": (5001,),
+        "get_events_by_customer_id": (customer_id,),
+        "get_orders_by_customer_id": (customer_id,),
+        "get_payments_by_customer_id": (customer_id,),
+        "get_invoices_by_customer_id": (customer_id,),
+        "get_contracts_by_customer_id": (customer_id,),
+        "get_order_items_by_customer_id": (customer_id,),
+        "get_customer_overview": (customer_id,),
+    }
+
+
+async def median_latency(cursor, query, params, prepare: bool, iterations: int) -> float:
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await cursor.execute(query, params, prepare=prepare)
+        await cursor.fetchall()
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies[iterations // 10:]) * 1000
+
+
+async def run(iterations: int, customer_id: int) -> None:
+    import psycopg
+    from db.CRUD import read
+    from db.db_prepared_statements import statement_registry
+    from db.db_sql_connection import close_async_pool, get_conninfo
+
+    params_by_name = sample_params(customer_id)
+    # each CRUD function registers its statement on first call
+    for name, params in params_by_name.items():
+        await getattr(read, name)(*(params.values() if isinstance(params, dict) else params))
+    await close_async_pool()
+
+    statements = statement_registry.statements()
+    print(f"{'statement':<32} {'planning':>9} {'unprepared':>11} {'prepared':>9} {'saved':>8}")
+    saved_total = 0.0
+    async with await psycopg.AsyncConnection.connect(get_conninfo()) as conn:
+        cursor = conn.cursor()
+        for name, query in statements.items():
+            params = params_by_name[name]
+            # the second EXPLAIN runs with warm catalog caches, like the application
+            for _ in range(2):
+                await cursor.execute(f"EXPLAIN (ANALYZE, SUMMARY, FORMAT JSON) {query}", params, prepare=False)
+                plan = (await cursor.fetchone())[0]
+            planning = (plan if isinstance(plan, list) else json.loads(plan))[0]["Planning Time"]
+
+            unprepared = await median_latency(cursor, query, params, False, iterations)
+            prepared = await median_latency(cursor, query, params, True, iterations)
+            saved_total += unprepared - prepared
+            print(f"{name:<32} {planning:>7.3f}ms {unprepared:>9.3f}ms {prepared:>7.3f}ms {unprepared - prepared:>6.3f}ms")
+            await conn.rollback()
+    print(f"{'average saved per execution':<32} {saved_total / len(statements):>42.3f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--customer-id", type=int, default=1001)
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations, args.customer_id))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Measures product reads served by the database vs. the in-memory product catalog.
+
+The product lookup done by POST /order_items/ (get_product_by_id) and a page of
+GET /products/ (get_all_products with limit=50) are called ``--requests`` times
+each, first with the catalog stopped (every call queries PostgreSQL), then with
+it started. The time for a change made on another connection to reach the
+catalog through NOTIFY is measured last.
+
+Needs database/migrations/002_products_notify.sql (python database/migrate.py).
+
+Usage:
+    python benchmarks/bench_product_catalog.py [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import time
+
+import bench_utils
+
+
+async def run(requests: int) -> None:
+    import psycopg
+    from db.CRUD.read import get_all_products, get_product_by_id
+    from db.db_product_catalog import product_catalog
+    from db.db_sql_connection import get_conninfo, close_async_pool
+
+    product_ids = [product["id"] for product in await get_all_products()]
+    if not product_ids:
+        raise SystemExit("The products table is empty; load database/02_base_data.sql first.")
+
+    async def time_calls(label: str, call) -> None:
+        latencies = []
+        for index in range(requests):
+            start = time.perf_counter()
+            await call(index)
+            latencies.append(time.perf_counter() - start)
+        bench_utils.summarize(label, latencies)
+
+    for mode in ("database", "catalog"):
+        if mode == "catalog":
+            await product_catalog.start()
+        await time_calls(f"get_product_by_id, {mode}", lambda i: get_product_by_id(product_ids[i % len(product_ids)]))
+        await time_calls(f"get_all_products(50), {mode}", lambda i: get_all_products(limit=50))
+
+    # propagation of a write made by another worker
+    product_id = product_ids[0]
+    notifications = product_catalog.stats()["notifications"]
+    async with await psycopg.AsyncConnection.connect(get_conninfo()) as conn:
+        await conn.execute("UPDATE products SET updated_at = NOW() WHERE id = %s;", (product_id,))
+        start = time.perf_counter()
+    while product_catalog.stats()["notifications"] == notifications:
+        await asyncio.sleep(0.0005)
+    await get_product_by_id(product_id)
+    print(f"{'change visible after UPDATE':<40} {(time.perf_counter() - start) * 1000:>10.2f} ms")
+
+    await product_catalog.stop()
+    await close_async_pool()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
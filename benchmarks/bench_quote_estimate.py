@@ -0,0 +1,81 @@
+"""
+Measures the quote estimator behind /quotes/estimate: hundreds of guest count /
+duration combinations priced against the whole catalog in one call.
+
+The script builds a synthetic catalog of ``--products`` active products spread over
+the three categories and prices ``--scenarios`` random combinations, with a plain
+Python loop over scenarios and products (the hand-written way) and with the
+vectorized estimate_scenarios. It checks both give the same totals and also times
+building the catalog arrays, which every request does. No database is used.
+
+Usage:
+    python benchmarks/bench_quote_estimate.py [--products 500] [--scenarios 500] [--repeat 20]
+"""
+
+import argparse
+import math
+import random
+import statistics
+import time
+
+import bench_utils  # noqa: F401  (adds src/ to sys.path)
+from utils.utils_quotes import CONSUMPTION_RULES, build_quote_catalog, estimate_scenarios
+
+
+def python_estimate(products: list, guest_counts: list, duration_hours: list) -> list:
+    """Prices each scenario product by product, in cents."""
+    counts = {name: sum(1 for product in products if product["category"] == name) for name in CONSUMPTION_RULES}
+    totals = []
+    for guests, hours in zip(guest_counts, duration_hours):
+        total = 0
+        for product in products:
+            rule = CONSUMPTION_RULES[product["category"]]
+            share = 1 / counts[product["category"]] if rule["shared"] else 1
+            units = guests * hours * rule["per_guest_hour"] * share
+            if rule["guests_per_unit"]:
+                units += guests / rule["guests_per_unit"] * share
+            total += math.ceil(round(units, 6)) * round(float(product["base_price"]) * 100)
+        totals.append(total / 100)
+    return totals
+
+
+def median_ms(function, repeat: int) -> float:
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=500)
+    parser.add_argument("--scenarios", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    categories = list(CONSUMPTION_RULES)
+    products = [
+        {"id": n, "name": f"Product {n}", "category": categories[n % len(categories)],
+         "base_price": round(random.uniform(5, 2000), 2), "active": True}
+        for n in range(1, args.products + 1)
+    ]
+    guest_counts = [random.randint(20, 800) for _ in range(args.scenarios)]
+    duration_hours = [random.randint(2, 12) for _ in range(args.scenarios)]
+
+    catalog = build_quote_catalog(products)
+    vectorized = [result["total_amount"] for result in estimate_scenarios(catalog, guest_counts, duration_hours)]
+    assert vectorized == python_estimate(products, guest_counts, duration_hours)
+
+    print(f"=== {args.products} products, {args.scenarios} scenarios ===")
+    loop = median_ms(lambda: python_estimate(products, guest_counts, duration_hours), max(args.repeat // 4, 1))
+    print(f"{'Python loop':<32} p50 {loop:>8.2f} ms")
+    build = median_ms(lambda: build_quote_catalog(products), args.repeat)
+    print(f"{'build_quote_catalog':<32} p50 {build:>8.2f} ms")
+    estimate = median_ms(lambda: estimate_scenarios(catalog, guest_counts, duration_hours), args.repeat)
+    print(f"{'estimate_scenarios (NumPy)':<32} p50 {estimate:>8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Measures the monthly reports computed on demand from orders, order_items and
+payments vs. read from the rollup tables of database/migrations/003_report_rollups.sql,
+and what the rollup triggers add to each write.
+
+For each scale the script creates a scratch schema from database/01_tables.sql,
+fills it with synthetic rows (``scale`` orders spread over three years, one order
+item and payment per order), times the on-demand aggregations, applies the
+migration (which backfills the rollups) and times the rollup queries used by
+db/CRUD/read.py. It then inserts and updates ``--writes`` orders one at a time with
+and without the triggers. The scratch schema is dropped at the end, so the data in
+the public schema is not touched.
+
+Usage:
+    python benchmarks/bench_reports.py [--scales 10000 100000 1000000] [--repeat 10] [--writes 500]
+"""
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+import psycopg
+
+import bench_utils  # noqa: F401  (adds src/ to sys.path)
+from db.db_sql_connection import get_conninfo
+
+DATABASE_DIR = Path(__file__).resolve().parent.parent / "database"
+SCHEMA = "bench_reports"
+
+ON_DEMAND = {
+    "revenue": """
+        SELECT date_trunc('month', o.order_date)::date, e.event_type, o.status, COUNT(*), SUM(o.total_amount)
+        FROM orders o JOIN events e ON e.id = o.event_id
+        GROUP BY 1, 2, 3 ORDER BY 1, 2, 3;
+    """,
+    "products": """
+        SELECT date_trunc('month', o.order_date)::date, p.category, SUM(i.quantity), SUM(i.total_price)
+        FROM order_items i JOIN orders o ON o.id = i.order_id JOIN products p ON p.id = i.product_id
+        GROUP BY 1, 2 ORDER BY 1, 2;
+    """,
+    "payments": """
+        SELECT date_trunc('month', COALESCE(payment_date, updated_at))::date, payment_method, status,
+               COUNT(*), SUM(amount)
+        FROM payments
+        GROUP BY 1, 2, 3 ORDER BY 1, 2, 3;
+    """,
+}
+
+# Same statements as get_revenue_report, get_product_sales_report and get_payments_report
+ROLLUP = {
+    "revenue": """
+        SELECT date_trunc('month', day)::date, event_type, status, SUM(orders)::int, SUM(revenue)
+        FROM report_daily_revenue
+        GROUP BY 1, 2, 3 HAVING SUM(orders) <> 0 ORDER BY 1, 2, 3;
+    """,
+    "products": """
+        SELECT date_trunc('month', s.day)::date, p.category, SUM(s.quantity)::bigint, SUM(s.revenue)
+        FROM report_daily_product_sales s JOIN products p ON p.id = s.product_id
+        GROUP BY 1, 2 HAVING SUM(s.quantity) <> 0 ORDER BY 1, 2;
+    """,
+    "payments": """
+        SELECT date_trunc('month', day)::date, payment_method, status, SUM(payments)::int, SUM(amount)
+        FROM report_daily_payments
+        GROUP BY 1, 2, 3 HAVING SUM(payments) <> 0 ORDER BY 1, 2, 3;
+    """,
+}
+
+LOAD_STATEMENTS = [
+    """
+    INSERT INTO customers (full_name, email, cpf_cnpj, password_hash)
+    SELECT 'Customer ' || g, 'customer' || g || '@example.com', lpad(g::text, 11, '0'), 'hash'
+    FROM generate_series(1, %(customers)s) g;
+    """,
+    """
+    INSERT INTO products (name, base_price, category)
+    SELECT 'Product ' || g, 10 + g, (ARRAY['drink', 'structure', 'service'])[1 + g %% 3]::product_type
+    FROM generate_series(1, 50) g;
+    """,
+    """
+    INSERT INTO events (customer_id, event_type, event_date, location, guest_count, duration_hours)
+    SELECT 1 + g %% %(customers)s, (ARRAY['wedding', 'corporate', 'debutante', 'other'])[1 + g %% 4]::event_type,
+           NOW() + g * INTERVAL '1 hour', 'Location ' || g %% 100, 100, 5
+    FROM generate_series(1, %(events)s) g;
+    """,
+    """
+    INSERT INTO orders (event_id, order_date, total_amount, status)
+    SELECT 1 + g %% %(events)s, NOW() - (g %% 1095) * INTERVAL '1 day', 100,
+           (ARRAY['pending', 'paid', 'canceled'])[1 + g %% 3]::order_status
+    FROM generate_series(1, %(orders)s) g;
+    """,
+    """
+    INSERT INTO order_items (order_id, product_id, quantity, unit_price, total_price)
+    SELECT g, 1 + g %% 50, 2, 50, 100 FROM generate_series(1, %(orders)s) g;
+    """,
+    """
+    INSERT INTO payments (order_id, amount, payment_method, status, payment_date)
+    SELECT g, 100, (ARRAY['credit_card', 'pix', 'boleto', 'bank_transfer'])[1 + g %% 4]::payment_method,
+           'approved', NOW() - (g %% 1095) * INTERVAL '1 day'
+    FROM generate_series(1, %(orders)s) g;
+    """,
+]
+
+
+def create_schema(conn: psycopg.Connection, scale: int) -> int:
+    """
+    Creates the scratch schema, loads the synthetic rows and returns the event count.
+    """
+    sizes = {"orders": scale, "events": max(scale // 4, 1)}
+    sizes["customers"] = max(sizes["events"] // 5, 1)
+
+    conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;")
+    conn.execute(f"CREATE SCHEMA {SCHEMA};")
+    conn.execute(f"SET search_path TO {SCHEMA}, public;")
+    conn.execute((DATABASE_DIR / "01_tables.sql").read_text())
+    conn.execute((DATABASE_DIR / "migrations" / "001_foreign_key_indexes.sql").read_text())
+    for statement in LOAD_STATEMENTS:
+        conn.execute(statement, sizes)
+    conn.execute("ANALYZE;")
+    return sizes["events"]
+
+
+def time_queries(conn: psycopg.Connection, queries: dict, repeat: int) -> dict:
+    """
+    Runs every query and returns the median latency in milliseconds.
+    """
+    results = {}
+    for name, query in queries.items():
+        latencies = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(query).fetchall()
+            latencies.append((time.perf_counter() - start) * 1000)
+        results[name] = statistics.median(latencies)
+    return results
+
+
+def time_writes(conn: psycopg.Connection, events: int, writes: int) -> dict:
+    """
+    Inserts, then updates, `writes` orders one statement at a time and returns
+    the median latency of each in milliseconds. The rows are deleted afterwards.
+    """
+    inserted, updated, ids = [], [], []
+    for n in range(writes):
+        start = time.perf_counter()
+        ids.append(conn.execute(
+            "INSERT INTO orders (event_id, total_amount) VALUES (%s, 100) RETURNING id;", (1 + n % events,)
+        ).fetchone()[0])
+        inserted.append((time.perf_counter() - start) * 1000)
+    for order_id in ids:
+        start = time.perf_counter()
+        conn.execute("UPDATE orders SET status = 'paid', total_amount = 150 WHERE id = %s;", (order_id,))
+        updated.append((time.perf_counter() - start) * 1000)
+    conn.execute("DELETE FROM orders WHERE id = ANY(%s);", (ids,))
+    return {"insert": statistics.median(inserted), "update": statistics.median(updated)}
+
+
+def run_scale(conn: psycopg.Connection, scale: int, repeat: int, writes: int) -> None:
+    start = time.perf_counter()
+    events = create_schema(conn, scale)
+    print(f"\n=== {scale:,} orders, loaded in {time.perf_counter() - start:.1f} s ===")
+
+    on_demand = time_queries(conn, ON_DEMAND, repeat)
+    writes_before = time_writes(conn, events, writes)
+
+    start = time.perf_counter()
+    conn.execute((DATABASE_DIR / "migrations" / "003_report_rollups.sql").read_text())
+    conn.execute("ANALYZE;")
+    print(f"migration with backfill: {time.perf_counter() - start:.1f} s")
+
+    rollup = time_queries(conn, ROLLUP, repeat)
+    writes_after = time_writes(conn, events, writes)
+
+    for name in ON_DEMAND:
+        print(f"{name:<10} on demand {on_demand[name]:>10.2f} ms   rollup {rollup[name]:>8.2f} ms   "
+              f"({on_demand[name] / rollup[name]:.0f}x)")
+    for name in writes_before:
+        print(f"order {name:<6} without triggers {writes_before[name]:.3f} ms   "
+              f"with triggers {writes_after[name]:.3f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--writes", type=int, default=500)
+    args = parser.parse_args()
+
+    # prepared statements would outlive the scratch schema that is recreated per scale
+    with psycopg.connect(get_conninfo(), autocommit=True, prepare_threshold=None) as conn:
+        try:
+            for scale in args.scales:
+                run_scale(conn, scale, args.repeat, args.writes)
+        finally:
+            conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Measures a burst of identical reads with and without single-flight coalescing.
+
+``--clients`` concurrent GET /products/ and GET /events/?event_id=X requests are
+sent at once to one in-process instance of the app. Each mode runs in its own
+process because SINGLE_FLIGHT_ENABLED is read at import time. The number of
+database queries comes from the db_query_duration_seconds histogram.
+
+Usage:
+    python benchmarks/bench_single_flight.py [--clients 200] [--bursts 5] [--event-id 2001]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+import bench_utils
+
+
+async def run_child(clients: int, bursts: int, event_id: int) -> None:
+    import httpx
+    from main import app
+    from utils.utils_metrics import db_query_duration_seconds
+    from utils.utils_single_flight import single_flight_collapsed_total
+
+    headers = bench_utils.auth_headers()
+    paths = ["/products/", f"/events/?event_id={event_id}"]
+    latencies = []
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+
+        async def one_request(path: str) -> None:
+            start = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+        await one_request(paths[0])
+        latencies.clear()
+        queries_before = sum(db_query_duration_seconds.count((name,)) for name in ("get_all_products", "get_event_by_id"))
+
+        start = time.perf_counter()
+        for _ in range(bursts):
+            await asyncio.gather(*(one_request(paths[index % 2]) for index in range(clients)))
+        elapsed = time.perf_counter() - start
+
+    queries = sum(db_query_duration_seconds.count((name,)) for name in ("get_all_products", "get_event_by_id"))
+    collapsed = sum(single_flight_collapsed_total.value((name,)) for name in ("get_all_products", "get_event_by_id"))
+    print(json.dumps({
+        "latencies": latencies, "elapsed": elapsed, "queries": queries - queries_before, "collapsed": collapsed,
+    }))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--bursts", type=int, default=5)
+    parser.add_argument("--event-id", type=int, default=2001)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        asyncio.run(run_child(args.clients, args.bursts, args.event_id))
+        return
+
+    for label, enabled in (("without single-flight", "false"), ("with single-flight", "true")):
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", "--clients", str(args.clients),
+             "--bursts", str(args.bursts), "--event-id", str(args.event_id)],
+            env={**os.environ, "SINGLE_FLIGHT_ENABLED": enabled},
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        bench_utils.summarize(f"{args.clients} concurrent reads, {label}", result["latencies"], result["elapsed"])
+        print(f"{'':<40} {result['queries']} database queries, {int(result['collapsed'])} calls collapsed")
+
+
+if __name__ == "__main__":
+    main()
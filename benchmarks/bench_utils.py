@@ -0,0 +1,99 @@
+"""
+Shared helpers for the benchmark scripts in this folder.
+
+The benchmarks talk to the database configured through the SUPABASE_* variables
+(a local PostgreSQL loaded with database/01_tables.sql and database/02_base_data.sql
+is enough) and import the application from src/, the same way src/main.py does.
+"""
+
+import os
+import sys
+import time
+import statistics
+from typing import Callable, Dict, List, Optional
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
+
+# The token helpers need a key even when no .env file is present
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-not-for-production")
+os.environ.setdefault("ALGORITHM", "HS256")
+
+BENCH_USER_EMAIL = os.getenv("BENCH_USER_EMAIL", "ana@example.com")
+BENCH_USER_ROLE = os.getenv("BENCH_USER_ROLE", "customer")
+
+
+def auth_headers(email: str = BENCH_USER_EMAIL, role: str = BENCH_USER_ROLE) -> Dict[str, str]:
+    """
+    Builds an Authorization header for an existing customer.
+
+    Args:
+        email (str): Email of a customer present in the database.
+        role (str): Role stored in the token.
+
+    Returns:
+        Dict[str, str]: Headers with a bearer token.
+    """
+    from utils.utils_token_auth import create_access_token
+
+    token = create_access_token(data={"sub": email, "role": role})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def measure(func: Callable[[], object], iterations: int, warmup: int = 5) -> List[float]:
+    """
+    Calls a function repeatedly and records the latency of each call.
+
+    Args:
+        func (Callable[[], object]): The function to benchmark.
+        iterations (int): Number of measured calls.
+        warmup (int): Number of calls ignored before measuring.
+
+    Returns:
+        List[float]: Latency of each measured call in seconds.
+    """
+    for _ in range(warmup):
+        func()
+
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Returns the given percentile (0-100) of a list of values.
+    """
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(label: str, latencies: List[float], elapsed: Optional[float] = None) -> Dict[str, float]:
+    """
+    Prints and returns throughput and latency percentiles for a run.
+
+    Args:
+        label (str): Name of the run.
+        latencies (List[float]): Latencies in seconds.
+        elapsed (Optional[float]): Wall-clock duration of a concurrent run. Defaults
+            to the sum of the latencies, which is correct for sequential runs.
+
+    Returns:
+        Dict[str, float]: Requests per second plus p50/p99 latency in milliseconds.
+    """
+    total = elapsed if elapsed is not None else sum(latencies)
+    result = {
+        "rps": len(latencies) / total if total else float("inf"),
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+    print(
+        f"{label:<40} {result['rps']:>10.1f} req/s   "
+        f"p50 {result['p50_ms']:>8.2f} ms   p99 {result['p99_ms']:>8.2f} ms"
+    )
+    return result
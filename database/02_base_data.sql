@@ -16,14 +16,14 @@ VALUES
 (2004, 1004, 'other', '2025-09-22 19:00:00', 'Chácara Bela Vista', 100, 3),
 (2005, 1005, 'wedding', '2025-10-10 17:00:00', 'Sítio Paraíso', 250, 7);
 
--- Inserir Pedidos
+-- Inserir Pedidos (total_amount is filled in from order_items by the triggers of migration 006)
 INSERT INTO orders (id, event_id, total_amount, status)
 VALUES 
-(3001, 2001, 5000.00, 'paid'),
-(3002, 2002, 3500.00, 'pending'),
-(3003, 2003, 4200.00, 'paid'),
-(3004, 2004, 2800.00, 'canceled'),
-(3005, 2005, 7000.00, 'pending');
+(3001, 2001, 0.00, 'paid'),
+(3002, 2002, 0.00, 'pending'),
+(3003, 2003, 0.00, 'paid'),
+(3004, 2004, 0.00, 'canceled'),
+(3005, 2005, 0.00, 'pending');
 
 -- Inserir Produtos
 INSERT INTO products (id, name, description, base_price, category)
@@ -41,7 +41,12 @@ VALUES
 (5002, 3002, 4002, 1, 1000.00, 1000.00),
 (5003, 3003, 4003, 4, 500.00, 2000.00),
 (5004, 3004, 4004, 50, 20.00, 1000.00),
-(5005, 3005, 4005, 2, 800.00, 1600.00);
+(5005, 3005, 4005, 2, 800.00, 1600.00),
+(5006, 3001, 4003, 5, 500.00, 2500.00),
+(5007, 3002, 4003, 5, 500.00, 2500.00),
+(5008, 3003, 4004, 110, 20.00, 2200.00),
+(5009, 3004, 4001, 72, 25.00, 1800.00),
+(5010, 3005, 4004, 270, 20.00, 5400.00);
 
 -- Inserir Pagamentos
 INSERT INTO payments (id, order_id, amount, payment_method, status, payment_date)
@@ -55,11 +60,11 @@ VALUES
 -- Inserir Notas Fiscais
 INSERT INTO invoices (id, order_id, invoice_number, issue_date, total_amount, pdf_file)
 VALUES 
-(7001, 3001, 'NF-001', '2025-06-06 09:00:00', 5000.00, 'nf_001.pdf'),
-(7002, 3002, 'NF-002', '2025-07-16 09:00:00', 3500.00, 'nf_002.pdf'),
-(7003, 3003, 'NF-003', '2025-08-02 09:00:00', 4200.00, 'nf_003.pdf'),
-(7004, 3004, 'NF-004', '2025-09-23 09:00:00', 2800.00, 'nf_004.pdf'),
-(7005, 3005, 'NF-005', '2025-10-11 09:00:00', 7000.00, 'nf_005.pdf');
+(7001, 3001, 'NF-001', '2025-06-06 09:00:00', 5000.00, '7001-nf_001.pdf'),
+(7002, 3002, 'NF-002', '2025-07-16 09:00:00', 3500.00, '7002-nf_002.pdf'),
+(7003, 3003, 'NF-003', '2025-08-02 09:00:00', 4200.00, '7003-nf_003.pdf'),
+(7004, 3004, 'NF-004', '2025-09-23 09:00:00', 2800.00, '7004-nf_004.pdf'),
+(7005, 3005, 'NF-005', '2025-10-11 09:00:00', 7000.00, '7005-nf_005.pdf');
 
 -- Inserir Contratos
 INSERT INTO contracts (id, event_id, pdf_file)
@@ -0,0 +1,275 @@
+"""
+Fills all eight tables with synthetic, referentially consistent data so that
+production-scale performance can be reproduced locally.
+
+The size is controlled by a scale factor: scale 1 generates 1,000 orders, scale
+1000 generates 1,000,000. For every 20 orders there is one customer with five
+events (one contract each); every order has 1 to 5 items whose prices come from
+the product catalog, a payment matching the order status and, when paid, an
+invoice. Order, payment and invoice amounts always equal the sum of the items.
+
+Rows are loaded with COPY in a single transaction, after the rows already in the
+database (IDs continue from the current maximum and the sequences are moved
+forward). Every generated customer can log in with GENERATED_PASSWORD.
+
+Usage:
+    python database/generate_data.py --scale 1000 [--seed 42] [--products 200]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, Set, Tuple
+
+import psycopg
+from faker import Faker
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from db.db_sql_connection import get_conninfo  # noqa: E402
+from utils.utils_validation import get_password_hash  # noqa: E402
+from tests.utils.utils import (  # noqa: E402
+    generate_cpf,
+    generate_cnpj,
+    generate_random_email,
+    generate_cell_phone_number,
+)
+
+GENERATED_PASSWORD = "Generated123!"
+
+ORDERS_PER_SCALE = 1000
+ORDERS_PER_CUSTOMER = 20
+EVENTS_PER_CUSTOMER = 5
+MAX_ITEMS_PER_ORDER = 5
+
+TABLES = ("customers", "products", "events", "contracts", "orders", "order_items", "payments", "invoices")
+
+EVENT_TYPES = ("wedding", "corporate", "debutante", "other")
+PRODUCT_TYPES = ("drink", "structure", "service")
+LOCATIONS = (
+    "Espaço Verde", "Centro de Convenções", "Salão Real", "Chácara Bela Vista",
+    "Sítio Paraíso", "Casa de Festas Aurora", "Rooftop Jardins", "Fazenda Santa Clara",
+)
+# Days over which the events are spread, centred on today
+EVENT_DAYS = 730
+# Order status -> (payment status, whether the order has an invoice)
+ORDER_STATUSES = {"paid": ("approved", True), "pending": ("pending", False), "canceled": ("rejected", False)}
+ORDER_STATUS_WEIGHTS = (60, 30, 10)
+PAYMENT_METHODS = ("credit_card", "pix", "boleto", "bank_transfer")
+
+
+def money(cents: int) -> str:
+    """
+    Formats an amount in cents as a DECIMAL(10,2) literal.
+    """
+    return f"{cents // 100}.{cents % 100:02d}"
+
+
+def unique(generator, seen: Set[str]) -> str:
+    """
+    Calls generator until it returns a value that is not in seen.
+    """
+    value = generator()
+    while value in seen:
+        value = generator()
+    seen.add(value)
+    return value
+
+
+def next_ids(conn: psycopg.Connection) -> Dict[str, int]:
+    """
+    Returns the first free ID of every table.
+    """
+    return {
+        table: conn.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table};").fetchone()[0]
+        for table in TABLES
+    }
+
+
+def customer_rows(first_id: int, count: int, fake: Faker, password_hash: str) -> Iterator[Tuple]:
+    """
+    Yields customers with unique emails and CPF/CNPJ values.
+    """
+    emails: Set[str] = set()
+    documents: Set[str] = set()
+    for customer_id in range(first_id, first_id + count):
+        yield (
+            customer_id,
+            fake.name(),
+            unique(generate_random_email, emails),
+            generate_cell_phone_number(),
+            fake.street_address(),
+            unique(generate_cnpj if random.random() < 0.2 else generate_cpf, documents),
+            password_hash,
+            "customer",
+        )
+
+
+def copy_rows(conn: psycopg.Connection, table: str, columns: Tuple[str, ...], rows) -> int:
+    """
+    Loads rows into a table with COPY and returns how many were written.
+    """
+    count = 0
+    with conn.cursor().copy(f"COPY {table} ({', '.join(columns)}) FROM STDIN") as copy:
+        for row in rows:
+            copy.write_row(row)
+            count += 1
+    return count
+
+
+def generate(conn: psycopg.Connection, scale: float, products: int) -> Dict[str, int]:
+    """
+    Generates and loads every table, returning the number of rows per table.
+
+    Args:
+        conn (psycopg.Connection): Connection with an open transaction.
+        scale (float): Scale factor; 1 means 1,000 orders.
+        products (int): Number of products in the catalog.
+
+    Returns:
+        Dict[str, int]: Rows inserted per table.
+    """
+    fake = Faker()
+    now = datetime.now().replace(microsecond=0)
+    ids = next_ids(conn)
+    counts = {}
+
+    n_orders = max(int(scale * ORDERS_PER_SCALE), 1)
+    n_customers = max(n_orders // ORDERS_PER_CUSTOMER, 1)
+    n_events = n_customers * EVENTS_PER_CUSTOMER
+
+    # customers
+    password_hash = get_password_hash(GENERATED_PASSWORD)
+    counts["customers"] = copy_rows(
+        conn, "customers",
+        ("id", "full_name", "email", "phone", "address", "cpf_cnpj", "password_hash", "role"),
+        customer_rows(ids["customers"], n_customers, fake, password_hash),
+    )
+
+    # products: the prices are kept to compute the order totals
+    product_prices = array("q", (random.randint(10, 2000) * 100 for _ in range(products)))
+    counts["products"] = copy_rows(
+        conn, "products", ("id", "name", "description", "base_price", "category"),
+        (
+            (ids["products"] + index, f"{fake.word().title()} {index + 1}", fake.sentence(),
+             money(price), random.choice(PRODUCT_TYPES))
+            for index, price in enumerate(product_prices)
+        ),
+    )
+
+    # events, each one with a contract; a location hosts at most one event per day,
+    # starting between 08:00 and 13:00 and lasting 2 to 10 hours, so bookings never
+    # overlap (events_no_overlap). Venues get a room number to stay apart from existing rows.
+    n_locations = -(-n_events // EVENT_DAYS)
+    first_day = now.replace(hour=0, minute=0, second=0) - timedelta(days=EVENT_DAYS // 2)
+    counts["events"] = copy_rows(
+        conn, "events", ("id", "customer_id", "event_type", "event_date", "location", "guest_count", "duration_hours"),
+        (
+            (ids["events"] + index, ids["customers"] + index // EVENTS_PER_CUSTOMER, random.choice(EVENT_TYPES),
+             first_day + timedelta(days=index // n_locations, hours=random.randint(8, 13)),
+             f"{LOCATIONS[index % n_locations % len(LOCATIONS)]} - Sala {index % n_locations // len(LOCATIONS) + 1}",
+             random.randint(20, 500), random.randint(2, 10))
+            for index in range(n_events)
+        ),
+    )
+    counts["contracts"] = copy_rows(
+        conn, "contracts", ("id", "event_id", "pdf_file"),
+        ((ids["contracts"] + index, ids["events"] + index, f"contract_{ids['events'] + index}.pdf")
+         for index in range(n_events)),
+    )
+
+    # order items are drawn first so that the order totals match them exactly
+    item_counts = array("b", (random.randint(1, MAX_ITEMS_PER_ORDER) for _ in range(n_orders)))
+    item_products = array("i", (random.randrange(products) for _ in range(sum(item_counts))))
+    item_quantities = array("i", (random.randint(1, 50) for _ in range(len(item_products))))
+    totals = array("q", [0]) * n_orders
+    position = 0
+    for order_index, count in enumerate(item_counts):
+        totals[order_index] = sum(
+            product_prices[item_products[i]] * item_quantities[i] for i in range(position, position + count)
+        )
+        position += count
+
+    statuses = random.choices(tuple(ORDER_STATUSES), weights=ORDER_STATUS_WEIGHTS, k=n_orders)
+    order_dates = [now - timedelta(minutes=random.randint(0, 525600)) for _ in range(n_orders)]
+
+    counts["orders"] = copy_rows(
+        conn, "orders", ("id", "event_id", "order_date", "total_amount", "status"),
+        (
+            (ids["orders"] + index, ids["events"] + random.randrange(n_events), order_dates[index],
+             money(totals[index]), statuses[index])
+            for index in range(n_orders)
+        ),
+    )
+
+    def order_item_rows() -> Iterator[Tuple]:
+        item = 0
+        for order_index, count in enumerate(item_counts):
+            for _ in range(count):
+                price = product_prices[item_products[item]]
+                quantity = item_quantities[item]
+                yield (ids["order_items"] + item, ids["orders"] + order_index, ids["products"] + item_products[item],
+                       quantity, money(price), money(price * quantity))
+                item += 1
+
+    counts["order_items"] = copy_rows(
+        conn, "order_items", ("id", "order_id", "product_id", "quantity", "unit_price", "total_price"),
+        order_item_rows(),
+    )
+
+    counts["payments"] = copy_rows(
+        conn, "payments", ("id", "order_id", "amount", "payment_method", "status", "payment_date"),
+        (
+            (ids["payments"] + index, ids["orders"] + index, money(totals[index]), random.choice(PAYMENT_METHODS),
+             ORDER_STATUSES[statuses[index]][0],
+             None if statuses[index] == "pending" else order_dates[index] + timedelta(days=random.randint(0, 5)))
+            for index in range(n_orders)
+        ),
+    )
+
+    paid = [index for index in range(n_orders) if ORDER_STATUSES[statuses[index]][1]]
+    counts["invoices"] = copy_rows(
+        conn, "invoices", ("id", "order_id", "invoice_number", "issue_date", "total_amount", "pdf_file"),
+        (
+            (ids["invoices"] + position, ids["orders"] + index, f"NF-{ids['orders'] + index}",
+             order_dates[index] + timedelta(days=1), money(totals[index]), f"nf_{ids['orders'] + index}.pdf")
+            for position, index in enumerate(paid)
+        ),
+    )
+
+    # move every sequence past the explicit IDs
+    for table in TABLES:
+        conn.execute(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT COALESCE(MAX(id), 1) FROM {table}));"
+        )
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=1, help="1 = 1,000 orders, 1000 = 1,000,000 orders")
+    parser.add_argument("--products", type=int, default=200, help="number of products in the catalog")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for reproducible data")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    Faker.seed(args.seed)
+
+    start = time.perf_counter()
+    with psycopg.connect(get_conninfo()) as conn:
+        counts = generate(conn, args.scale, args.products)
+        conn.commit()
+        conn.autocommit = True
+        conn.execute("ANALYZE;")
+
+    for table, count in counts.items():
+        print(f"{table:<12} {count:>12,} rows")
+    print(f"loaded in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
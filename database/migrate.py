@@ -0,0 +1,106 @@
+"""
+Applies the versioned SQL migrations in database/migrations/ to the database
+configured through the SUPABASE_* variables.
+
+Files are applied in name order (001_..., 002_...), each in its own transaction,
+and recorded in the schema_migrations table so every file runs only once.
+Run it after database/01_tables.sql:
+
+    python database/migrate.py            # apply pending migrations
+    python database/migrate.py --status   # list applied and pending migrations
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import List
+
+import psycopg
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from db.db_sql_connection import get_conninfo  # noqa: E402
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
+
+
+def migration_files(directory: Path = MIGRATIONS_DIR) -> List[Path]:
+    """
+    Returns the migration files in the order they must be applied.
+
+    Args:
+        directory (Path): Folder containing the NNN_name.sql files.
+
+    Returns:
+        List[Path]: Migration files sorted by version.
+    """
+    return sorted(directory.glob("*.sql"))
+
+
+def applied_versions(conn: psycopg.Connection) -> List[str]:
+    """
+    Returns the versions already recorded in schema_migrations, creating the table if needed.
+
+    Args:
+        conn (psycopg.Connection): Database connection object.
+
+    Returns:
+        List[str]: Applied versions (file names without extension).
+    """
+    with conn.transaction():
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version VARCHAR(255) PRIMARY KEY,
+                applied_at TIMESTAMP NOT NULL DEFAULT NOW()
+            );
+            """
+        )
+        rows = conn.execute("SELECT version FROM schema_migrations ORDER BY version;").fetchall()
+    return [row[0] for row in rows]
+
+
+def apply_migrations(conn: psycopg.Connection, directory: Path = MIGRATIONS_DIR) -> List[str]:
+    """
+    Applies every pending migration, each in its own transaction.
+
+    Args:
+        conn (psycopg.Connection): Database connection object in autocommit mode.
+        directory (Path): Folder containing the migration files.
+
+    Returns:
+        List[str]: Versions applied by this call.
+    """
+    done = set(applied_versions(conn))
+    applied = []
+
+    for path in migration_files(directory):
+        if path.stem in done:
+            continue
+        with conn.transaction():
+            conn.execute(path.read_text())
+            conn.execute("INSERT INTO schema_migrations (version) VALUES (%s);", (path.stem,))
+        applied.append(path.stem)
+        print(f"applied {path.name}")
+    return applied
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--status", action="store_true", help="list migrations without applying them")
+    args = parser.parse_args()
+
+    with psycopg.connect(get_conninfo(), autocommit=True) as conn:
+        if args.status:
+            done = set(applied_versions(conn))
+            for path in migration_files():
+                print(f"{'applied' if path.stem in done else 'pending':<8} {path.name}")
+            return
+
+        if not apply_migrations(conn):
+            print("database is up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+-- Índices das chaves estrangeiras (Foreign key indexes)
+-- PostgreSQL does not index foreign key columns automatically. Without these, the
+-- customer-scoped reads (events -> orders -> payments / invoices / order_items)
+-- and every ON DELETE CASCADE fall back to sequential scans as the tables grow.
+
+CREATE INDEX IF NOT EXISTS idx_events_customer_id ON events (customer_id);
+CREATE INDEX IF NOT EXISTS idx_orders_event_id ON orders (event_id);
+CREATE INDEX IF NOT EXISTS idx_order_items_order_id ON order_items (order_id);
+CREATE INDEX IF NOT EXISTS idx_order_items_product_id ON order_items (product_id);
+CREATE INDEX IF NOT EXISTS idx_payments_order_id ON payments (order_id);
+CREATE INDEX IF NOT EXISTS idx_invoices_order_id ON invoices (order_id);
+CREATE INDEX IF NOT EXISTS idx_contracts_event_id ON contracts (event_id);
@@ -0,0 +1,17 @@
+-- Notificação de alterações em produtos (Product change notifications)
+-- Every statement that changes the products table notifies the 'products_changed'
+-- channel, so each API worker drops its in-memory product catalog
+-- (src/db/db_product_catalog.py) without polling. One notification per statement:
+-- the catalog reloads the whole table, so bulk writes do not flood the channel.
+
+CREATE OR REPLACE FUNCTION notify_products_changed() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('products_changed', TG_OP);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS products_changed ON products;
+CREATE TRIGGER products_changed
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON products
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_products_changed();
@@ -0,0 +1,204 @@
+-- Tabelas de resumo para relatórios (Report rollup tables)
+-- Daily totals kept up to date by triggers in the same transaction as the change,
+-- so the /reports/ endpoints read a few rows per day instead of scanning orders,
+-- order_items and payments:
+--   report_daily_revenue        orders and revenue by day, event type and order status
+--   report_daily_product_sales  quantity and revenue by day (of the order) and product
+--   report_daily_payments       payments and amount by day, method and payment status
+--
+-- Orders are dated by order_date, and order items by the order_date of their order.
+-- Payments are dated by payment_date, or by their last update while they have none.
+
+CREATE TABLE IF NOT EXISTS report_daily_revenue (
+    day DATE NOT NULL,
+    event_type event_type NOT NULL,
+    status order_status NOT NULL,
+    orders INT NOT NULL DEFAULT 0,
+    revenue DECIMAL(14,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, event_type, status)
+);
+
+CREATE TABLE IF NOT EXISTS report_daily_product_sales (
+    day DATE NOT NULL,
+    product_id INT NOT NULL,
+    quantity BIGINT NOT NULL DEFAULT 0,
+    revenue DECIMAL(14,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, product_id)
+);
+
+CREATE TABLE IF NOT EXISTS report_daily_payments (
+    day DATE NOT NULL,
+    payment_method payment_method NOT NULL,
+    status payment_status NOT NULL,
+    payments INT NOT NULL DEFAULT 0,
+    amount DECIMAL(14,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, payment_method, status)
+);
+
+-- Adds (or, with negative values, removes) a contribution to one rollup row
+CREATE OR REPLACE FUNCTION report_add_revenue(p_day DATE, p_event_type event_type, p_status order_status,
+                                              p_orders INT, p_revenue DECIMAL) RETURNS void AS $$
+    INSERT INTO report_daily_revenue AS r (day, event_type, status, orders, revenue)
+    VALUES (p_day, p_event_type, p_status, p_orders, p_revenue)
+    ON CONFLICT (day, event_type, status)
+    DO UPDATE SET orders = r.orders + EXCLUDED.orders, revenue = r.revenue + EXCLUDED.revenue;
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION report_add_product_sales(p_day DATE, p_product_id INT, p_quantity BIGINT,
+                                                   p_revenue DECIMAL) RETURNS void AS $$
+    INSERT INTO report_daily_product_sales AS r (day, product_id, quantity, revenue)
+    VALUES (p_day, p_product_id, p_quantity, p_revenue)
+    ON CONFLICT (day, product_id)
+    DO UPDATE SET quantity = r.quantity + EXCLUDED.quantity, revenue = r.revenue + EXCLUDED.revenue;
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION report_add_payments(p_day DATE, p_method payment_method, p_status payment_status,
+                                               p_payments INT, p_amount DECIMAL) RETURNS void AS $$
+    INSERT INTO report_daily_payments AS r (day, payment_method, status, payments, amount)
+    VALUES (p_day, p_method, p_status, p_payments, p_amount)
+    ON CONFLICT (day, payment_method, status)
+    DO UPDATE SET payments = r.payments + EXCLUDED.payments, amount = r.amount + EXCLUDED.amount;
+$$ LANGUAGE sql;
+
+-- orders -> report_daily_revenue (and moving its items when order_date changes day)
+CREATE OR REPLACE FUNCTION report_orders_changed() RETURNS trigger AS $$
+DECLARE
+    v_event_type event_type;
+BEGIN
+    IF TG_OP = 'UPDATE'
+       AND (OLD.event_id, OLD.order_date::date, OLD.status, OLD.total_amount)
+           IS NOT DISTINCT FROM (NEW.event_id, NEW.order_date::date, NEW.status, NEW.total_amount) THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        -- not found when the event itself is being deleted: it already removed its orders
+        SELECT event_type INTO v_event_type FROM events WHERE id = OLD.event_id;
+        IF FOUND THEN
+            PERFORM report_add_revenue(OLD.order_date::date, v_event_type, OLD.status, -1, -OLD.total_amount);
+        END IF;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT event_type INTO v_event_type FROM events WHERE id = NEW.event_id;
+        PERFORM report_add_revenue(NEW.order_date::date, v_event_type, NEW.status, 1, NEW.total_amount);
+    END IF;
+
+    IF TG_OP = 'UPDATE' AND OLD.order_date::date <> NEW.order_date::date THEN
+        PERFORM report_add_product_sales(OLD.order_date::date, i.product_id, -SUM(i.quantity), -SUM(i.total_price)),
+                report_add_product_sales(NEW.order_date::date, i.product_id, SUM(i.quantity), SUM(i.total_price))
+        FROM order_items i WHERE i.order_id = NEW.id GROUP BY i.product_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Removes the items of a deleted order while the order still exists; the items
+-- deleted by the cascade afterwards no longer find their order and are skipped.
+CREATE OR REPLACE FUNCTION report_order_deleting() RETURNS trigger AS $$
+BEGIN
+    PERFORM report_add_product_sales(OLD.order_date::date, i.product_id, -SUM(i.quantity), -SUM(i.total_price))
+    FROM order_items i WHERE i.order_id = OLD.id GROUP BY i.product_id;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+-- order_items -> report_daily_product_sales
+CREATE OR REPLACE FUNCTION report_order_items_changed() RETURNS trigger AS $$
+DECLARE
+    v_day DATE;
+BEGIN
+    IF TG_OP = 'UPDATE'
+       AND (OLD.order_id, OLD.product_id, OLD.quantity, OLD.total_price)
+           IS NOT DISTINCT FROM (NEW.order_id, NEW.product_id, NEW.quantity, NEW.total_price) THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        SELECT order_date::date INTO v_day FROM orders WHERE id = OLD.order_id;
+        IF FOUND THEN
+            PERFORM report_add_product_sales(v_day, OLD.product_id, -OLD.quantity, -OLD.total_price);
+        END IF;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT order_date::date INTO v_day FROM orders WHERE id = NEW.order_id;
+        PERFORM report_add_product_sales(v_day, NEW.product_id, NEW.quantity, NEW.total_price);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- payments -> report_daily_payments
+CREATE OR REPLACE FUNCTION report_payments_changed() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM report_add_payments(COALESCE(OLD.payment_date, OLD.updated_at)::date, OLD.payment_method,
+                                    OLD.status, -1, -OLD.amount);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM report_add_payments(COALESCE(NEW.payment_date, NEW.updated_at)::date, NEW.payment_method,
+                                    NEW.status, 1, NEW.amount);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- events: moves their orders when the event type changes, removes them before a delete
+CREATE OR REPLACE FUNCTION report_events_changed() RETURNS trigger AS $$
+BEGIN
+    PERFORM report_add_revenue(o.order_date::date, OLD.event_type, o.status, -COUNT(*)::int, -SUM(o.total_amount))
+    FROM orders o WHERE o.event_id = OLD.id GROUP BY o.order_date::date, o.status;
+
+    IF TG_OP = 'DELETE' THEN
+        RETURN OLD;
+    END IF;
+
+    PERFORM report_add_revenue(o.order_date::date, NEW.event_type, o.status, COUNT(*)::int, SUM(o.total_amount))
+    FROM orders o WHERE o.event_id = NEW.id GROUP BY o.order_date::date, o.status;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS report_orders_changed ON orders;
+CREATE TRIGGER report_orders_changed
+    AFTER INSERT OR UPDATE OR DELETE ON orders
+    FOR EACH ROW EXECUTE FUNCTION report_orders_changed();
+
+DROP TRIGGER IF EXISTS report_order_deleting ON orders;
+CREATE TRIGGER report_order_deleting
+    BEFORE DELETE ON orders
+    FOR EACH ROW EXECUTE FUNCTION report_order_deleting();
+
+DROP TRIGGER IF EXISTS report_order_items_changed ON order_items;
+CREATE TRIGGER report_order_items_changed
+    AFTER INSERT OR UPDATE OR DELETE ON order_items
+    FOR EACH ROW EXECUTE FUNCTION report_order_items_changed();
+
+DROP TRIGGER IF EXISTS report_payments_changed ON payments;
+CREATE TRIGGER report_payments_changed
+    AFTER INSERT OR UPDATE OR DELETE ON payments
+    FOR EACH ROW EXECUTE FUNCTION report_payments_changed();
+
+DROP TRIGGER IF EXISTS report_events_changed ON events;
+CREATE TRIGGER report_events_changed
+    BEFORE DELETE OR UPDATE OF event_type ON events
+    FOR EACH ROW EXECUTE FUNCTION report_events_changed();
+
+-- Backfill from the existing rows (runs in the migration's transaction)
+TRUNCATE report_daily_revenue, report_daily_product_sales, report_daily_payments;
+
+INSERT INTO report_daily_revenue (day, event_type, status, orders, revenue)
+SELECT o.order_date::date, e.event_type, o.status, COUNT(*), SUM(o.total_amount)
+FROM orders o JOIN events e ON e.id = o.event_id
+GROUP BY 1, 2, 3;
+
+INSERT INTO report_daily_product_sales (day, product_id, quantity, revenue)
+SELECT o.order_date::date, i.product_id, SUM(i.quantity), SUM(i.total_price)
+FROM order_items i JOIN orders o ON o.id = i.order_id
+GROUP BY 1, 2;
+
+INSERT INTO report_daily_payments (day, payment_method, status, payments, amount)
+SELECT COALESCE(payment_date, updated_at)::date, payment_method, status, COUNT(*), SUM(amount)
+FROM payments
+GROUP BY 1, 2, 3;
@@ -0,0 +1,7 @@
+-- Índice do calendário de eventos (Event calendar index)
+-- Serves GET /events/calendar: a range on event_date, optionally narrowed to one
+-- location. The INCLUDE columns are the rest of the compact calendar response and
+-- the event_type filter, so month views are answered by index-only scans.
+
+CREATE INDEX IF NOT EXISTS idx_events_event_date_location
+    ON events (event_date, location) INCLUDE (id, guest_count, event_type);
@@ -0,0 +1,77 @@
+-- Conflitos de agenda por local (Scheduling conflicts per location)
+-- An event occupies its location from event_date for duration_hours. Two events at
+-- the same location may not overlap; a conflicting INSERT or UPDATE fails with
+-- SQLSTATE 23P01 (exclusion_violation) on "events_no_overlap", which the API
+-- answers with 409.
+--
+-- Where the btree_gist extension is available (Supabase, the official PostgreSQL
+-- images) this is an exclusion constraint over (location, period), whose GiST index
+-- also serves GET /events/availability. PostgreSQL builds without the contrib
+-- modules get a GiST index on the period and a trigger that serializes bookings per
+-- location with an advisory lock and probes that index, raising the same error.
+--
+-- The migration stops if existing events already overlap; list them with
+--   SELECT * FROM events_overlapping;
+-- and move or shorten them before running it again.
+
+CREATE OR REPLACE FUNCTION event_period(p_event_date TIMESTAMP, p_duration_hours INT) RETURNS tsrange AS $$
+    SELECT tsrange(p_event_date, p_event_date + p_duration_hours * INTERVAL '1 hour');
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE VIEW events_overlapping AS
+SELECT id, location, event_date, duration_hours, busy_until
+FROM (
+    SELECT id, location, event_date, duration_hours,
+           max(upper(event_period(event_date, duration_hours))) OVER (w ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING) AS busy_until
+    FROM events
+    WINDOW w AS (PARTITION BY location ORDER BY event_date, id)
+) e
+WHERE event_date < busy_until;
+
+CREATE OR REPLACE FUNCTION events_check_overlap() RETURNS trigger AS $$
+DECLARE
+    v_conflict_id INT;
+BEGIN
+    -- concurrent bookings of the same location wait here until the first commits
+    PERFORM pg_advisory_xact_lock(hashtext('events_no_overlap'), hashtext(NEW.location));
+
+    SELECT id INTO v_conflict_id
+    FROM events
+    WHERE location = NEW.location
+      AND id <> NEW.id
+      AND event_period(event_date, duration_hours) && event_period(NEW.event_date, NEW.duration_hours)
+    LIMIT 1;
+
+    IF FOUND THEN
+        RAISE EXCEPTION 'conflicting key value violates exclusion constraint "events_no_overlap"'
+            USING ERRCODE = 'exclusion_violation',
+                  CONSTRAINT = 'events_no_overlap',
+                  TABLE = 'events',
+                  DETAIL = format('Event %s already occupies %s at that time.', v_conflict_id, NEW.location);
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    v_overlapping INT;
+BEGIN
+    SELECT COUNT(*) INTO v_overlapping FROM events_overlapping;
+    IF v_overlapping > 0 THEN
+        RAISE EXCEPTION '% events overlap an earlier event at the same location', v_overlapping
+            USING HINT = 'SELECT * FROM events_overlapping; then move or shorten them and run the migration again.';
+    END IF;
+
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'btree_gist') THEN
+        CREATE EXTENSION IF NOT EXISTS btree_gist;
+        ALTER TABLE events ADD CONSTRAINT events_no_overlap
+            EXCLUDE USING gist (location WITH =, event_period(event_date, duration_hours) WITH &&);
+    ELSE
+        CREATE INDEX IF NOT EXISTS idx_events_period ON events USING gist (event_period(event_date, duration_hours));
+        CREATE TRIGGER events_no_overlap
+            BEFORE INSERT OR UPDATE OF event_date, duration_hours, location ON events
+            FOR EACH ROW EXECUTE FUNCTION events_check_overlap();
+    END IF;
+END;
+$$;
@@ -0,0 +1,72 @@
+-- Total do pedido derivado dos itens (Order totals maintained from the order items)
+-- orders.total_amount is the sum of the order's order_items.total_price. Every
+-- INSERT, UPDATE or DELETE on order_items applies the difference to the orders it
+-- touched, in the same transaction. The triggers are statement-level: a statement
+-- writing hundreds of items of one order (POST /orders/batch) updates that order
+-- once, with the sum of its deltas read from the transition tables.
+--
+-- The migration ends by setting the existing totals to the sum of their items,
+-- with the same set-based recompute as db/CRUD/update.py. Totals that drift later
+-- through direct writes to orders are fixed by POST /admin/orders/recompute-totals.
+
+CREATE OR REPLACE FUNCTION order_items_apply_totals() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE orders o
+        SET total_amount = o.total_amount + d.delta, updated_at = NOW()
+        FROM (SELECT order_id, SUM(total_price) AS delta FROM new_items GROUP BY order_id) d
+        WHERE o.id = d.order_id AND d.delta <> 0;
+    ELSIF TG_OP = 'DELETE' THEN
+        -- orders deleted by the same statement (ON DELETE CASCADE) are simply not found
+        UPDATE orders o
+        SET total_amount = o.total_amount - d.delta, updated_at = NOW()
+        FROM (SELECT order_id, SUM(total_price) AS delta FROM old_items GROUP BY order_id) d
+        WHERE o.id = d.order_id AND d.delta <> 0;
+    ELSE
+        UPDATE orders o
+        SET total_amount = o.total_amount + d.delta, updated_at = NOW()
+        FROM (
+            SELECT order_id, SUM(delta) AS delta
+            FROM (
+                SELECT order_id, total_price AS delta FROM new_items
+                UNION ALL
+                SELECT order_id, -total_price FROM old_items
+            ) changes
+            GROUP BY order_id
+        ) d
+        WHERE o.id = d.order_id AND d.delta <> 0;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- a trigger with transition tables can only handle one event
+DROP TRIGGER IF EXISTS order_items_totals_insert ON order_items;
+CREATE TRIGGER order_items_totals_insert
+    AFTER INSERT ON order_items
+    REFERENCING NEW TABLE AS new_items
+    FOR EACH STATEMENT EXECUTE FUNCTION order_items_apply_totals();
+
+DROP TRIGGER IF EXISTS order_items_totals_update ON order_items;
+CREATE TRIGGER order_items_totals_update
+    AFTER UPDATE ON order_items
+    REFERENCING OLD TABLE AS old_items NEW TABLE AS new_items
+    FOR EACH STATEMENT EXECUTE FUNCTION order_items_apply_totals();
+
+DROP TRIGGER IF EXISTS order_items_totals_delete ON order_items;
+CREATE TRIGGER order_items_totals_delete
+    AFTER DELETE ON order_items
+    REFERENCING OLD TABLE AS old_items
+    FOR EACH STATEMENT EXECUTE FUNCTION order_items_apply_totals();
+
+-- reconcile the totals written before the triggers existed; orders without items get zero
+UPDATE orders o
+SET total_amount = t.total, updated_at = NOW()
+FROM (
+    SELECT o.id, COALESCE(i.total, 0) AS total
+    FROM orders o
+    LEFT JOIN (
+        SELECT order_id, SUM(total_price) AS total FROM order_items GROUP BY order_id
+    ) i ON i.order_id = o.id
+) t
+WHERE o.id = t.id AND o.total_amount <> t.total;
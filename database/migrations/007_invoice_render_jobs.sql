@@ -0,0 +1,27 @@
+-- Fila de geração de PDFs de notas fiscais (Invoice PDF render queue)
+-- POST /invoices/{id}/render queues a job here; the API workers claim pending jobs
+-- with FOR UPDATE SKIP LOCKED, render the PDFs on a process pool and record the
+-- file in invoices.pdf_file. Clients poll GET /invoices/render-jobs/{job_id}.
+--
+-- At most one job per invoice can be pending or running: concurrent requests for
+-- the same invoice hit the partial unique index and share the job already queued.
+
+CREATE TABLE IF NOT EXISTS invoice_render_jobs (
+    id SERIAL PRIMARY KEY,
+    invoice_id INT NOT NULL,
+    status VARCHAR(10) NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'running', 'done', 'failed')),
+    attempts INT NOT NULL DEFAULT 0,
+    error TEXT,
+    pdf_file VARCHAR(255),
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    FOREIGN KEY (invoice_id) REFERENCES invoices(id) ON DELETE CASCADE
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_invoice_render_jobs_active
+    ON invoice_render_jobs (invoice_id) WHERE status IN ('pending', 'running');
+
+-- the claim query reads the queue in id order
+CREATE INDEX IF NOT EXISTS idx_invoice_render_jobs_queue
+    ON invoice_render_jobs (id) WHERE status IN ('pending', 'running');
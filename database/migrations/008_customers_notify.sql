@@ -0,0 +1,27 @@
+-- Notificação de alterações em clientes (Customer change notifications)
+-- Every UPDATE or DELETE of a customer notifies the 'customers_changed' channel with
+-- the customer's id, so each API worker drops that customer from its authenticated
+-- user cache (src/utils/utils_cache.py), whichever worker or script made the change.
+-- Inserts are not notified: a new customer cannot be cached yet. A TRUNCATE
+-- notifies an empty payload, which drops every cached customer.
+
+CREATE OR REPLACE FUNCTION notify_customers_changed() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        PERFORM pg_notify('customers_changed', '');
+    ELSE
+        PERFORM pg_notify('customers_changed', OLD.id::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS customers_changed ON customers;
+CREATE TRIGGER customers_changed
+    AFTER UPDATE OR DELETE ON customers
+    FOR EACH ROW EXECUTE FUNCTION notify_customers_changed();
+
+DROP TRIGGER IF EXISTS customers_truncated ON customers;
+CREATE TRIGGER customers_truncated
+    AFTER TRUNCATE ON customers
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_customers_changed();
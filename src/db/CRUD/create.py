@@ -1,6 +1,11 @@
-from typing import Dict
+from decimal import Decimal
+from typing import AsyncIterable, Dict, List, Optional, Tuple
+from psycopg import errors
 from fastapi import HTTPException
-from db.db_sql_connection import connect
+from db.db_sql_connection import async_connect
+from db.db_product_catalog import product_catalog
+from db.CRUD.read import forget_event_reads, forget_product_reads
+from utils.utils_scheduling import booking_conflict
 
 
 async def create_customer(customer_data: Dict[str, str]) -> Dict[str, str]:
@@ -22,10 +27,10 @@ async def create_customer(customer_data: Dict[str, str]) -> Dict[str, str]:
     """
 
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, customer_data)
-            conn.commit()
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, customer_data)
+            await conn.commit()
         return {"message": "Customer inserted successfully!"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -42,7 +47,8 @@ async def create_event(event_data: Dict[str, str]) -> Dict[str, str]:
         Dict[str, str]: Success message.
 
     Raises:
-        HTTPException: If an error occurs while inserting the event into the database.
+        HTTPException: 409 if the location is already booked at that time, 500 if an
+        error occurs while inserting the event into the database.
     """
     query = """
         INSERT INTO events (customer_id, event_type, event_date, location, guest_count, duration_hours, budget_approved)
@@ -51,12 +57,15 @@ async def create_event(event_data: Dict[str, str]) -> Dict[str, str]:
     """
 
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, event_data)
-                new_event_id = cursor.fetchone()[0]
-            conn.commit()
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, event_data)
+                new_event_id = (await cursor.fetchone())[0]
+            await conn.commit()
+        forget_event_reads()
         return {"message": "Event successfully created!", "event_id": new_event_id}
+    except errors.ExclusionViolation:
+        raise await booking_conflict(event_data["location"], event_data["event_date"], event_data["duration_hours"])
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -65,6 +74,9 @@ async def create_order(order_data: Dict[str, str]) -> Dict[str, str]:
     """
     Inserts a new order into the orders table.
 
+    The order starts with a total of zero; the total_amount in order_data is
+    ignored, since the order_items triggers keep it equal to the sum of the items.
+
     Args:
         order_data (Dict[str, str]): Dictionary containing the order details.
 
@@ -76,20 +88,97 @@ async def create_order(order_data: Dict[str, str]) -> Dict[str, str]:
     """
     query = """
         INSERT INTO orders (event_id, order_date, total_amount, status)
-        VALUES (%(event_id)s, %(order_date)s, %(total_amount)s, %(status)s)
+        VALUES (%(event_id)s, %(order_date)s, 0, %(status)s)
         RETURNING id;
     """
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, order_data)
-                order_id = cursor.fetchone()[0]
-            conn.commit()
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, order_data)
+                order_id = (await cursor.fetchone())[0]
+            await conn.commit()
         return {"message": "Order successfully created!", "order_id": order_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def create_order_with_items(order_data: Dict[str, str], items: List[Dict]) -> Dict:
+    """
+    Creates an order and all its items in a single transaction.
+
+    Every referenced product is fetched with one query; unit and total prices
+    come from the products' base prices. The order and its items are then
+    inserted by one statement (the items with a multi-row insert), so the whole
+    order costs two round trips and a commit. The order total is set by the
+    order_items triggers, once for the whole statement.
+
+    Args:
+        order_data (Dict[str, str]): Order details: event_id, order_date and status.
+        items (List[Dict]): The items, each with product_id and quantity.
+
+    Returns:
+        Dict: The order ID, the item IDs (in the order of `items`) and the order total.
+
+    Raises:
+        HTTPException: 404 if a product does not exist, 400 if one is inactive,
+            500 if an error occurs while inserting the data.
+    """
+    products_query = "SELECT id, base_price, active FROM products WHERE id = ANY(%s);"
+    insert_query = """
+        WITH new_order AS (
+            INSERT INTO orders (event_id, order_date, total_amount, status)
+            VALUES (%(event_id)s, %(order_date)s, 0, %(status)s)
+            RETURNING id
+        )
+        INSERT INTO order_items (order_id, product_id, quantity, unit_price, total_price)
+        SELECT new_order.id, item.product_id, item.quantity, item.unit_price, item.total_price
+        FROM new_order,
+             unnest(%(product_ids)s::int[], %(quantities)s::int[], %(unit_prices)s::numeric[],
+                    %(total_prices)s::numeric[]) WITH ORDINALITY
+                AS item(product_id, quantity, unit_price, total_price, position)
+        ORDER BY item.position
+        RETURNING order_id, id;
+    """
+    try:
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                product_ids = sorted({item["product_id"] for item in items})
+                await cursor.execute(products_query, (product_ids,))
+                products = {row[0]: row for row in await cursor.fetchall()}
+
+                missing = [product_id for product_id in product_ids if product_id not in products]
+                if missing:
+                    raise HTTPException(status_code=404, detail=f"Products not found: {missing}")
+                inactive = [product_id for product_id in product_ids if not products[product_id][2]]
+                if inactive:
+                    raise HTTPException(status_code=400, detail=f"Products are not active: {inactive}")
+
+                unit_prices = [products[item["product_id"]][1] for item in items]
+                total_prices = [Decimal(item["quantity"]) * price for item, price in zip(items, unit_prices)]
+                total_amount = sum(total_prices, Decimal(0))
+
+                await cursor.execute(insert_query, {
+                    **order_data,
+                    "product_ids": [item["product_id"] for item in items],
+                    "quantities": [item["quantity"] for item in items],
+                    "unit_prices": unit_prices,
+                    "total_prices": total_prices,
+                })
+                rows = await cursor.fetchall()
+            await conn.commit()
+        # item ids come from a sequence, so they follow the insertion order
+        return {
+            "message": "Order successfully created!",
+            "order_id": rows[0][0],
+            "order_item_ids": sorted(row[1] for row in rows),
+            "total_amount": total_amount,
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 async def create_payment(payment_data: Dict[str, str]) -> Dict[str, str]:
     """
     Inserts a new payment into the 'payments' table.
@@ -109,11 +198,11 @@ async def create_payment(payment_data: Dict[str, str]) -> Dict[str, str]:
         RETURNING id;
     """
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, payment_data)
-                new_payment_id = cursor.fetchone()[0]  # Captura o ID inserido
-            conn.commit()
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, payment_data)
+                new_payment_id = (await cursor.fetchone())[0]  # Captura o ID inserido
+            await conn.commit()
         return {
             "message": "Payment created successfully!",
             "payment_id": new_payment_id,
@@ -138,12 +227,15 @@ async def create_product(product_data: Dict[str, str]) -> Dict[str, str]:
         RETURNING *;
     """
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, product_data)
-                new_product = cursor.fetchone()
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, product_data)
+                new_product = await cursor.fetchone()
                 columns = [desc[0] for desc in cursor.description]
-                return dict(zip(columns, new_product))
+        # committed: this worker must not wait for the notification to see it
+        product_catalog.invalidate()
+        forget_product_reads()
+        return dict(zip(columns, new_product))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -168,11 +260,13 @@ async def create_contract(contract_data: Dict[str, str]) -> Dict[str, str]:
     """
 
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, contract_data)
-                contract_id = cursor.fetchone()[0]
-            conn.commit()
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(
+                    query, {"event_id": contract_data["event_id"], "pdf_file": contract_data.get("pdf_file")}
+                )
+                contract_id = (await cursor.fetchone())[0]
+            await conn.commit()
 
         return {"message": "Contract created successfully!", "contract_id": contract_id}
 
@@ -201,11 +295,207 @@ async def create_order_item(data: Dict) -> Dict:
         RETURNING id;
     """
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, data)
-                item_id = cursor.fetchone()[0]
-            conn.commit()
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, data)
+                item_id = (await cursor.fetchone())[0]
+            await conn.commit()
         return {"message": "Order item created", "order_item_id": item_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+async def create_invoice_render_job(invoice_id: int) -> Optional[Dict]:
+    """
+    Queues the PDF rendering of an invoice, or joins the job already queued for it.
+
+    The partial unique index on invoice_render_jobs allows one pending or running
+    job per invoice, so concurrent requests for the same invoice all get the same
+    job and the PDF is rendered once.
+
+    Args:
+        invoice_id (int): The invoice to render.
+
+    Returns:
+        Optional[Dict]: The job row, with 'deduplicated' True if it was already
+            queued, or None if the invoice does not exist.
+
+    Raises:
+        HTTPException: If an error occurs while queuing the job.
+    """
+    insert_query = """
+        INSERT INTO invoice_render_jobs (invoice_id)
+        SELECT id FROM invoices WHERE id = %(invoice_id)s
+        ON CONFLICT (invoice_id) WHERE status IN ('pending', 'running') DO NOTHING
+        RETURNING *;
+    """
+    active_query = """
+        SELECT * FROM invoice_render_jobs
+        WHERE invoice_id = %(invoice_id)s AND status IN ('pending', 'running');
+    """
+    params = {"invoice_id": invoice_id}
+    try:
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                # a job that finishes between the two statements frees the slot: try again
+                while True:
+                    await cursor.execute(insert_query, params)
+                    row, deduplicated = await cursor.fetchone(), False
+                    await conn.commit()
+                    if row is None:
+                        await cursor.execute(active_query, params)
+                        row, deduplicated = await cursor.fetchone(), True
+                    if row is not None:
+                        columns = [desc[0] for desc in cursor.description]
+                        return {**dict(zip(columns, row)), "deduplicated": deduplicated}
+
+                    await cursor.execute("SELECT 1 FROM invoices WHERE id = %(invoice_id)s;", params)
+                    if await cursor.fetchone() is None:
+                        return None
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+PRODUCT_IMPORT_COLUMNS = ("name", "description", "base_price", "category", "active")
+CUSTOMER_IMPORT_COLUMNS = ("full_name", "email", "phone", "address", "cpf_cnpj", "password_hash", "role")
+
+
+async def _copy_batches(cursor, table: str, columns: Tuple[str, ...], batches: AsyncIterable[List[Tuple[int, Dict]]]) -> int:
+    """
+    Streams batches of (line, row) into a staging table with COPY.
+
+    Returns:
+        int: Number of rows copied.
+    """
+    copied = 0
+    copy_query = f"COPY {table} (line, {', '.join(columns)}) FROM STDIN;"
+    async for batch in batches:
+        async with cursor.copy(copy_query) as copy:
+            for line, row in batch:
+                await copy.write_row((line, *(row[column] for column in columns)))
+        copied += len(batch)
+    return copied
+
+
+async def bulk_create_products(batches: AsyncIterable[List[Tuple[int, Dict]]]) -> Dict:
+    """
+    Loads validated products with COPY into a staging table, then inserts them
+    into 'products' with a single set-based statement, in one transaction.
+
+    Args:
+        batches (AsyncIterable[List[Tuple[int, Dict]]]): Batches of (line, product)
+            with the PRODUCT_IMPORT_COLUMNS keys.
+
+    Returns:
+        Dict: The number of products created and their IDs, in file order.
+
+    Raises:
+        HTTPException: If an error occurs while loading the products.
+    """
+    staging = """
+        CREATE TEMP TABLE product_import (
+            line INT NOT NULL,
+            name VARCHAR(255) NOT NULL,
+            description TEXT,
+            base_price DECIMAL(10,2) NOT NULL,
+            category product_type NOT NULL,
+            active BOOLEAN NOT NULL
+        ) ON COMMIT DROP;
+    """
+    insert = """
+        INSERT INTO products (name, description, base_price, category, active)
+        SELECT name, description, base_price, category, active
+        FROM product_import ORDER BY line
+        RETURNING id;
+    """
+    try:
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(staging)
+                await _copy_batches(cursor, "product_import", PRODUCT_IMPORT_COLUMNS, batches)
+                await cursor.execute(insert)
+                ids = sorted(row[0] for row in await cursor.fetchall())
+            await conn.commit()
+        if ids:
+            product_catalog.invalidate()
+            forget_product_reads()
+        return {"created": len(ids), "ids": ids}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def bulk_create_customers(batches: AsyncIterable[List[Tuple[int, Dict]]]) -> Dict:
+    """
+    Loads validated customers with COPY into a staging table, then inserts them
+    into 'customers' with a single set-based statement, in one transaction.
+
+    Rows whose email or CPF/CNPJ is already registered, or repeats an earlier
+    row of the same file, are left out and reported instead of failing the load.
+    So are rows registered by a concurrent transaction while the file was loaded.
+
+    Args:
+        batches (AsyncIterable[List[Tuple[int, Dict]]]): Batches of (line, customer)
+            with the CUSTOMER_IMPORT_COLUMNS keys and an already hashed password.
+
+    Returns:
+        Dict: The number of customers created, their IDs in file order, and the
+        lines left out as duplicates.
+
+    Raises:
+        HTTPException: If an error occurs while loading the customers.
+    """
+    staging = """
+        CREATE TEMP TABLE customer_import (
+            line INT NOT NULL,
+            full_name VARCHAR(255) NOT NULL,
+            email VARCHAR(255) NOT NULL,
+            phone VARCHAR(30),
+            address TEXT,
+            cpf_cnpj VARCHAR(30) NOT NULL,
+            password_hash VARCHAR(255) NOT NULL,
+            role user_type NOT NULL
+        ) ON COMMIT DROP;
+    """
+    duplicates = """
+        DELETE FROM customer_import AS s
+        WHERE EXISTS (SELECT 1 FROM customers c WHERE c.email = s.email)
+           OR EXISTS (SELECT 1 FROM customers c WHERE c.cpf_cnpj = s.cpf_cnpj)
+           OR EXISTS (SELECT 1 FROM customer_import o WHERE o.email = s.email AND o.line < s.line)
+           OR EXISTS (SELECT 1 FROM customer_import o WHERE o.cpf_cnpj = s.cpf_cnpj AND o.line < s.line)
+        RETURNING line;
+    """
+    # rows committed by a concurrent transaction after the duplicate check are
+    # skipped by ON CONFLICT; the join reports their lines (id is NULL)
+    insert = """
+        WITH inserted AS (
+            INSERT INTO customers (full_name, email, phone, address, cpf_cnpj, password_hash, role)
+            SELECT full_name, email, phone, address, cpf_cnpj, password_hash, role
+            FROM customer_import ORDER BY line
+            ON CONFLICT DO NOTHING
+            RETURNING id, email
+        )
+        SELECT s.line, i.id
+        FROM customer_import s
+        LEFT JOIN inserted i ON i.email = s.email;
+    """
+    try:
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(staging)
+                await _copy_batches(cursor, "customer_import", CUSTOMER_IMPORT_COLUMNS, batches)
+                # planner statistics for the self-joins of the duplicate check
+                await cursor.execute("ANALYZE customer_import;")
+                await cursor.execute(duplicates)
+                duplicate_lines = [row[0] for row in await cursor.fetchall()]
+                await cursor.execute(insert)
+                inserted = await cursor.fetchall()
+                ids = sorted(customer_id for _, customer_id in inserted if customer_id is not None)
+                duplicate_lines = sorted(duplicate_lines + [line for line, customer_id in inserted if customer_id is None])
+            await conn.commit()
+        return {"created": len(ids), "ids": ids, "duplicate_lines": duplicate_lines}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
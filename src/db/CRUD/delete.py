@@ -1,9 +1,11 @@
-from typing import Dict
 from fastapi import HTTPException
-from db.db_sql_connection import connect
+from db.db_sql_connection import async_connect
+from db.db_product_catalog import product_catalog
+from db.CRUD.read import forget_event_reads, forget_product_reads
+from utils.utils_cache import invalidate_cached_customer
 
 
-async def delete_order(order_id: int) -> Dict[str, str]:
+async def delete_order(order_id: int) -> bool:
     """
     Removes an order from the orders table.
 
@@ -11,18 +13,23 @@ async def delete_order(order_id: int) -> Dict[str, str]:
         order_id (int): The order identifier.
 
     Returns:
-        Dict[str, str]: Success or error message.
+        bool: True once the order is deleted.
 
     Raises:
-        HTTPException: If an error occurs while deleting data from the database.
+        HTTPException: 404 if the order does not exist, 500 if an error occurs while
+        deleting data from the database.
     """
     query = "DELETE FROM orders WHERE id = %(order_id)s"
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, {"order_id": order_id})
-            conn.commit()
-        return {"message": "Order successfully deleted!"}
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, {"order_id": order_id})
+                if cursor.rowcount == 0:
+                    raise HTTPException(status_code=404, detail="Order not found")
+            await conn.commit()
+        return True
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -35,25 +42,28 @@ async def delete_event(event_id: int) -> bool:
         event_id (int): The event ID.
 
     Returns:
-        bool: True if deletion was successful, False otherwise.
+        bool: True once the event is deleted.
 
     Raises:
-        HTTPException: If the deletion fails.
+        HTTPException: 404 if the event does not exist, 500 if the deletion fails.
     """
     query = "DELETE FROM events WHERE id = %s RETURNING id;"
 
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, (event_id,))
-                deleted_event = cursor.fetchone()
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, (event_id,))
+                deleted_event = await cursor.fetchone()
 
             if not deleted_event:
-                return False
+                raise HTTPException(status_code=404, detail="Event not found")
 
-            conn.commit()
+            await conn.commit()
+        forget_event_reads()
         return True
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -74,15 +84,16 @@ async def delete_customer(customer_id: int) -> bool:
     query = "DELETE FROM customers WHERE id = %s RETURNING id;"
 
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, (customer_id,))
-                deleted_customer = cursor.fetchone()
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, (customer_id,))
+                deleted_customer = await cursor.fetchone()
 
             if not deleted_customer:
                 return False  # Customer not found
 
-            conn.commit()
+            await conn.commit()
+        invalidate_cached_customer(customer_id)
         return True  # Customer deleted successfully
 
     except Exception as e:
@@ -97,18 +108,26 @@ async def delete_product(product_id: int) -> bool:
         product_id (int): The product ID.
 
     Returns:
-        bool: True if deletion was successful, False otherwise.
+        bool: True once the product is deleted.
+
+    Raises:
+        HTTPException: 404 if the product does not exist, 500 if the deletion fails.
     """
     query = "DELETE FROM products WHERE id = %s RETURNING id;"
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, (product_id,))
-                deleted_product = cursor.fetchone()
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, (product_id,))
+                deleted_product = await cursor.fetchone()
                 if not deleted_product:
-                    return False
-                conn.commit()
+                    raise HTTPException(status_code=404, detail="Product not found")
+                await conn.commit()
+        # committed: this worker must not wait for the notification to see it
+        product_catalog.invalidate()
+        forget_product_reads()
         return True
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -128,13 +147,13 @@ async def delete_order_item(order_item_id: int) -> bool:
     """
     query = "DELETE FROM order_items WHERE id = %s RETURNING id;"
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, (order_item_id,))
-                deleted = cursor.fetchone()
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, (order_item_id,))
+                deleted = await cursor.fetchone()
                 if not deleted:
                     return False
-                conn.commit()
+                await conn.commit()
                 return True
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,6 +1,10 @@
 from fastapi import HTTPException
-from typing import Dict, List, Optional
-from db.db_sql_connection import connect
+from datetime import date, datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from db.db_sql_connection import async_connect
+from db.db_prepared_statements import prepared
+from db.db_product_catalog import product_catalog
+from utils.utils_single_flight import single_flight
 
 
 async def get_customer_by_email(email: str) -> Optional[Dict[str, str]]:
@@ -16,13 +20,16 @@ async def get_customer_by_email(email: str) -> Optional[Dict[str, str]]:
     exceptions:
         HTTPException: Database error
     """
-    query = "SELECT id, full_name, email, phone, address, cpf_cnpj, password_hash, role FROM customers WHERE email = %s;"
+    query = prepared(
+        "get_customer_by_email",
+        "SELECT id, full_name, email, phone, address, cpf_cnpj, password_hash, role FROM customers WHERE email = %s;",
+    )
 
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, (email,))
-                customer = cursor.fetchone()
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, (email,))
+                customer = await cursor.fetchone()
 
         if customer:
             return {
@@ -40,6 +47,7 @@ async def get_customer_by_email(email: str) -> Optional[Dict[str, str]]:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@single_flight
 async def get_event_by_id(event_id: int) -> Optional[Dict[str, str]]:
     """
     Retrieves a specific event by its ID.
@@ -53,13 +61,13 @@ async def get_event_by_id(event_id: int) -> Optional[Dict[str, str]]:
     Raises:
         HTTPException: If an error occurs while fetching the event.
     """
-    query = "SELECT * FROM events WHERE id = %s;"
+    query = prepared("get_event_by_id", "SELECT * FROM events WHERE id = %s;")
 
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, (event_id,))
-                row = cursor.fetchone()
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, (event_id,))
+                row = await cursor.fetchone()
 
                 if row:
                     columns = [desc[0] for desc in cursor.description]
@@ -71,9 +79,16 @@ async def get_event_by_id(event_id: int) -> Optional[Dict[str, str]]:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def get_all_events() -> List[Dict[str, str]]:
+@single_flight
+async def get_all_events(
+    limit: Optional[int] = None, after: Optional[int] = None
+) -> List[Dict[str, str]]:
     """
-    Retrieves all events from the database.
+    Retrieves events from the database ordered by ID (keyset pagination).
+
+    Args:
+        limit (Optional[int]): Maximum number of events to return. All events if None.
+        after (Optional[int]): Only return events with an ID greater than this cursor.
 
     Returns:
         List[Dict[str, str]]: A list of dictionaries representing events.
@@ -83,22 +98,154 @@ async def get_all_events() -> List[Dict[str, str]]:
     """
     query = """
         SELECT id, customer_id, event_type, event_date, location, guest_count, duration_hours, budget_approved 
-        FROM events;
+        FROM events
+        WHERE id > %(after)s
+        ORDER BY id
+        LIMIT %(limit)s;
     """
 
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query)
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, {"after": after or 0, "limit": limit})
                 columns = [desc[0] for desc in cursor.description]  # Get column names
                 events = [
-                    dict(zip(columns, row)) for row in cursor.fetchall()
+                    dict(zip(columns, row)) for row in await cursor.fetchall()
                 ]  # Convert rows to dictionaries
         return events
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def forget_event_reads() -> None:
+    """
+    Keeps event reads started before a committed write from being shared with later callers.
+    """
+    get_event_by_id.invalidate()
+    get_all_events.invalidate()
+
+
+# Columns of the compact calendar response, all covered by idx_events_event_date_location
+CALENDAR_COMPACT_COLUMNS = "id, event_date, location, guest_count"
+CALENDAR_COLUMNS = "id, customer_id, event_type, event_date, location, guest_count, duration_hours, budget_approved"
+
+
+async def get_events_calendar(
+    date_from: datetime,
+    date_to: datetime,
+    location: Optional[str] = None,
+    event_type: Optional[str] = None,
+    compact: bool = False,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[datetime, int]] = None,
+) -> List[Dict]:
+    """
+    Retrieves the events taking place between two dates, ordered by date and ID.
+
+    The date range and the location are answered by the (event_date, location)
+    index of database/migrations/004_events_calendar_index.sql; in compact mode
+    every returned column is in that index.
+
+    Args:
+        date_from (datetime): Start of the range (inclusive).
+        date_to (datetime): End of the range (exclusive).
+        location (Optional[str]): Only events at this exact location.
+        event_type (Optional[str]): Only events of this type.
+        compact (bool): Only return id, event_date, location and guest_count.
+        limit (Optional[int]): Maximum number of events to return. All events if None.
+        after (Optional[Tuple[datetime, int]]): Date and ID of the last event already returned.
+
+    Returns:
+        List[Dict]: A list of dictionaries representing events.
+
+    Raises:
+        HTTPException: If an error occurs while fetching events.
+    """
+    # only the filters actually given are added, so each combination gets its own plan
+    conditions = ["event_date >= %(date_from)s", "event_date < %(date_to)s"]
+    if location is not None:
+        conditions.append("location = %(location)s")
+    if event_type is not None:
+        conditions.append("event_type = %(event_type)s")
+    if after is not None:
+        conditions.append("event_date >= %(after_date)s AND (event_date, id) > (%(after_date)s, %(after_id)s)")
+
+    query = f"""
+        SELECT {CALENDAR_COMPACT_COLUMNS if compact else CALENDAR_COLUMNS}
+        FROM events
+        WHERE {" AND ".join(conditions)}
+        ORDER BY event_date, id
+        LIMIT %(limit)s;
+    """
+    params = {
+        "date_from": date_from,
+        "date_to": date_to,
+        "location": location,
+        "event_type": event_type,
+        "after_date": after[0] if after else None,
+        "after_id": after[1] if after else None,
+        "limit": limit,
+    }
+
+    try:
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, params)
+                columns = [desc[0] for desc in cursor.description]
+                return [dict(zip(columns, row)) for row in await cursor.fetchall()]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def get_location_bookings(
+    location: str,
+    date_from: datetime,
+    date_to: datetime,
+    exclude_event_id: Optional[int] = None,
+) -> List[Dict]:
+    """
+    Retrieves the events occupying a location at some point between two dates.
+
+    An event occupies its location from event_date for duration_hours. The overlap
+    test uses the GiST index on that period from database/migrations/005_events_no_overlap.sql.
+
+    Args:
+        location (str): The location.
+        date_from (datetime): Start of the range (inclusive).
+        date_to (datetime): End of the range (exclusive).
+        exclude_event_id (Optional[int]): Event left out, e.g. the one being rescheduled.
+
+    Returns:
+        List[Dict]: Events with 'id', 'start' and 'end', ordered by start.
+
+    Raises:
+        HTTPException: If an error occurs while fetching the events.
+    """
+    query = """
+        SELECT id, event_date AS start, upper(event_period(event_date, duration_hours)) AS "end"
+        FROM events
+        WHERE location = %(location)s
+          AND event_period(event_date, duration_hours) && tsrange(%(date_from)s, %(date_to)s)
+          AND id <> %(exclude_event_id)s
+        ORDER BY event_date;
+    """
+    params = {
+        "location": location,
+        "date_from": date_from,
+        "date_to": date_to,
+        "exclude_event_id": exclude_event_id or 0,
+    }
+
+    try:
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, params)
+                columns = [desc[0] for desc in cursor.description]
+                return [dict(zip(columns, row)) for row in await cursor.fetchall()]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 async def get_order_by_id(order_id: int) -> Optional[Dict[str, str]]:
     """
     Retrieves an order by its ID.
@@ -112,13 +259,13 @@ async def get_order_by_id(order_id: int) -> Optional[Dict[str, str]]:
     Raises:
         HTTPException: If an error occurs while fetching data from the database.
     """
-    query = "SELECT * FROM orders WHERE id = %(order_id)s"
+    query = prepared("get_order_by_id", "SELECT * FROM orders WHERE id = %(order_id)s")
 
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, {"order_id": order_id})
-                row = cursor.fetchone()
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, {"order_id": order_id})
+                row = await cursor.fetchone()
 
                 if row:
                     columns = [desc[0] for desc in cursor.description]
@@ -130,23 +277,29 @@ async def get_order_by_id(order_id: int) -> Optional[Dict[str, str]]:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def get_all_orders() -> List[Dict[str, str]]:
+async def get_all_orders(
+    limit: Optional[int] = None, after: Optional[int] = None
+) -> List[Dict[str, str]]:
     """
-    Retrieves all registered orders.
+    Retrieves registered orders ordered by ID (keyset pagination).
+
+    Args:
+        limit (Optional[int]): Maximum number of orders to return. All orders if None.
+        after (Optional[int]): Only return orders with an ID greater than this cursor.
 
     Returns:
-        List[Dict[str, str]]: List containing all orders.
+        List[Dict[str, str]]: List containing the orders.
 
     Raises:
         HTTPException: If an error occurs while fetching data from the database.
     """
-    query = "SELECT * FROM orders"
+    query = "SELECT * FROM orders WHERE id > %(after)s ORDER BY id LIMIT %(limit)s"
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query)
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, {"after": after or 0, "limit": limit})
                 columns = [desc[0] for desc in cursor.description]
-                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+                return [dict(zip(columns, row)) for row in await cursor.fetchall()]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -164,17 +317,17 @@ async def get_customer_by_id(customer_id: int) -> Optional[Dict[str, str]]:
     Raises:
         HTTPException: If an error occurs while fetching the customer.
     """
-    query = """
+    query = prepared("get_customer_by_id", """
         SELECT id, full_name, email, phone, address, cpf_cnpj, role, created_at, updated_at
         FROM customers 
         WHERE id = %s;
-    """
+    """)
 
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, (customer_id,))
-                customer = cursor.fetchone()
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, (customer_id,))
+                customer = await cursor.fetchone()
 
         if customer:
             return {
@@ -193,9 +346,15 @@ async def get_customer_by_id(customer_id: int) -> Optional[Dict[str, str]]:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def get_all_customers() -> List[Dict[str, str]]:
+async def get_all_customers(
+    limit: Optional[int] = None, after: Optional[int] = None
+) -> List[Dict[str, str]]:
     """
-    Retrieves all customers from the database.
+    Retrieves customers from the database ordered by ID (keyset pagination).
+
+    Args:
+        limit (Optional[int]): Maximum number of customers to return. All customers if None.
+        after (Optional[int]): Only return customers with an ID greater than this cursor.
 
     Returns:
         List[Dict[str, str]]: A list of dictionaries representing customers.
@@ -205,16 +364,19 @@ async def get_all_customers() -> List[Dict[str, str]]:
     """
     query = """
         SELECT id, full_name, email, phone, address, cpf_cnpj, role, created_at, updated_at
-        FROM customers;
+        FROM customers
+        WHERE id > %(after)s
+        ORDER BY id
+        LIMIT %(limit)s;
     """
 
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query)
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, {"after": after or 0, "limit": limit})
                 columns = [desc[0] for desc in cursor.description]  # Get column names
                 customers = [
-                    dict(zip(columns, row)) for row in cursor.fetchall()
+                    dict(zip(columns, row)) for row in await cursor.fetchall()
                 ]  # Convert rows to dictionaries
         return customers
     except Exception as e:
@@ -241,10 +403,10 @@ async def get_payment_by_id(payment_id: int) -> Optional[Dict[str, str]]:
     """
 
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, {"payment_id": payment_id})
-                row = cursor.fetchone()
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, {"payment_id": payment_id})
+                row = await cursor.fetchone()
 
                 if row:
                     columns = [desc[0] for desc in cursor.description]
@@ -256,22 +418,27 @@ async def get_payment_by_id(payment_id: int) -> Optional[Dict[str, str]]:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@single_flight
 async def get_product_by_id(product_id: int) -> Optional[Dict[str, str]]:
     """
     Retrieves a specific product by its ID.
 
+    Served from the in-memory product catalog while its listener is running.
+
     Args:
         product_id (int): The product ID.
 
     Returns:
         Optional[Dict[str, str]]: Product details if found, otherwise None.
     """
-    query = "SELECT * FROM products WHERE id = %s;"
+    query = prepared("get_product_by_id", "SELECT * FROM products WHERE id = %s;")
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, (product_id,))
-                row = cursor.fetchone()
+        if product_catalog.is_live():
+            return await product_catalog.get(product_id)
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, (product_id,))
+                row = await cursor.fetchone()
                 if row:
                     columns = [desc[0] for desc in cursor.description]
                     return dict(zip(columns, row))
@@ -280,24 +447,43 @@ async def get_product_by_id(product_id: int) -> Optional[Dict[str, str]]:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def get_all_products() -> List[Dict[str, str]]:
+@single_flight
+async def get_all_products(
+    limit: Optional[int] = None, after: Optional[int] = None
+) -> List[Dict[str, str]]:
     """
-    Retrieves all products from the database.
+    Retrieves products from the database ordered by ID (keyset pagination).
+
+    Served from the in-memory product catalog while its listener is running.
+
+    Args:
+        limit (Optional[int]): Maximum number of products to return. All products if None.
+        after (Optional[int]): Only return products with an ID greater than this cursor.
 
     Returns:
         List[Dict[str, str]]: A list of dictionaries representing products.
     """
-    query = "SELECT * FROM products;"
+    query = "SELECT * FROM products WHERE id > %(after)s ORDER BY id LIMIT %(limit)s;"
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query)
+        if product_catalog.is_live():
+            return await product_catalog.page(limit, after)
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, {"after": after or 0, "limit": limit})
                 columns = [desc[0] for desc in cursor.description]
-                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+                return [dict(zip(columns, row)) for row in await cursor.fetchall()]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def forget_product_reads() -> None:
+    """
+    Keeps product reads started before a committed write from being shared with later callers.
+    """
+    get_product_by_id.invalidate()
+    get_all_products.invalidate()
+
+
 async def get_invoice_by_order_id(order_id: int) -> Optional[Dict[str, str]]:
     """
     Retrieves an invoice by order ID.
@@ -317,10 +503,10 @@ async def get_invoice_by_order_id(order_id: int) -> Optional[Dict[str, str]]:
     """
 
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, {"order_id": order_id})
-                row = cursor.fetchone()
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, {"order_id": order_id})
+                row = await cursor.fetchone()
 
                 if row:
                     columns = [desc[0] for desc in cursor.description]
@@ -350,10 +536,10 @@ async def get_invoice_pdf(invoice_id: int) -> Optional[Dict[str, str]]:
     """
 
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, {"invoice_id": invoice_id})
-                row = cursor.fetchone()
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, {"invoice_id": invoice_id})
+                row = await cursor.fetchone()
 
                 if row:
                     return {"pdf_file": row[0]}
@@ -363,6 +549,84 @@ async def get_invoice_pdf(invoice_id: int) -> Optional[Dict[str, str]]:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def get_invoice_render_job(job_id: int) -> Optional[Dict]:
+    """
+    Retrieves an invoice PDF render job, for status polling.
+
+    Args:
+        job_id (int): The job ID.
+
+    Returns:
+        Optional[Dict]: The job row if found, otherwise None.
+
+    Raises:
+        HTTPException: If an error occurs while fetching the job.
+    """
+    query = "SELECT * FROM invoice_render_jobs WHERE id = %s;"
+    try:
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, (job_id,))
+                row = await cursor.fetchone()
+                if row:
+                    columns = [desc[0] for desc in cursor.description]
+                    return dict(zip(columns, row))
+        return None
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def get_invoice_render_data(invoice_ids: List[int]) -> List[Dict]:
+    """
+    Retrieves everything printed on a batch of invoices, in a single query.
+
+    Each invoice carries its 'order', the order's 'event' and 'customer', the
+    'order_items' (with the product name) and the 'payments', nested with JSON
+    aggregation like get_customer_overview.
+
+    Args:
+        invoice_ids (List[int]): The invoices to render.
+
+    Returns:
+        List[Dict]: One entry per invoice found, ordered by ID.
+
+    Raises:
+        HTTPException: If an error occurs while fetching the data.
+    """
+    query = """
+        SELECT to_jsonb(i) || jsonb_build_object(
+            'order', to_jsonb(o),
+            'event', to_jsonb(e),
+            'customer', jsonb_build_object(
+                'full_name', c.full_name, 'email', c.email, 'phone', c.phone,
+                'address', c.address, 'cpf_cnpj', c.cpf_cnpj
+            ),
+            'order_items', COALESCE((
+                SELECT jsonb_agg(to_jsonb(oi) || jsonb_build_object('product_name', p.name) ORDER BY oi.id)
+                FROM order_items oi JOIN products p ON p.id = oi.product_id
+                WHERE oi.order_id = o.id
+            ), '[]'::jsonb),
+            'payments', COALESCE((
+                SELECT jsonb_agg(to_jsonb(pm) ORDER BY pm.id)
+                FROM payments pm WHERE pm.order_id = o.id
+            ), '[]'::jsonb)
+        )
+        FROM invoices i
+        JOIN orders o ON o.id = i.order_id
+        JOIN events e ON e.id = o.event_id
+        JOIN customers c ON c.id = e.customer_id
+        WHERE i.id = ANY(%s)
+        ORDER BY i.id;
+    """
+    try:
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, (list(invoice_ids),))
+                return [row[0] for row in await cursor.fetchall()]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 async def get_contract_by_event_id(event_id: int) -> Optional[Dict[str, str]]:
     """
     Retrieves a contract by event ID.
@@ -382,10 +646,10 @@ async def get_contract_by_event_id(event_id: int) -> Optional[Dict[str, str]]:
     """
 
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, {"event_id": event_id})
-                row = cursor.fetchone()
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, {"event_id": event_id})
+                row = await cursor.fetchone()
 
                 if row:
                     columns = [desc[0] for desc in cursor.description]
@@ -415,10 +679,10 @@ async def get_contract_pdf(contract_id: int) -> Optional[Dict[str, str]]:
     """
 
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, {"contract_id": contract_id})
-                row = cursor.fetchone()
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, {"contract_id": contract_id})
+                row = await cursor.fetchone()
 
                 if row:
                     return {"pdf_file": row[0]}
@@ -428,6 +692,69 @@ async def get_contract_pdf(contract_id: int) -> Optional[Dict[str, str]]:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def get_contract_render_data(contract_id: int) -> Optional[Dict]:
+    """
+    Retrieves everything printed on a contract, in a single query.
+
+    The products are those of the event's orders that were not canceled, summed
+    per product.
+
+    Args:
+        contract_id (int): The contract ID.
+
+    Returns:
+        Optional[Dict]: 'contract_id', 'pdf_file', the 'event', the 'customer', the
+            'items' (product_name, category, quantity, total_price) and their
+            'total_amount', or None if the contract does not exist.
+
+    Raises:
+        HTTPException: If an error occurs while fetching the data.
+    """
+    query = """
+        SELECT jsonb_build_object(
+            'contract_id', ct.id,
+            'pdf_file', ct.pdf_file,
+            'event', jsonb_build_object(
+                'id', e.id, 'event_type', e.event_type, 'event_date', e.event_date, 'location', e.location,
+                'guest_count', e.guest_count, 'duration_hours', e.duration_hours,
+                'budget_approved', e.budget_approved
+            ),
+            'customer', jsonb_build_object(
+                'full_name', c.full_name, 'email', c.email, 'phone', c.phone,
+                'address', c.address, 'cpf_cnpj', c.cpf_cnpj
+            ),
+            'items', COALESCE(items.rows, '[]'::jsonb),
+            'total_amount', COALESCE(items.total, 0)
+        )
+        FROM contracts ct
+        JOIN events e ON e.id = ct.event_id
+        JOIN customers c ON c.id = e.customer_id
+        LEFT JOIN LATERAL (
+            SELECT jsonb_agg(jsonb_build_object(
+                       'product_name', p.name, 'category', p.category,
+                       'quantity', s.quantity, 'total_price', s.total_price
+                   ) ORDER BY p.id) AS rows,
+                   SUM(s.total_price) AS total
+            FROM (
+                SELECT oi.product_id, SUM(oi.quantity) AS quantity, SUM(oi.total_price) AS total_price
+                FROM orders o JOIN order_items oi ON oi.order_id = o.id
+                WHERE o.event_id = e.id AND o.status <> 'canceled'
+                GROUP BY oi.product_id
+            ) s
+            JOIN products p ON p.id = s.product_id
+        ) items ON TRUE
+        WHERE ct.id = %s;
+    """
+    try:
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, (contract_id,))
+                row = await cursor.fetchone()
+                return row[0] if row else None
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 async def get_events_by_customer_id(customer_id: int) -> List[Dict[str, str]]:
     """
     Retrieves all events associated with a specific customer.
@@ -438,15 +765,15 @@ async def get_events_by_customer_id(customer_id: int) -> List[Dict[str, str]]:
     Returns:
         List[Dict[str, str]]: List of events.
     """
-    query = """
+    query = prepared("get_events_by_customer_id", """
         SELECT * FROM events WHERE customer_id = %s;
-    """
+    """)
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, (customer_id,))
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, (customer_id,))
                 columns = [desc[0] for desc in cursor.description]
-                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+                return [dict(zip(columns, row)) for row in await cursor.fetchall()]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -461,17 +788,17 @@ async def get_orders_by_customer_id(customer_id: int) -> List[Dict[str, str]]:
     Returns:
         List[Dict[str, str]]: List of orders.
     """
-    query = """
+    query = prepared("get_orders_by_customer_id", """
         SELECT o.* FROM orders o
         JOIN events e ON o.event_id = e.id
         WHERE e.customer_id = %s;
-    """
+    """)
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, (customer_id,))
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, (customer_id,))
                 columns = [desc[0] for desc in cursor.description]
-                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+                return [dict(zip(columns, row)) for row in await cursor.fetchall()]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -486,18 +813,18 @@ async def get_payments_by_customer_id(customer_id: int) -> List[Dict[str, str]]:
     Returns:
         List[Dict[str, str]]: List of payments.
     """
-    query = """
+    query = prepared("get_payments_by_customer_id", """
         SELECT p.* FROM payments p
         JOIN orders o ON p.order_id = o.id
         JOIN events e ON o.event_id = e.id
         WHERE e.customer_id = %s;
-    """
+    """)
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, (customer_id,))
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, (customer_id,))
                 columns = [desc[0] for desc in cursor.description]
-                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+                return [dict(zip(columns, row)) for row in await cursor.fetchall()]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -512,18 +839,18 @@ async def get_invoices_by_customer_id(customer_id: int) -> List[Dict[str, str]]:
     Returns:
         List[Dict[str, str]]: List of invoices.
     """
-    query = """
+    query = prepared("get_invoices_by_customer_id", """
         SELECT i.* FROM invoices i
         JOIN orders o ON i.order_id = o.id
         JOIN events e ON o.event_id = e.id
         WHERE e.customer_id = %s;
-    """
+    """)
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, (customer_id,))
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, (customer_id,))
                 columns = [desc[0] for desc in cursor.description]
-                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+                return [dict(zip(columns, row)) for row in await cursor.fetchall()]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -538,17 +865,17 @@ async def get_contracts_by_customer_id(customer_id: int) -> List[Dict[str, str]]
     Returns:
         List[Dict[str, str]]: List of contracts.
     """
-    query = """
+    query = prepared("get_contracts_by_customer_id", """
         SELECT c.* FROM contracts c
         JOIN events e ON c.event_id = e.id
         WHERE e.customer_id = %s;
-    """
+    """)
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, (customer_id,))
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, (customer_id,))
                 columns = [desc[0] for desc in cursor.description]
-                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+                return [dict(zip(columns, row)) for row in await cursor.fetchall()]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -563,18 +890,73 @@ async def get_order_items_by_customer_id(customer_id: int) -> List[Dict[str, str
     Returns:
         List[Dict[str, str]]: List of order_items.
     """
-    query = """
+    query = prepared("get_order_items_by_customer_id", """
         SELECT oi.* FROM order_items oi
         JOIN orders o ON oi.order_id = o.id
         JOIN events e ON o.event_id = e.id
         WHERE e.customer_id = %s;
-    """
+    """)
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, (customer_id,))
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, (customer_id,))
                 columns = [desc[0] for desc in cursor.description]
-                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+                return [dict(zip(columns, row)) for row in await cursor.fetchall()]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def get_customer_overview(customer_id: int) -> List[Dict]:
+    """
+    Retrieves every event of a customer with its orders, order_items, payments,
+    invoices and contracts nested inside, in a single query.
+
+    The nesting is built by PostgreSQL with JSON aggregation, so the whole customer
+    page costs one round trip instead of one query per collection.
+
+    Args:
+        customer_id (int): Customer ID.
+
+    Returns:
+        List[Dict]: Events ordered by ID, each with 'contracts' and 'orders'; each order
+        carries its 'order_items', 'payments' and 'invoices'.
+    """
+    query = prepared("get_customer_overview", """
+        SELECT COALESCE(jsonb_agg(
+            to_jsonb(e) || jsonb_build_object(
+                'contracts', COALESCE((
+                    SELECT jsonb_agg(to_jsonb(c) ORDER BY c.id)
+                    FROM contracts c WHERE c.event_id = e.id
+                ), '[]'::jsonb),
+                'orders', COALESCE((
+                    SELECT jsonb_agg(
+                        to_jsonb(o) || jsonb_build_object(
+                            'order_items', COALESCE((
+                                SELECT jsonb_agg(to_jsonb(oi) ORDER BY oi.id)
+                                FROM order_items oi WHERE oi.order_id = o.id
+                            ), '[]'::jsonb),
+                            'payments', COALESCE((
+                                SELECT jsonb_agg(to_jsonb(p) ORDER BY p.id)
+                                FROM payments p WHERE p.order_id = o.id
+                            ), '[]'::jsonb),
+                            'invoices', COALESCE((
+                                SELECT jsonb_agg(to_jsonb(i) ORDER BY i.id)
+                                FROM invoices i WHERE i.order_id = o.id
+                            ), '[]'::jsonb)
+                        ) ORDER BY o.id
+                    )
+                    FROM orders o WHERE o.event_id = e.id
+                ), '[]'::jsonb)
+            ) ORDER BY e.id
+        ), '[]'::jsonb)
+        FROM events e
+        WHERE e.customer_id = %s;
+    """)
+    try:
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, (customer_id,))
+                return (await cursor.fetchone())[0]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -592,12 +974,12 @@ async def get_order_item_by_id(order_item_id: int) -> Optional[Dict]:
     HttpException:
         HTTPException: If an error occurs while fetching the order item.
     """
-    query = "SELECT * FROM order_items WHERE id = %s;"
+    query = prepared("get_order_item_by_id", "SELECT * FROM order_items WHERE id = %s;")
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, (order_item_id,))
-                row = cursor.fetchone()
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, (order_item_id,))
+                row = await cursor.fetchone()
                 if row:
                     columns = [desc[0] for desc in cursor.description]
                     return dict(zip(columns, row))
@@ -606,9 +988,15 @@ async def get_order_item_by_id(order_item_id: int) -> Optional[Dict]:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def get_order_items() -> List[Dict]:
+async def get_order_items(
+    limit: Optional[int] = None, after: Optional[int] = None
+) -> List[Dict]:
     """
-    Retrieves all order items from the database.
+    Retrieves order items from the database ordered by ID (keyset pagination).
+
+    Args:
+        limit (Optional[int]): Maximum number of order items to return. All items if None.
+        after (Optional[int]): Only return order items with an ID greater than this cursor.
 
     Returns:
         List[Dict]: A list of dictionaries representing order items.
@@ -616,13 +1004,236 @@ async def get_order_items() -> List[Dict]:
     HttpException:
         HTTPException: If an error occurs while fetching order items.
     """
-    query = "SELECT * FROM order_items;"
+    query = "SELECT * FROM order_items WHERE id > %(after)s ORDER BY id LIMIT %(limit)s;"
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query)
-                rows = cursor.fetchall()
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, {"after": after or 0, "limit": limit})
+                rows = await cursor.fetchall()
                 columns = [desc[0] for desc in cursor.description]
                 return [dict(zip(columns, row)) for row in rows]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+async def _stream_rows(
+    query: str, cursor_name: str, batch_size: int
+) -> AsyncIterator[List[Dict]]:
+    """
+    Runs a query on a server-side (named) cursor and yields the rows in batches.
+
+    Only one batch is held in memory at a time, whatever the size of the result.
+
+    Args:
+        query (str): The SELECT statement to run.
+        cursor_name (str): Name of the server-side cursor.
+        batch_size (int): Number of rows fetched per round trip.
+
+    Yields:
+        List[Dict]: The next batch of rows as dictionaries.
+    """
+    async with async_connect() as conn:
+        async with conn.cursor(name=cursor_name) as cursor:
+            await cursor.execute(query)
+            columns = None
+            while True:
+                rows = await cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                if columns is None:
+                    columns = [desc[0] for desc in cursor.description]
+                yield [dict(zip(columns, row)) for row in rows]
+
+
+def stream_orders(batch_size: int = 1000) -> AsyncIterator[List[Dict]]:
+    """
+    Streams every order in batches, ordered by ID.
+
+    Args:
+        batch_size (int): Number of rows fetched per round trip.
+
+    Returns:
+        AsyncIterator[List[Dict]]: Batches of orders.
+    """
+    query = "SELECT * FROM orders ORDER BY id;"
+    return _stream_rows(query, "export_orders", batch_size)
+
+
+def stream_payments(batch_size: int = 1000) -> AsyncIterator[List[Dict]]:
+    """
+    Streams every payment in batches, ordered by ID.
+
+    Args:
+        batch_size (int): Number of rows fetched per round trip.
+
+    Returns:
+        AsyncIterator[List[Dict]]: Batches of payments.
+    """
+    query = """
+        SELECT id, order_id, amount, payment_method, status, payment_date, updated_at
+        FROM payments ORDER BY id;
+    """
+    return _stream_rows(query, "export_payments", batch_size)
+
+
+def stream_events(batch_size: int = 1000) -> AsyncIterator[List[Dict]]:
+    """
+    Streams every event in batches, ordered by ID.
+
+    Args:
+        batch_size (int): Number of rows fetched per round trip.
+
+    Returns:
+        AsyncIterator[List[Dict]]: Batches of events.
+    """
+    query = "SELECT * FROM events ORDER BY id;"
+    return _stream_rows(query, "export_events", batch_size)
+
+
+async def _report_rows(query: str, params: Dict) -> List[Dict]:
+    """
+    Runs a report query over the rollup tables and returns its rows as dictionaries.
+    """
+    try:
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, params)
+                rows = await cursor.fetchall()
+                columns = [desc[0] for desc in cursor.description]
+                return [dict(zip(columns, row)) for row in rows]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def get_revenue_report(
+    period: str = "month",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    event_type: Optional[str] = None,
+    status: Optional[str] = None,
+) -> List[Dict]:
+    """
+    Retrieves orders and revenue per period, event type and order status.
+
+    Reads the report_daily_revenue rollup (database/migrations/003_report_rollups.sql),
+    which triggers keep up to date, so the cost depends on the number of days in the
+    range and not on the number of orders.
+
+    Args:
+        period (str): 'day', 'month' or 'year'.
+        date_from (Optional[date]): First order day included.
+        date_to (Optional[date]): Last order day included.
+        event_type (Optional[str]): Only this event type.
+        status (Optional[str]): Only orders with this status.
+
+    Returns:
+        List[Dict]: Rows with 'period', 'event_type', 'status', 'orders' and 'revenue'.
+
+    Raises:
+        HTTPException: If an error occurs while fetching the report.
+    """
+    query = """
+        SELECT date_trunc(%(period)s, day)::date AS period, event_type, status,
+               SUM(orders)::int AS orders, SUM(revenue) AS revenue
+        FROM report_daily_revenue
+        WHERE (%(date_from)s::date IS NULL OR day >= %(date_from)s)
+          AND (%(date_to)s::date IS NULL OR day <= %(date_to)s)
+          AND (%(event_type)s::event_type IS NULL OR event_type = %(event_type)s)
+          AND (%(status)s::order_status IS NULL OR status = %(status)s)
+        GROUP BY 1, 2, 3
+        HAVING SUM(orders) <> 0
+        ORDER BY 1, 2, 3;
+    """
+    return await _report_rows(query, {
+        "period": period, "date_from": date_from, "date_to": date_to,
+        "event_type": event_type, "status": status,
+    })
+
+
+async def get_product_sales_report(
+    period: str = "month",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    category: Optional[str] = None,
+    by_product: bool = False,
+) -> List[Dict]:
+    """
+    Retrieves the quantity sold and revenue per period and product category.
+
+    Reads the report_daily_product_sales rollup, where order items are dated by the
+    order_date of their order.
+
+    Args:
+        period (str): 'day', 'month' or 'year'.
+        date_from (Optional[date]): First order day included.
+        date_to (Optional[date]): Last order day included.
+        category (Optional[str]): Only products of this category.
+        by_product (bool): Break each category down by product.
+
+    Returns:
+        List[Dict]: Rows with 'period', 'category', 'quantity' and 'revenue', plus
+        'product_id' and 'name' when by_product is True.
+
+    Raises:
+        HTTPException: If an error occurs while fetching the report.
+    """
+    product_columns = "p.id AS product_id, p.name, " if by_product else ""
+    query = f"""
+        SELECT date_trunc(%(period)s, s.day)::date AS period, p.category, {product_columns}
+               SUM(s.quantity)::bigint AS quantity, SUM(s.revenue) AS revenue
+        FROM report_daily_product_sales s
+        JOIN products p ON p.id = s.product_id
+        WHERE (%(date_from)s::date IS NULL OR s.day >= %(date_from)s)
+          AND (%(date_to)s::date IS NULL OR s.day <= %(date_to)s)
+          AND (%(category)s::product_type IS NULL OR p.category = %(category)s)
+        GROUP BY 1, 2{", 3, 4" if by_product else ""}
+        HAVING SUM(s.quantity) <> 0
+        ORDER BY 1, 2{", 3" if by_product else ""};
+    """
+    return await _report_rows(query, {
+        "period": period, "date_from": date_from, "date_to": date_to, "category": category,
+    })
+
+
+async def get_payments_report(
+    period: str = "month",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    payment_method: Optional[str] = None,
+    status: Optional[str] = None,
+) -> List[Dict]:
+    """
+    Retrieves payments and amounts per period, payment method and payment status.
+
+    Reads the report_daily_payments rollup, where payments are dated by their
+    payment_date, or by their last update while they have none.
+
+    Args:
+        period (str): 'day', 'month' or 'year'.
+        date_from (Optional[date]): First payment day included.
+        date_to (Optional[date]): Last payment day included.
+        payment_method (Optional[str]): Only this payment method.
+        status (Optional[str]): Only payments with this status.
+
+    Returns:
+        List[Dict]: Rows with 'period', 'payment_method', 'status', 'payments' and 'amount'.
+
+    Raises:
+        HTTPException: If an error occurs while fetching the report.
+    """
+    query = """
+        SELECT date_trunc(%(period)s, day)::date AS period, payment_method, status,
+               SUM(payments)::int AS payments, SUM(amount) AS amount
+        FROM report_daily_payments
+        WHERE (%(date_from)s::date IS NULL OR day >= %(date_from)s)
+          AND (%(date_to)s::date IS NULL OR day <= %(date_to)s)
+          AND (%(payment_method)s::payment_method IS NULL OR payment_method = %(payment_method)s)
+          AND (%(status)s::payment_status IS NULL OR status = %(status)s)
+        GROUP BY 1, 2, 3
+        HAVING SUM(payments) <> 0
+        ORDER BY 1, 2, 3;
+    """
+    return await _report_rows(query, {
+        "period": period, "date_from": date_from, "date_to": date_to,
+        "payment_method": payment_method, "status": status,
+    })
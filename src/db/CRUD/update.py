@@ -1,34 +1,49 @@
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+from psycopg import errors
 from fastapi import HTTPException
-from db.db_sql_connection import connect
+from db.db_sql_connection import async_connect
+from db.db_product_catalog import product_catalog
+from db.CRUD.read import forget_event_reads, forget_product_reads
+from utils.utils_cache import invalidate_cached_customer
+from utils.utils_scheduling import booking_conflict
 
 
 async def update_order(order_id: int, order_data: Dict[str, str]) -> Dict[str, str]:
     """
     Updates an existing order in the orders table.
 
+    total_amount is not updated: the order_items triggers maintain it.
+
     Args:
         order_id (int): The order identifier.
         order_data (Dict[str, str]): Updated order details.
 
     Returns:
-        Dict[str, str]: Success or error message.
+        Dict[str, str]: Success message with the updated order row.
 
     Raises:
-        HTTPException: If an error occurs while updating data in the database.
+        HTTPException: 404 if the order does not exist, 500 if an error occurs
+            while updating data in the database.
     """
     query = """
         UPDATE orders
-        SET event_id = %(event_id)s, order_date = %(order_date)s, total_amount = %(total_amount)s, status = %(status)s
-        WHERE id = %(order_id)s;
+        SET event_id = %(event_id)s, order_date = %(order_date)s, status = %(status)s, updated_at = NOW()
+        WHERE id = %(order_id)s
+        RETURNING *;
     """
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, {"order_id": order_id, **order_data})
-            conn.commit()
-        return {"message": "Order successfully updated!"}
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, {"order_id": order_id, **order_data})
+                updated_order = await cursor.fetchone()
+                if not updated_order:
+                    raise HTTPException(status_code=404, detail="Order not found")
+                columns = [desc[0] for desc in cursor.description]
+            await conn.commit()
+        return {"message": "Order successfully updated!", "order": dict(zip(columns, updated_order))}
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -42,10 +57,11 @@ async def update_event(event_id: int, event_data: Dict[str, str]) -> Dict[str, s
         event_data (Dict[str, str]): Updated event data.
 
     Returns:
-        Dict[str, str]: Success message.
+        Dict[str, str]: Success message with the updated event row.
 
     Raises:
-        HTTPException: If the update fails or the event is not found.
+        HTTPException: 404 if the event does not exist, 409 if the location is already
+        booked at the new time, 500 if the update fails.
     """
     query = """
         UPDATE events
@@ -64,19 +80,25 @@ async def update_event(event_id: int, event_data: Dict[str, str]) -> Dict[str, s
     event_data["event_id"] = event_id
 
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, event_data)
-                updated_event = cursor.fetchone()
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, event_data)
+                updated_event = await cursor.fetchone()
+                columns = [desc[0] for desc in cursor.description]
 
             if not updated_event:
-                raise HTTPException(
-                    status_code=404, detail="Event not found or update failed"
-                )
-
-            conn.commit()
-        return {"message": "Event successfully updated!", "event": updated_event}
-
+                raise HTTPException(status_code=404, detail="Event not found")
+
+            await conn.commit()
+        forget_event_reads()
+        return {"message": "Event successfully updated!", "event": dict(zip(columns, updated_event))}
+
+    except HTTPException:
+        raise
+    except errors.ExclusionViolation:
+        raise await booking_conflict(
+            event_data["location"], event_data["event_date"], event_data["duration_hours"], event_id
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -113,22 +135,25 @@ async def update_customer(
     customer_data["customer_id"] = customer_id  # Add customer_id to the data dictionary
 
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, customer_data)
-                updated_customer = cursor.fetchone()
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, customer_data)
+                updated_customer = await cursor.fetchone()
 
             if not updated_customer:
                 raise HTTPException(
                     status_code=404, detail="Customer not found or update failed"
                 )
 
-            conn.commit()
+            await conn.commit()
+        invalidate_cached_customer(customer_id)
         return {
             "message": "Customer successfully updated!",
             "customer": updated_customer,
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -164,19 +189,21 @@ async def update_payment(
     payment_data["payment_id"] = payment_id
 
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, payment_data)
-                updated_payment = cursor.fetchone()
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, payment_data)
+                updated_payment = await cursor.fetchone()
 
             if not updated_payment:
                 raise HTTPException(
                     status_code=404, detail="Payment not found or update failed"
                 )
 
-            conn.commit()
+            await conn.commit()
         return {"message": "Payment successfully updated!", "payment": updated_payment}
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -193,6 +220,9 @@ async def update_product(
 
     Returns:
         Dict[str, str]: The updated product details.
+
+    Raises:
+        HTTPException: 404 if the product does not exist, 500 if the update fails.
     """
     query = """
         UPDATE products
@@ -207,14 +237,19 @@ async def update_product(
     """
     product_data["product_id"] = product_id
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, product_data)
-                updated_product = cursor.fetchone()
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, product_data)
+                updated_product = await cursor.fetchone()
                 if not updated_product:
                     raise HTTPException(status_code=404, detail="Product not found")
                 columns = [desc[0] for desc in cursor.description]
-                return dict(zip(columns, updated_product))
+        # committed: this worker must not wait for the notification to see it
+        product_catalog.invalidate()
+        forget_product_reads()
+        return dict(zip(columns, updated_product))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -245,14 +280,186 @@ async def update_order_item(order_item_id: int, data: Dict) -> Optional[Dict]:
     """
     data["order_item_id"] = order_item_id
     try:
-        with connect() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, data)
-                updated = cursor.fetchone()
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, data)
+                updated = await cursor.fetchone()
                 if not updated:
                     return None
-                conn.commit()
+                await conn.commit()
                 columns = [desc[0] for desc in cursor.description]
                 return dict(zip(columns, updated))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+async def recompute_order_totals() -> Dict:
+    """
+    Sets every order's total_amount to the sum of its items, in one set-based pass.
+
+    The order_items triggers keep totals up to date; this fixes the ones that
+    drifted before they existed or through writes that bypassed them. Orders
+    without items get a total of zero. Only orders whose total changes are written.
+
+    Returns:
+        Dict: The number of orders fixed and their IDs.
+
+    Raises:
+        HTTPException: If an error occurs while updating the totals.
+    """
+    query = """
+        UPDATE orders o
+        SET total_amount = t.total, updated_at = NOW()
+        FROM (
+            SELECT o.id, COALESCE(i.total, 0) AS total
+            FROM orders o
+            LEFT JOIN (
+                SELECT order_id, SUM(total_price) AS total FROM order_items GROUP BY order_id
+            ) i ON i.order_id = o.id
+        ) t
+        WHERE o.id = t.id AND o.total_amount <> t.total
+        RETURNING o.id;
+    """
+    try:
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query)
+                order_ids = sorted(row[0] for row in await cursor.fetchall())
+            await conn.commit()
+        return {"fixed": len(order_ids), "order_ids": order_ids}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def claim_invoice_render_jobs(limit: int, stale_seconds: float, max_attempts: int) -> List[Dict]:
+    """
+    Marks up to `limit` queued invoice render jobs as running and returns them.
+
+    Jobs are claimed with FOR UPDATE SKIP LOCKED, so several API workers can drain
+    the queue together without taking the same job twice. A job left running for
+    more than `stale_seconds` (its worker died) is claimed again, unless it already
+    used its `max_attempts`, in which case it is marked failed.
+
+    Args:
+        limit (int): Maximum number of jobs to claim.
+        stale_seconds (float): Seconds after which a running job is considered abandoned.
+        max_attempts (int): Attempts allowed per job.
+
+    Returns:
+        List[Dict]: The claimed jobs with their 'id', 'invoice_id' and 'attempts', in queue order.
+
+    Raises:
+        HTTPException: If an error occurs while claiming the jobs.
+    """
+    abandon_query = """
+        UPDATE invoice_render_jobs
+        SET status = 'failed', error = 'Worker stopped while rendering', finished_at = NOW()
+        WHERE status = 'running' AND started_at < NOW() - %(stale)s * INTERVAL '1 second'
+          AND attempts >= %(max_attempts)s;
+    """
+    claim_query = """
+        UPDATE invoice_render_jobs j
+        SET status = 'running', attempts = j.attempts + 1, started_at = NOW(), error = NULL
+        WHERE j.id IN (
+            SELECT id FROM invoice_render_jobs
+            WHERE status = 'pending'
+               OR (status = 'running' AND started_at < NOW() - %(stale)s * INTERVAL '1 second')
+            ORDER BY id
+            LIMIT %(limit)s
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING j.id, j.invoice_id, j.attempts;
+    """
+    params = {"limit": limit, "stale": stale_seconds, "max_attempts": max_attempts}
+    try:
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(abandon_query, params)
+                await cursor.execute(claim_query, params)
+                columns = [desc[0] for desc in cursor.description]
+                jobs = [dict(zip(columns, row)) for row in await cursor.fetchall()]
+            await conn.commit()
+        return sorted(jobs, key=lambda job: job["id"])
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def finish_invoice_render_jobs(results: List[Dict], max_attempts: int) -> None:
+    """
+    Records the outcome of rendered jobs and the new PDF files of their invoices.
+
+    A successful job is marked done and its file stored in invoices.pdf_file, in
+    the same transaction. A failed job goes back to the queue until it used its
+    `max_attempts`, then it is marked failed with the error.
+
+    Args:
+        results (List[Dict]): One entry per job with 'job_id' and either 'pdf_file' or 'error'.
+        max_attempts (int): Attempts allowed per job.
+
+    Raises:
+        HTTPException: If an error occurs while updating the jobs.
+    """
+    query = """
+        WITH results AS (
+            SELECT * FROM unnest(%(job_ids)s::int[], %(pdf_files)s::text[], %(errors)s::text[])
+                AS r(job_id, pdf_file, error)
+        ), finished AS (
+            UPDATE invoice_render_jobs j
+            SET status = CASE
+                    WHEN r.error IS NULL THEN 'done'
+                    WHEN j.attempts >= %(max_attempts)s THEN 'failed'
+                    ELSE 'pending'
+                END,
+                pdf_file = r.pdf_file,
+                error = r.error,
+                finished_at = CASE WHEN r.error IS NULL OR j.attempts >= %(max_attempts)s THEN NOW() END
+            FROM results r
+            WHERE j.id = r.job_id AND j.status = 'running'
+            RETURNING j.invoice_id, j.pdf_file, j.status
+        )
+        UPDATE invoices i
+        SET pdf_file = f.pdf_file
+        FROM finished f
+        WHERE i.id = f.invoice_id AND f.status = 'done';
+    """
+    try:
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, {
+                    "job_ids": [result["job_id"] for result in results],
+                    "pdf_files": [result.get("pdf_file") for result in results],
+                    "errors": [result.get("error") for result in results],
+                    "max_attempts": max_attempts,
+                })
+            await conn.commit()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def update_contract_pdf(contract_id: int, pdf_file: str) -> bool:
+    """
+    Records the rendered PDF of a contract, unless it is already the current one.
+
+    Args:
+        contract_id (int): The contract ID.
+        pdf_file (str): Name of the PDF in the contract store.
+
+    Returns:
+        bool: True if the contract changed.
+
+    Raises:
+        HTTPException: If an error occurs while updating the contract.
+    """
+    query = """
+        UPDATE contracts SET pdf_file = %(pdf_file)s, updated_at = NOW()
+        WHERE id = %(contract_id)s AND pdf_file IS DISTINCT FROM %(pdf_file)s;
+    """
+    try:
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, {"contract_id": contract_id, "pdf_file": pdf_file})
+                changed = cursor.rowcount > 0
+            await conn.commit()
+        return changed
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,5 +1,5 @@
 import re
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from .db_enums import OrderStatus, ProductType
 from pydantic import BaseModel, EmailStr, field_validator, Field
@@ -146,31 +146,32 @@ class Order(BaseModel):
     Attributes:
         event_id (int): The ID of the event associated with the order.
         order_date (datetime): The date and time when the order was created.
-        total_amount (float): The total amount of the order.
+        total_amount (Optional[float]): Accepted for compatibility and ignored: the total
+            is the sum of the order items, maintained by the database.
         status (OrderStatus): The status of the order ('pending', 'paid', 'canceled').
     """
 
     event_id: int
     order_date: datetime = Field(default_factory=datetime.utcnow)
-    total_amount: float
+    total_amount: Optional[float] = None
     status: OrderStatus = OrderStatus.PENDING
 
     @field_validator("total_amount")
     @classmethod
-    def validate_total_amount(cls, value: float) -> float:
+    def validate_total_amount(cls, value: Optional[float]) -> Optional[float]:
         """
-        Validates that the total amount is greater than zero.
+        Validates that the total amount, when sent, is greater than zero.
 
         Args:
-            value (float): The total amount.
+            value (Optional[float]): The total amount.
 
         Returns:
-            float: The validated total amount.
+            Optional[float]: The validated total amount.
 
         Raises:
             ValueError: If the total amount is not positive.
         """
-        if value <= 0:
+        if value is not None and value <= 0:
             raise ValueError("Total amount must be greater than zero.")
         return value
 
@@ -281,11 +282,12 @@ class Contract(BaseModel):
 
     Attributes:
         event_id (int): The ID of the related event.
-        pdf_file (str): File path for the contract PDF.
+        pdf_file (Optional[str]): File path for the contract PDF. When omitted,
+            the contract is rendered from the event and customer data.
     """
 
     event_id: int
-    pdf_file: str
+    pdf_file: Optional[str] = None
 
 
 class OrderItem(BaseModel):
@@ -392,3 +394,78 @@ class OrderItemCreate(BaseModel):
         if value <= 0:
             raise ValueError("Quantity must be greater than zero.")
         return value
+
+
+class OrderBatchItem(BaseModel):
+    """
+    Represents one item of an order created with POST /orders/batch.
+
+    Attributes:
+        product_id (int): The ID of the product added to the order.
+        quantity (int): The quantity of the product.
+    """
+
+    product_id: int
+    quantity: int = Field(..., gt=0, description="Quantity must be greater than 0")
+
+
+class OrderBatchCreate(BaseModel):
+    """
+    Represents an order and all its items, created in a single request.
+
+    The prices and the order total are computed from the products' base prices.
+
+    Attributes:
+        event_id (int): The ID of the event associated with the order.
+        order_date (datetime): The date and time when the order was created.
+        status (OrderStatus): The status of the order ('pending', 'paid', 'canceled').
+        items (List[OrderBatchItem]): The items of the order (at least one).
+    """
+
+    event_id: int
+    order_date: datetime = Field(default_factory=datetime.utcnow)
+    status: OrderStatus = OrderStatus.PENDING
+    items: List[OrderBatchItem] = Field(..., min_length=1, description="At least one item is required")
+
+    @field_validator("order_date")
+    @classmethod
+    def validate_order_date(cls, value: datetime) -> datetime:
+        """
+        Ensures that the order date is not in the future.
+
+        Args:
+            value (datetime): The order date.
+
+        Returns:
+            datetime: The validated order date.
+
+        Raises:
+            ValueError: If the order date is in the future.
+        """
+        if value > datetime.utcnow():
+            raise ValueError("Order date cannot be in the future.")
+        return value
+
+
+class QuoteScenario(BaseModel):
+    """
+    Represents one guest count / duration combination priced by POST /quotes/estimate.
+
+    Attributes:
+        guest_count (int): The number of guests.
+        duration_hours (int): The duration of the event in hours.
+    """
+
+    guest_count: int = Field(..., gt=0, description="Guest count must be greater than 0")
+    duration_hours: int = Field(..., gt=0, description="Duration must be greater than 0")
+
+
+class QuoteScenarios(BaseModel):
+    """
+    Represents the combinations priced together by POST /quotes/estimate.
+
+    Attributes:
+        scenarios (List[QuoteScenario]): The combinations to price (at least one).
+    """
+
+    scenarios: List[QuoteScenario] = Field(..., min_length=1, description="At least one scenario is required")
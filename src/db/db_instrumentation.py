@@ -0,0 +1,84 @@
+import sys
+import time
+import psycopg
+from db.db_slow_query_log import slow_query_log
+from db.db_prepared_statements import statement_registry
+from utils.utils_metrics import (
+    db_query_duration_seconds,
+    db_query_errors_total,
+    db_connections_opened_total,
+    db_connections_closed_total,
+    db_slow_queries_total,
+)
+
+
+def _caller_name() -> str:
+    """
+    Returns the name of the function that issued the statement, skipping psycopg's
+    own frames (e.g. AsyncConnection.execute). Statements sent by the pool itself
+    are reported as 'pool_check'.
+    """
+    frame = sys._getframe(2)
+    module = frame.f_globals.get("__name__", "")
+    while module.startswith("psycopg") and frame.f_back is not None:
+        if module.startswith("psycopg_pool"):
+            return "pool_check"
+        frame = frame.f_back
+        module = frame.f_globals.get("__name__", "")
+    return frame.f_code.co_name
+
+
+class InstrumentedAsyncCursor(psycopg.AsyncCursor):
+    """
+    Cursor used by every connection of the async engine.
+
+    Each execute() is timed and recorded in the db_query_duration_seconds histogram,
+    labelled with the name of the function that called it (the CRUD function), so the
+    CRUD modules need no changes to be measured. Statements slower than
+    SLOW_QUERY_THRESHOLD_MS are added to the slow-query log. Statements registered
+    with db.db_prepared_statements.prepared() are executed as prepared statements.
+    """
+
+    async def execute(self, query, params=None, **kwargs):
+        if "prepare" not in kwargs:
+            prepare = statement_registry.prepare_flag(query)
+            if prepare is not None:
+                kwargs["prepare"] = prepare
+        function = _caller_name()
+        error = None
+        start = time.perf_counter()
+        try:
+            return await super().execute(query, params, **kwargs)
+        except Exception as e:
+            # first line only: the DETAIL part may quote personal data
+            error = (str(e).splitlines() or [type(e).__name__])[0]
+            db_query_errors_total.inc((function,))
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            db_query_duration_seconds.observe((function,), elapsed)
+            if elapsed * 1000 >= slow_query_log.threshold_ms:
+                db_slow_queries_total.inc((function,))
+                slow_query_log.record(function, query, params, elapsed, self.connection, error)
+
+
+class InstrumentedAsyncConnection(psycopg.AsyncConnection):
+    """
+    Async connection that counts opened and closed connections and hands out
+    InstrumentedAsyncCursor cursors. Automatic statement preparation is turned off
+    when prepared statements are disabled (DB_PREPARED_STATEMENTS).
+    """
+
+    @classmethod
+    async def connect(cls, conninfo: str = "", **kwargs):
+        kwargs.setdefault("cursor_factory", InstrumentedAsyncCursor)
+        for key, value in statement_registry.connection_kwargs().items():
+            kwargs.setdefault(key, value)
+        conn = await super().connect(conninfo, **kwargs)
+        db_connections_opened_total.inc()
+        return conn
+
+    async def close(self) -> None:
+        if not self.closed:
+            db_connections_closed_total.inc()
+        await super().close()
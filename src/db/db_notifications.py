@@ -0,0 +1,130 @@
+import os
+import asyncio
+from typing import Callable, Optional
+import psycopg
+from psycopg import sql
+from dotenv import load_dotenv
+from db.db_sql_connection import get_conninfo
+from db.db_prepared_statements import TRANSACTION_POOLER_PORTS
+
+# load variables from .env file
+load_dotenv()
+
+# configuration of the LISTEN connections (product catalog, user cache)
+DB_LISTEN_RETRY_SECONDS = float(os.getenv("DB_LISTEN_RETRY_SECONDS", 5))
+# port of a direct or session-mode connection for LISTEN, when SUPABASE_PORT is the transaction pooler
+DB_LISTEN_PORT = os.getenv("DB_LISTEN_PORT", "")
+
+
+def notification_listen_port(listen_port: str = DB_LISTEN_PORT, port: Optional[str] = None) -> Optional[str]:
+    """
+    Returns the port the notification listeners connect to.
+
+    Behind a pooler in transaction mode (the Supabase port 6543), LISTEN succeeds
+    but the server session is handed to other clients after each transaction, so
+    no notification is ever delivered. The listeners then need a direct or
+    session-mode port; without one they stay off.
+
+    Args:
+        listen_port (str): Value of DB_LISTEN_PORT; empty means SUPABASE_PORT.
+        port (Optional[str]): Database port. Defaults to SUPABASE_PORT.
+
+    Returns:
+        Optional[str]: The port, or None if notifications cannot be received.
+    """
+    if listen_port:
+        return listen_port
+    port = port if port is not None else os.getenv("SUPABASE_PORT", "5432")
+    return None if port in TRANSACTION_POOLER_PORTS else port
+
+
+class NotificationListener:
+    """
+    Keeps a dedicated connection LISTENing on a channel and hands every notification
+    to a callback, reconnecting after failures.
+
+    Notifications sent while the connection is down are lost, so on_connect runs
+    every time LISTEN becomes active: the owner drops whatever it may have missed.
+
+    Args:
+        channel (str): Name of the notification channel.
+        retry_seconds (float): Pause before reconnecting after a failure.
+        listen_port (Optional[str]): Port of the connection (see notification_listen_port()).
+            None never starts the listener.
+        on_notify (Callable[[str], None]): Called with the payload of each notification.
+        on_connect (Callable[[], None]): Called once LISTEN is active, before any notification.
+    """
+
+    def __init__(
+        self,
+        channel: str,
+        retry_seconds: float,
+        listen_port: Optional[str],
+        on_notify: Callable[[str], None],
+        on_connect: Callable[[], None],
+    ):
+        self.channel = channel
+        self.retry_seconds = retry_seconds
+        self.listen_port = listen_port
+        self.on_notify = on_notify
+        self.on_connect = on_connect
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.listening = False
+        self._task: Optional[asyncio.Task] = None
+        self._ready: Optional[asyncio.Event] = None
+
+    async def start(self, timeout: Optional[float]) -> None:
+        """
+        Starts listening on the running event loop.
+
+        Waits up to `timeout` seconds for the connection; after that it keeps
+        trying in the background.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait for the connection. None returns
+                at once.
+
+        Raises:
+            asyncio.TimeoutError: If it did not connect in time.
+        """
+        if self._task is not None:
+            return
+        if self.listen_port is None:
+            print(f"Listener on '{self.channel}' disabled: notifications are not delivered through a transaction pooler")
+            return
+
+        self.loop = asyncio.get_running_loop()
+        self._ready = asyncio.Event()
+        self._task = self.loop.create_task(self._listen())
+        if timeout is not None:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+
+    async def stop(self) -> None:
+        """
+        Closes the connection.
+        """
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self.listening = False
+        self.loop = None
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(get_conninfo(self.listen_port), autocommit=True) as conn:
+                    await conn.execute(sql.SQL("LISTEN {};").format(sql.Identifier(self.channel)))
+                    self.on_connect()
+                    self.listening = True
+                    self._ready.set()
+                    async for notification in conn.notifies():
+                        self.on_notify(notification.payload)
+            except Exception as e:
+                print(f"Listener error on '{self.channel}': {str(e)}")
+            finally:
+                self.listening = False
+            await asyncio.sleep(self.retry_seconds)
@@ -0,0 +1,131 @@
+import os
+from typing import Any, Dict, Optional
+from dotenv import load_dotenv
+
+# load variables from .env file
+load_dotenv()
+
+# 'true' prepares the registered statements on first use, 'false' never prepares
+# anything (PgBouncer/Supavisor in transaction mode), 'auto' picks 'false' on the
+# Supabase transaction pooler port (6543) and 'true' otherwise.
+DB_PREPARED_STATEMENTS = os.getenv("DB_PREPARED_STATEMENTS", "auto").lower()
+TRANSACTION_POOLER_PORTS = {"6543"}
+
+
+def prepared_statements_enabled(setting: str = DB_PREPARED_STATEMENTS, port: Optional[str] = None) -> bool:
+    """
+    Tells whether server-side prepared statements can be used.
+
+    Prepared statements live in a server session. Behind a pooler in transaction
+    mode, consecutive transactions of one client connection may run on different
+    server sessions, where the statement was never prepared.
+
+    Args:
+        setting (str): Value of DB_PREPARED_STATEMENTS ('auto', 'true' or 'false').
+        port (Optional[str]): Database port, used by 'auto'. Defaults to SUPABASE_PORT.
+
+    Returns:
+        bool: True if statements may be prepared.
+    """
+    if setting in ("1", "true", "yes"):
+        return True
+    if setting in ("0", "false", "no"):
+        return False
+    port = port if port is not None else os.getenv("SUPABASE_PORT", "5432")
+    return port not in TRANSACTION_POOLER_PORTS
+
+
+class StatementRegistry:
+    """
+    Registry of the hot statements the CRUD modules run on almost every request.
+
+    Registered statements are executed with psycopg's prepare=True: the first run on
+    each connection prepares them on the server (parse and plan once), and later
+    runs on that connection only bind and execute the prepared statement. psycopg
+    keeps track of which connection prepared what, so pooled connections simply
+    prepare on their own first use.
+
+    When prepared statements are disabled every statement is sent unprepared,
+    including the ones psycopg would otherwise prepare after prepare_threshold
+    executions (see connection_kwargs()).
+
+    Args:
+        enabled (bool): Whether statements may be prepared at all.
+    """
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self._statements: Dict[str, str] = {}
+        self._names: Dict[str, str] = {}
+
+    def register(self, name: str, query: str) -> str:
+        """
+        Marks a statement as hot.
+
+        Args:
+            name (str): Name of the statement, usually the CRUD function running it.
+            query (str): The SQL text, exactly as passed to cursor.execute().
+
+        Returns:
+            str: The query, so the call can wrap the literal where it is defined.
+        """
+        if self._names.get(query) != name:
+            self._statements[name] = query
+            self._names[query] = name
+        return query
+
+    def prepare_flag(self, query: Any) -> Optional[bool]:
+        """
+        Returns the 'prepare' argument for cursor.execute().
+
+        Args:
+            query (Any): The statement about to be executed.
+
+        Returns:
+            Optional[bool]: True for registered statements, False for everything when
+            disabled, and None (psycopg's own threshold) otherwise.
+        """
+        if not self.enabled:
+            return False
+        if isinstance(query, str) and query in self._names:
+            return True
+        return None
+
+    def statements(self) -> Dict[str, str]:
+        """
+        Returns the registered statements by name.
+
+        Returns:
+            Dict[str, str]: Name to SQL text.
+        """
+        return dict(self._statements)
+
+    def connection_kwargs(self) -> Dict[str, Any]:
+        """
+        Returns the keyword arguments for psycopg connections.
+
+        Returns:
+            Dict[str, Any]: prepare_threshold=None when prepared statements are
+            disabled, so psycopg never prepares on its own either.
+        """
+        return {} if self.enabled else {"prepare_threshold": None}
+
+
+statement_registry = StatementRegistry(enabled=prepared_statements_enabled())
+
+
+def prepared(name: str, query: str) -> str:
+    """
+    Registers a hot statement and returns it unchanged.
+
+    Args:
+        name (str): Name of the statement.
+        query (str): The SQL text.
+
+    Returns:
+        str: The query.
+
+    Example:
+        >>> query = prepared("get_order_by_id", "SELECT * FROM orders WHERE id = %(order_id)s")
+    """
+    return statement_registry.register(name, query)
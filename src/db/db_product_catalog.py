@@ -0,0 +1,182 @@
+import os
+import asyncio
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+from db.db_sql_connection import async_connect
+from db.db_notifications import DB_LISTEN_RETRY_SECONDS, NotificationListener, notification_listen_port
+
+# load variables from .env file
+load_dotenv()
+
+# configuration of the in-memory product catalog
+PRODUCT_CATALOG_ENABLED = os.getenv("PRODUCT_CATALOG_ENABLED", "true").lower() in ("1", "true", "yes")
+PRODUCT_CATALOG_CHANNEL = os.getenv("PRODUCT_CATALOG_CHANNEL", "products_changed")
+PRODUCT_CATALOG_STARTUP_TIMEOUT = float(os.getenv("PRODUCT_CATALOG_STARTUP_TIMEOUT", 5))
+
+
+class ProductCatalog:
+    """
+    In-memory copy of the products table, kept consistent through LISTEN/NOTIFY.
+
+    A NotificationListener holds a dedicated connection that LISTENs on the channel
+    the products trigger (database/migrations/002_products_notify.sql) notifies
+    after every INSERT, UPDATE, DELETE or TRUNCATE. A notification, or a local write
+    through invalidate(), marks the copy stale and the next read reloads the whole
+    table once, whatever the number of concurrent readers.
+
+    The catalog only answers while its listener is connected, and only on the event
+    loop it was started on; otherwise is_live() is False and the CRUD functions
+    query the database as before, so a lost listener never serves stale products.
+
+    Args:
+        channel (str): Name of the notification channel.
+        retry_seconds (float): Pause before reconnecting a listener that failed.
+        listen_port (Optional[str]): Port of the listener connection (see
+            notification_listen_port()). None never starts the listener.
+    """
+
+    def __init__(self, channel: str, retry_seconds: float, listen_port: Optional[str]):
+        self._listener = NotificationListener(
+            channel, retry_seconds, listen_port, on_notify=self._notified, on_connect=self.invalidate
+        )
+        self._products: Dict[int, Dict] = {}
+        self._ids: List[int] = []
+        # bumped by every invalidation; the copy is fresh while both match
+        self._generation = 0
+        self._loaded_generation = -1
+        self._reload: Optional[asyncio.Task] = None
+        self._reloads = 0
+        self._notifications = 0
+
+    def is_live(self) -> bool:
+        """
+        Tells whether reads on the running event loop can be served from memory.
+
+        Returns:
+            bool: True if the listener is connected on this loop.
+        """
+        try:
+            return self._listener.listening and asyncio.get_running_loop() is self._listener.loop
+        except RuntimeError:
+            return False
+
+    def invalidate(self) -> None:
+        """
+        Marks the copy stale; the next read reloads the table.
+        """
+        self._generation += 1
+
+    async def get(self, product_id: int) -> Optional[Dict]:
+        """
+        Returns a product by its ID.
+
+        Args:
+            product_id (int): The product ID.
+
+        Returns:
+            Optional[Dict]: A copy of the product row, or None if it does not exist.
+        """
+        products, _ = await self._fresh()
+        product = products.get(product_id)
+        return dict(product) if product is not None else None
+
+    async def page(self, limit: Optional[int] = None, after: Optional[int] = None) -> List[Dict]:
+        """
+        Returns products ordered by ID, like the keyset query of get_all_products.
+
+        Args:
+            limit (Optional[int]): Maximum number of products to return. All products if None.
+            after (Optional[int]): Only return products with an ID greater than this cursor.
+
+        Returns:
+            List[Dict]: Copies of the product rows.
+        """
+        products, ids = await self._fresh()
+        start = bisect_right(ids, after or 0)
+        end = None if limit is None else start + limit
+        return [dict(products[product_id]) for product_id in ids[start:end]]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the catalog counters.
+
+        Returns:
+            Dict[str, int]: Products held, reloads, notifications received and whether it is listening.
+        """
+        return {
+            "size": len(self._ids),
+            "reloads": self._reloads,
+            "notifications": self._notifications,
+            "listening": int(self._listener.listening),
+        }
+
+    async def start(self, timeout: float = PRODUCT_CATALOG_STARTUP_TIMEOUT) -> None:
+        """
+        Starts the listener on the running event loop and loads the products.
+
+        Waits up to `timeout` seconds for the listener to connect. If it does not,
+        the application starts anyway and reads go to the database until it does.
+
+        Args:
+            timeout (float): Seconds to wait for the listener before giving up.
+        """
+        try:
+            await self._listener.start(timeout)
+            if self._listener.listening:
+                await self._fresh()
+        except Exception as e:
+            print(f"Product catalog not loaded at startup: {str(e)}")
+
+    async def stop(self) -> None:
+        """
+        Stops the listener and drops the in-memory copy.
+        """
+        await self._listener.stop()
+        self._products, self._ids = {}, []
+        self.invalidate()
+
+    async def _fresh(self) -> Tuple[Dict[int, Dict], List[int]]:
+        """
+        Returns the products and their sorted IDs, reloading them first if stale.
+        Concurrent readers share a single reload.
+        """
+        while self._loaded_generation != self._generation:
+            if self._reload is None or self._reload.done():
+                self._reload = asyncio.get_running_loop().create_task(self._load())
+            await asyncio.shield(self._reload)
+        return self._products, self._ids
+
+    async def _load(self) -> None:
+        generation = self._generation
+        async with async_connect() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute("SELECT * FROM products ORDER BY id;")
+                columns = [desc[0] for desc in cursor.description]
+                rows = [dict(zip(columns, row)) for row in await cursor.fetchall()]
+
+        # replaced at once, so readers holding the previous copy are not affected
+        self._products = {row["id"]: row for row in rows}
+        self._ids = [row["id"] for row in rows]
+        # a notification received meanwhile keeps the copy stale
+        self._loaded_generation = generation
+        self._reloads += 1
+
+    def _notified(self, payload: str) -> None:
+        self._notifications += 1
+        self.invalidate()
+
+
+product_catalog = ProductCatalog(
+    channel=PRODUCT_CATALOG_CHANNEL,
+    retry_seconds=DB_LISTEN_RETRY_SECONDS,
+    listen_port=notification_listen_port(),
+)
+
+
+async def start_product_catalog() -> None:
+    """
+    Starts the product catalog unless PRODUCT_CATALOG_ENABLED is false.
+    """
+    if PRODUCT_CATALOG_ENABLED:
+        await product_catalog.start()
@@ -0,0 +1,237 @@
+import os
+import re
+import random
+import asyncio
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+import psycopg
+from dotenv import load_dotenv
+
+# load variables from .env file
+load_dotenv()
+
+# configuration of the slow-query log
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", 200))
+SLOW_QUERY_LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", 100))
+SLOW_QUERY_EXPLAIN_SAMPLE_RATE = float(os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE_RATE", 0))
+
+# Columns whose values never leave the database unmasked
+PII_COLUMNS = {"email", "cpf_cnpj", "password_hash"}
+MASK = "***"
+
+_EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+_BCRYPT_RE = re.compile(r"\$2[abxy]?\$\d{2}\$")
+_DOCUMENT_RE = re.compile(r"\d{3}\.?\d{3}\.?\d{3}-?\d{2}|\d{2}\.?\d{3}\.?\d{3}/?\d{4}-?\d{2}")
+_INSERT_RE = re.compile(r"INSERT\s+INTO\s+\S+\s*\(([^)]*)\)\s*VALUES\s*\(([^)]*)\)", re.IGNORECASE)
+_PLACEHOLDER_RE = re.compile(r"%s|%\((\w+)\)s")
+_COMPARED_COLUMN_RE = re.compile(r"(\w+)\s*(?:=|<>|!=|<=|>=|<|>|\bLIKE|\bILIKE|\bIN)\s*\(?\s*$", re.IGNORECASE)
+
+
+def _placeholder_columns(query: str) -> List[Optional[str]]:
+    """
+    Returns the column each positional placeholder is bound to, when it can be told
+    from the statement ('col = %s' or an INSERT column list), otherwise None.
+    """
+    insert = _INSERT_RE.search(query)
+    if insert:
+        columns = [column.strip().strip('"') for column in insert.group(1).split(",")]
+        values = [value.strip() for value in insert.group(2).split(",")]
+        if len(columns) == len(values):
+            return [column for column, value in zip(columns, values) if value == "%s"]
+
+    columns = []
+    for placeholder in _PLACEHOLDER_RE.finditer(query):
+        compared = _COMPARED_COLUMN_RE.search(query[: placeholder.start()])
+        columns.append(compared.group(1) if compared else None)
+    return columns
+
+
+def _looks_like_pii(value: Any) -> bool:
+    """
+    Recognizes emails, bcrypt hashes and CPF/CNPJ numbers bound to unknown columns.
+    """
+    if not isinstance(value, str):
+        return False
+    return bool(_EMAIL_RE.fullmatch(value) or _BCRYPT_RE.match(value) or _DOCUMENT_RE.fullmatch(value))
+
+
+def mask_params(query: str, params: Any, pii_columns: Set[str] = PII_COLUMNS) -> Any:
+    """
+    Returns a copy of the statement parameters with personal data masked.
+
+    Named parameters are masked by name; positional ones by the column they are
+    compared with or inserted into. Values that look like an email, a password
+    hash or a CPF/CNPJ are masked wherever they appear.
+
+    Args:
+        query (str): The SQL statement.
+        params (Any): Sequence or mapping of parameters, or None.
+        pii_columns (Set[str]): Column names holding personal data.
+
+    Returns:
+        Any: The parameters with personal data replaced by '***'.
+    """
+    if params is None:
+        return None
+
+    if isinstance(params, dict):
+        return {
+            key: MASK if key in pii_columns or _looks_like_pii(value) else value
+            for key, value in params.items()
+        }
+
+    columns = _placeholder_columns(query)
+    masked = []
+    for index, value in enumerate(params):
+        column = columns[index] if index < len(columns) else None
+        masked.append(MASK if column in pii_columns or _looks_like_pii(value) else value)
+    return masked
+
+
+def _query_text(query: Any, conn: Optional[psycopg.AsyncConnection] = None) -> str:
+    """
+    Returns the statement as a string, whatever form it was passed in.
+    """
+    if isinstance(query, bytes):
+        return query.decode()
+    if isinstance(query, str):
+        return query
+    try:
+        return query.as_string(conn)
+    except Exception:
+        return str(query)
+
+
+class SlowQueryLog:
+    """
+    Ring buffer of the statements that took longer than a threshold.
+
+    Each entry holds the statement, its masked parameters, the CRUD function that
+    ran it and its duration. A sample of the slow SELECT statements is run again
+    in the background with EXPLAIN (ANALYZE, BUFFERS), and the plan is attached to
+    the entry once it is ready.
+
+    Args:
+        threshold_ms (float): Minimum duration, in milliseconds, of a logged statement.
+        size (int): Number of entries kept; the oldest one is dropped first.
+        explain_sample_rate (float): Fraction (0 to 1) of slow SELECTs to explain.
+    """
+
+    def __init__(self, threshold_ms: float, size: int, explain_sample_rate: float = 0.0):
+        self.threshold_ms = threshold_ms
+        self.explain_sample_rate = explain_sample_rate
+        self._entries: deque = deque(maxlen=max(size, 1))
+        self._lock = threading.Lock()
+        self._explains: Set[asyncio.Task] = set()
+
+    def record(
+        self,
+        function: str,
+        query: Any,
+        params: Any,
+        duration: float,
+        conn: Optional[psycopg.AsyncConnection] = None,
+        error: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Adds a slow statement to the log and schedules its EXPLAIN if sampled.
+
+        Args:
+            function (str): Name of the CRUD function that ran the statement.
+            query (Any): The statement as passed to cursor.execute().
+            params (Any): The statement parameters.
+            duration (float): Execution time in seconds.
+            conn (Optional[psycopg.AsyncConnection]): Connection used to render composed statements.
+            error (Optional[str]): Error raised by the statement, if any.
+
+        Returns:
+            Dict[str, Any]: The new entry.
+        """
+        text = _query_text(query, conn)
+        masked = mask_params(text, params)
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            "function": function,
+            "duration_ms": round(duration * 1000, 3),
+            "query": " ".join(text.split()),
+            "params": masked,
+            "error": error,
+            "plan": None,
+        }
+        with self._lock:
+            self._entries.append(entry)
+
+        if (
+            error is None
+            and self.explain_sample_rate > 0
+            and text.lstrip().upper().startswith("SELECT")
+            and random.random() < self.explain_sample_rate
+        ):
+            if isinstance(params, dict):
+                pairs = zip(params.values(), masked.values())
+            else:
+                pairs = zip(params or (), masked or ())
+            hidden = {str(value) for value, shown in pairs if shown == MASK and value is not None}
+            self._schedule_explain(entry, text, params, hidden)
+        return entry
+
+    def entries(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Returns the logged statements, most recent first.
+
+        Args:
+            limit (Optional[int]): Maximum number of entries to return.
+
+        Returns:
+            List[Dict[str, Any]]: The entries.
+        """
+        with self._lock:
+            entries = list(reversed(self._entries))
+        return entries[:limit] if limit else entries
+
+    def clear(self) -> None:
+        """
+        Removes every entry.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def _schedule_explain(self, entry: Dict[str, Any], query: str, params: Any, hidden: Set[str]) -> None:
+        try:
+            task = asyncio.get_running_loop().create_task(self._explain(entry, query, params, hidden))
+        except RuntimeError:
+            return
+        self._explains.add(task)
+        task.add_done_callback(self._explains.discard)
+
+    async def _explain(self, entry: Dict[str, Any], query: str, params: Any, hidden: Set[str]) -> None:
+        """
+        Runs EXPLAIN (ANALYZE, BUFFERS) on a separate connection, in a read-only
+        transaction that is rolled back, and stores the plan in the entry. Masked
+        parameter values are masked in the plan too, since filters quote them.
+        """
+        from db.db_sql_connection import async_connect
+
+        try:
+            async with async_connect() as conn:
+                # plain cursors: the explain itself must not be timed or logged
+                cursor = psycopg.AsyncCursor(conn)
+                await cursor.execute("SET TRANSACTION READ ONLY;")
+                await cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {query}", params)
+                plan = "\n".join(row[0] for row in await cursor.fetchall())
+                for value in hidden:
+                    plan = plan.replace(value, MASK)
+                entry["plan"] = plan
+                await cursor.close()
+                await conn.rollback()
+        except Exception as e:
+            entry["plan"] = f"EXPLAIN failed: {(str(e).splitlines() or [type(e).__name__])[0]}"
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=SLOW_QUERY_THRESHOLD_MS,
+    size=SLOW_QUERY_LOG_SIZE,
+    explain_sample_rate=SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+)
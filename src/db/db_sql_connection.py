@@ -1,6 +1,12 @@
-import psycopg2
+import asyncio
+import psycopg
 import os
+from typing import AsyncIterator, Dict, Optional
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
+from psycopg.conninfo import make_conninfo
+from psycopg_pool import AsyncConnectionPool
+from db.db_instrumentation import InstrumentedAsyncConnection
 
 # load variables from .env file
 load_dotenv()
@@ -12,31 +18,144 @@ SUPABASE_HOST = os.getenv("SUPABASE_HOST", "localhost")
 SUPABASE_PORT = os.getenv("SUPABASE_PORT", "5432")
 SUPABASE_DATABASE = os.getenv("SUPABASE_DATABASE", "test_db")
 
+# Variables to configure the connection pool
+DB_POOL_ENABLED = os.getenv("DB_POOL_ENABLED", "true").lower() in ("1", "true", "yes")
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", 1))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", 10))
+DB_POOL_MAX_LIFETIME = float(os.getenv("DB_POOL_MAX_LIFETIME", 1800))
+DB_POOL_IDLE_TIMEOUT = float(os.getenv("DB_POOL_IDLE_TIMEOUT", 300))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))
 
-def connect():
+# One async pool per event loop: psycopg async connections are bound to the loop they run on
+_async_pools: Dict[asyncio.AbstractEventLoop, "asyncio.Task[AsyncConnectionPool]"] = {}
+
+
+def get_conninfo(port: Optional[str] = None) -> str:
+    """
+    Builds the libpq connection string from the SUPABASE_* variables.
+
+    Args:
+        port (Optional[str]): Port to connect to instead of SUPABASE_PORT, e.g. the
+            session-mode port of the same pooler.
+
+    Returns:
+        str: Connection string accepted by psycopg.
+    """
+    return make_conninfo(
+        user=SUPABASE_USER,
+        password=SUPABASE_PASSWORD,
+        host=SUPABASE_HOST,
+        port=port or SUPABASE_PORT,
+        dbname=SUPABASE_DATABASE,
+    )
+
+
+async def _open_async_pool() -> AsyncConnectionPool:
     """
-    Establishes a connection to the PostgreSQL database.
+    Creates and opens the async connection pool for the running event loop.
+    """
+    pool = AsyncConnectionPool(
+        get_conninfo(),
+        connection_class=InstrumentedAsyncConnection,
+        min_size=DB_POOL_MIN_SIZE,
+        max_size=DB_POOL_MAX_SIZE,
+        max_lifetime=DB_POOL_MAX_LIFETIME,
+        max_idle=DB_POOL_IDLE_TIMEOUT,
+        timeout=DB_POOL_TIMEOUT,
+        check=AsyncConnectionPool.check_connection,
+        open=False,
+    )
+    await pool.open()
+    return pool
+
+
+async def get_async_pool() -> AsyncConnectionPool:
+    """
+    Returns the async connection pool of the running event loop, opening it on first use.
+
+    Pools left behind by event loops that have already been closed are dropped.
 
     Returns:
-        connection (psycopg2.extensions.connection): Database connection object.
+        AsyncConnectionPool: The pool shared by every coroutine on this loop.
+    """
+    loop = asyncio.get_running_loop()
+    opening = _async_pools.get(loop)
+
+    if opening is None:
+        for stale_loop in [other for other in _async_pools if other.is_closed()]:
+            del _async_pools[stale_loop]
+        opening = loop.create_task(_open_async_pool())
+        _async_pools[loop] = opening
+
+    try:
+        return await asyncio.shield(opening)
+    except Exception:
+        _async_pools.pop(loop, None)
+        raise
+
+
+async def close_async_pool() -> None:
+    """
+    Closes the async connection pool of the running event loop, if it was opened.
+    """
+    opening = _async_pools.pop(asyncio.get_running_loop(), None)
+    if opening is not None and opening.done() and not opening.exception():
+        await opening.result().close()
+
+
+def get_pool_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Returns the statistics of the pools opened by this process.
+
+    Returns:
+        Dict[str, Dict[str, int]]: 'async' holds the sum of psycopg_pool's get_stats()
+        over the open async pools; empty until a pool has been opened.
+    """
+    stats = {}
+    opened = [task.result() for task in list(_async_pools.values()) if task.done() and not task.cancelled() and task.exception() is None]
+    if opened:
+        totals: Dict[str, int] = {}
+        for pool in opened:
+            for key, value in pool.get_stats().items():
+                totals[key] = totals.get(key, 0) + value
+        stats["async"] = totals
+    return stats
+
+
+@asynccontextmanager
+async def async_connect() -> AsyncIterator[psycopg.AsyncConnection]:
+    """
+    Establishes a connection to the PostgreSQL database, used by the CRUD modules.
+
+    Checks a psycopg async connection out of the event loop's pool. Leaving the
+    ``async with`` block commits (or rolls back on error) and returns the connection
+    to the pool. With DB_POOL_ENABLED=false a new connection is opened per call.
+
+    Yields:
+        psycopg.AsyncConnection: Database connection object.
 
     Raises:
         Exception: If an error occurs while connecting to the database.
 
     Example:
-        >>> conn = connect()
-        Connection established successfully.
+        >>> async with async_connect() as conn:
+        ...     async with conn.cursor() as cursor:
+        ...         await cursor.execute("SELECT 1;")
     """
+    if not DB_POOL_ENABLED:
+        try:
+            conn = await InstrumentedAsyncConnection.connect(get_conninfo())
+        except Exception as e:
+            print(f"Error connecting to the database: {str(e)}")
+            raise
+        async with conn:
+            yield conn
+        return
+
     try:
-        connection = psycopg2.connect(
-            user=SUPABASE_USER,
-            password=SUPABASE_PASSWORD,
-            host=SUPABASE_HOST,
-            port=SUPABASE_PORT,
-            database=SUPABASE_DATABASE,
-        )
-        # print("Connection established successfully.")
-        return connection
+        pool = await get_async_pool()
     except Exception as e:
         print(f"Error connecting to the database: {str(e)}")
         raise
+    async with pool.connection() as conn:
+        yield conn
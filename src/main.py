@@ -5,11 +5,42 @@ sys.path.append(os.path.abspath(os.path.dirname(__file__)))
 
 import uvicorn
 from fastapi import FastAPI
+from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 from modules.modules_api import router
+from db.db_sql_connection import get_async_pool, close_async_pool
+from db.db_product_catalog import product_catalog, start_product_catalog
+from utils.utils_cache import start_user_cache_listener, user_cache_listener
+from utils.utils_validation import password_hasher
+from utils.utils_invoice_renderer import invoice_renderer, start_invoice_renderer
+from utils.utils_contract_renderer import contract_renderer
+from utils.utils_json import FastJSONResponse
+from utils.utils_metrics import MetricsMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open the database pool before serving requests and close it on shutdown
+    await get_async_pool()
+    # Load the products into memory and listen for changes made by any worker
+    await start_product_catalog()
+    # Drop cached users as soon as any worker changes them
+    await start_user_cache_listener()
+    # Render queued invoice PDFs in the background
+    await start_invoice_renderer()
+    # Compile the contract templates once, before the first render
+    await contract_renderer.start()
+    yield
+    await contract_renderer.stop()
+    await invoice_renderer.stop()
+    await user_cache_listener.stop()
+    await product_catalog.stop()
+    await close_async_pool()
+    password_hasher.shutdown()
+
 
 # Initialize the FastAPI application
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
 #Enable CORS for all origins
 origins = ["*"]
@@ -21,6 +52,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Record request latency per route template, served on /metrics
+app.add_middleware(MetricsMiddleware)
+
 # Include the API router
 app.include_router(router)
 
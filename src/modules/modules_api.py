@@ -9,6 +9,11 @@ from routes.route_customers_me import customers_router
 from routes.route_orders_items import order_items_router
 from routes.route_authentication import authentication_router
 from routes.route_customers_data import customers_router_data
+from routes.route_exports import exports_router
+from routes.route_metrics import metrics_router
+from routes.route_admin import admin_router
+from routes.route_reports import reports_router
+from routes.route_quotes import quotes_router
 
 
 # -------------------- API ROUTES -------------------- #
@@ -24,3 +29,8 @@ router.include_router(customers_router)
 router.include_router(order_items_router)
 router.include_router(invoices_router)
 router.include_router(contracts_router)
+router.include_router(exports_router)
+router.include_router(metrics_router)
+router.include_router(admin_router)
+router.include_router(reports_router)
+router.include_router(quotes_router)
@@ -0,0 +1,185 @@
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from utils.utils_token_auth import get_current_admin
+from utils.utils_validation import password_hasher, validate_password_strength
+from utils.utils_bulk_import import detect_format, iter_batches, spool_batches, spool_rows, validate_rows
+from db.db_slow_query_log import slow_query_log
+from db.db_base_classes import Customer, Product
+from db.db_enums import UserType
+from db.CRUD.create import (
+    CUSTOMER_IMPORT_COLUMNS,
+    PRODUCT_IMPORT_COLUMNS,
+    bulk_create_customers,
+    bulk_create_products,
+)
+from db.CRUD.update import recompute_order_totals
+
+admin_router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+@admin_router.get("/slow-queries")
+async def get_slow_queries(
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of entries to return"),
+    current_user: dict = Depends(get_current_admin),
+):
+    """
+    Returns the statements slower than SLOW_QUERY_THRESHOLD_MS, most recent first.
+
+    Args:
+        limit (Optional[int]): Maximum number of entries to return.
+        current_user (dict): The authenticated administrator.
+
+    Returns:
+        dict: The threshold and the logged statements, with masked parameters and,
+        for sampled SELECTs, their EXPLAIN (ANALYZE, BUFFERS) plan.
+    """
+    return {
+        "threshold_ms": slow_query_log.threshold_ms,
+        "explain_sample_rate": slow_query_log.explain_sample_rate,
+        "entries": slow_query_log.entries(limit),
+    }
+
+
+@admin_router.delete("/slow-queries")
+async def clear_slow_queries(current_user: dict = Depends(get_current_admin)):
+    """
+    Empties the slow-query log.
+
+    Args:
+        current_user (dict): The authenticated administrator.
+
+    Returns:
+        dict: Message confirming the log was cleared.
+    """
+    slow_query_log.clear()
+    return {"message": "Slow-query log cleared."}
+
+
+# Column sizes of the customers table not enforced by the Customer model
+CUSTOMER_COLUMN_LENGTHS = {"full_name": 255, "email": 255, "phone": 30}
+
+
+def _check_customers(rows: Iterator[Tuple[int, Dict]], errors: List[Dict]) -> Iterator[Tuple[int, Dict]]:
+    """
+    Applies the checks POST /auth/register makes on top of the Customer model,
+    plus the column sizes, so no row can make the COPY fail.
+    """
+    roles = {role.value for role in UserType}
+    for line, row in rows:
+        problems = [
+            f"{column}: must have at most {length} characters"
+            for column, length in CUSTOMER_COLUMN_LENGTHS.items()
+            if row[column] and len(row[column]) > length
+        ]
+        if row["role"] not in roles:
+            problems.append(f"role: must be one of {sorted(roles)}")
+        try:
+            validate_password_strength(row["password_hash"])
+        except HTTPException as e:
+            problems.append(f"password_hash: {e.detail}")
+
+        if problems:
+            errors.append({"line": line, "errors": problems})
+        else:
+            yield line, row
+
+
+async def _hash_passwords(batches: AsyncIterator[List[Tuple[int, Dict]]]) -> AsyncIterator[List[Tuple[int, Dict]]]:
+    """
+    Replaces the plain text passwords of each batch with their bcrypt hashes,
+    computed in parallel on the password worker pool.
+    """
+    async for batch in batches:
+        hashes = await password_hasher.hash_many([row["password_hash"] for _, row in batch])
+        yield [(line, {**row, "password_hash": hashed}) for (line, row), hashed in zip(batch, hashes)]
+
+
+def _import_result(received_errors: List[Dict], result: Dict) -> Dict:
+    errors = sorted(received_errors, key=lambda error: error["line"])
+    return {"created": result["created"], "ids": result["ids"], "failed": len(errors), "errors": errors}
+
+
+@admin_router.post("/import/products")
+async def import_products(
+    file: UploadFile = File(..., description="CSV with a header row, or NDJSON"),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$", description="Defaults to the file extension"),
+    current_user: dict = Depends(get_current_admin),
+):
+    """
+    Creates products in bulk from a CSV or NDJSON upload.
+
+    Rows are validated with the Product model on a worker thread and spooled
+    before the transaction opens; valid rows are then loaded with COPY and
+    inserted by one statement. Invalid rows are reported and
+    do not prevent the others from being created.
+
+    Args:
+        file (UploadFile): Rows with name, description, base_price, category and active.
+        format (Optional[str]): 'csv' or 'ndjson'; guessed from the file when omitted.
+        current_user (dict): The authenticated administrator.
+
+    Returns:
+        dict: Number and IDs of the created products, and the errors per line.
+    """
+    errors: List[Dict] = []
+    rows = validate_rows(
+        file.file, format or detect_format(file.filename, file.content_type), Product, errors, PRODUCT_IMPORT_COLUMNS
+    )
+    # parse and validate the whole upload first, so the transaction only covers COPY and insert
+    result = await bulk_create_products(await spool_rows(rows))
+    return _import_result(errors, result)
+
+
+@admin_router.post("/import/customers")
+async def import_customers(
+    file: UploadFile = File(..., description="CSV with a header row, or NDJSON"),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$", description="Defaults to the file extension"),
+    current_user: dict = Depends(get_current_admin),
+):
+    """
+    Creates customers in bulk from a CSV or NDJSON upload.
+
+    Rows are validated with the Customer model and the registration checks as the
+    file is read. As in POST /auth/register, password_hash holds the plain text
+    password; it is hashed on the password worker pool, a batch at a time. The
+    whole file is validated and hashed before the database transaction starts,
+    so no connection is held while bcrypt runs. Rows whose email or CPF/CNPJ
+    already exists, or repeats an earlier row, are reported as errors instead of
+    failing the import.
+
+    Args:
+        file (UploadFile): Rows with full_name, email, phone, address, cpf_cnpj, password_hash and role.
+        format (Optional[str]): 'csv' or 'ndjson'; guessed from the file when omitted.
+        current_user (dict): The authenticated administrator.
+
+    Returns:
+        dict: Number and IDs of the created customers, and the errors per line.
+    """
+    errors: List[Dict] = []
+    rows = validate_rows(
+        file.file, format or detect_format(file.filename, file.content_type), Customer, errors, CUSTOMER_IMPORT_COLUMNS
+    )
+    hashed = await spool_batches(_hash_passwords(iter_batches(_check_customers(rows, errors))))
+    result = await bulk_create_customers(hashed)
+    errors.extend(
+        {"line": line, "errors": ["A customer with this email or CPF/CNPJ already exists."]}
+        for line in result["duplicate_lines"]
+    )
+    return _import_result(errors, result)
+
+
+@admin_router.post("/orders/recompute-totals")
+async def recompute_totals(current_user: dict = Depends(get_current_admin)):
+    """
+    Resets every order total to the sum of its items.
+
+    Totals are maintained by the order_items triggers; run this once after
+    migration 006 and whenever totals may have drifted (e.g. after manual SQL).
+
+    Args:
+        current_user (dict): The authenticated administrator.
+
+    Returns:
+        dict: Number and IDs of the orders whose total changed.
+    """
+    return await recompute_order_totals()
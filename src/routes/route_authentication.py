@@ -5,10 +5,10 @@ from utils.utils_token_auth import create_access_token
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi import APIRouter, HTTPException, status, Depends, Form
 from utils.utils_validation import (
-    get_password_hash,
+    get_password_hash_async,
     validate_password_strength,
     validate_email_format,
-    verify_password,
+    verify_password_async,
 )
 
 # -------------------- Authentication ROUTES -------------------- #
@@ -40,13 +40,16 @@ async def register(customer: Customer):
         validate_password_strength(customer.password_hash)
 
         # Hash the password before storing it in the database
-        customer.password_hash = get_password_hash(customer.password_hash)
+        customer.password_hash = await get_password_hash_async(customer.password_hash)
 
         # Create the user in the database
         await create_customer(customer.dict())
 
         return {"message": f"User {customer.full_name} registered successfully!"}
 
+    except HTTPException:
+        raise
+
     except ValueError as val_exc:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=str(val_exc)
@@ -84,7 +87,7 @@ async def login(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid email or password"
         )
 
-    if not verify_password(form_data.password, customer["password_hash"]):
+    if not await verify_password_async(form_data.password, customer["password_hash"]):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid email or password"
         )
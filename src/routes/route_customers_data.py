@@ -1,5 +1,6 @@
 from typing import List, Dict
 from utils.utils_token_auth import get_current_user
+from utils.utils_json import FastJSONResponse
 from fastapi import APIRouter, HTTPException, Path, Depends
 from db.CRUD.read import (
     get_events_by_customer_id,
@@ -7,12 +8,29 @@ from db.CRUD.read import (
     get_payments_by_customer_id,
     get_invoices_by_customer_id,
     get_contracts_by_customer_id,
-    get_order_items_by_customer_id
+    get_order_items_by_customer_id,
+    get_customer_overview,
 )
 
 customers_router_data = APIRouter(prefix="/customers", tags=["Customers Data"])
 
 
+@customers_router_data.get("/{customer_id}/overview", response_model=List[Dict])
+async def fetch_customer_overview(
+    customer_id: int = Path(..., gt=0), current_user: dict = Depends(get_current_user)
+):
+    """
+    Returns all events of the given customer ID with their orders, order_items,
+    payments, invoices and contracts nested per event, in one database round trip.
+    """
+    events = await get_customer_overview(customer_id)
+    if not events:
+        raise HTTPException(
+            status_code=404, detail="No events found for this customer."
+        )
+    return FastJSONResponse(events)
+
+
 @customers_router_data.get("/{customer_id}/events", response_model=List[Dict])
 async def fetch_events_by_customer(
     customer_id: int = Path(..., gt=0), current_user: dict = Depends(get_current_user)
@@ -25,7 +43,7 @@ async def fetch_events_by_customer(
         raise HTTPException(
             status_code=404, detail="No events found for this customer."
         )
-    return events
+    return FastJSONResponse(events)
 
 
 @customers_router_data.get("/{customer_id}/orders", response_model=List[Dict])
@@ -40,7 +58,7 @@ async def fetch_orders_by_customer(
         raise HTTPException(
             status_code=404, detail="No orders found for this customer."
         )
-    return orders
+    return FastJSONResponse(orders)
 
 
 @customers_router_data.get("/{customer_id}/payments", response_model=List[Dict])
@@ -55,7 +73,7 @@ async def fetch_payments_by_customer(
         raise HTTPException(
             status_code=404, detail="No payments found for this customer."
         )
-    return payments
+    return FastJSONResponse(payments)
 
 
 @customers_router_data.get("/{customer_id}/invoices", response_model=List[Dict])
@@ -70,7 +88,7 @@ async def fetch_invoices_by_customer(
         raise HTTPException(
             status_code=404, detail="No invoices found for this customer."
         )
-    return invoices
+    return FastJSONResponse(invoices)
 
 
 @customers_router_data.get("/{customer_id}/contracts", response_model=List[Dict])
@@ -85,7 +103,7 @@ async def fetch_contracts_by_customer(
         raise HTTPException(
             status_code=404, detail="No contracts found for this customer."
         )
-    return contracts
+    return FastJSONResponse(contracts)
 
 
 @customers_router_data.get("/{customer_id}/order_items", response_model=List[Dict])
@@ -101,4 +119,4 @@ async def fetch_order_items_by_customer(
         raise HTTPException(
             status_code=404, detail="No order items found for this customer."
         )
-    return items
+    return FastJSONResponse(items)
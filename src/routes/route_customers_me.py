@@ -6,11 +6,12 @@ from db.CRUD.read import get_customer_by_id, get_all_customers
 from db.CRUD.update import update_customer
 from db.CRUD.delete import delete_customer
 from utils.utils_token_auth import get_current_user
+from utils.utils_pagination import DEFAULT_PAGE_SIZE, build_page, clamp_page_size
+from utils.utils_json import FastJSONResponse
 from utils.utils_validation import (
-    get_password_hash,
+    get_password_hash_async,
     validate_password_strength,
     validate_email_format,
-    verify_password,
 )
 
 customers_router = APIRouter(prefix="/customers", tags=["Customers"])
@@ -33,17 +34,21 @@ async def get_my_data(current_user: dict = Depends(get_current_user)):
 @customers_router.get("/")
 async def get_customers(
     customer_id: Optional[int] = Query(None, description="The customer identifier"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, description="Maximum number of customers per page"),
+    after: Optional[int] = Query(None, ge=0, description="Cursor returned as 'next_cursor' by the previous page"),
     current_user: dict = Depends(get_current_user),
 ):
     """
-    Retrieves all customers or a specific customer if 'customer_id' is provided.
+    Retrieves a page of customers or a specific customer if 'customer_id' is provided.
 
     Args:
         customer_id (Optional[int]): The customer identifier (query parameter).
+        limit (int): Maximum number of customers per page, capped at MAX_PAGE_SIZE.
+        after (Optional[int]): Cursor from the previous page's 'next_cursor'.
         current_user (dict): The authenticated user.
 
     Returns:
-        dict or list: Customer details if 'customer_id' is provided, otherwise a list of all customers.
+        dict: Customer details if 'customer_id' is provided, otherwise a page with 'items' and 'next_cursor'.
 
     Raises:
         HTTPException: If the customer is not found.
@@ -54,7 +59,9 @@ async def get_customers(
             raise HTTPException(status_code=404, detail="Customer not found")
         return customer
 
-    return await get_all_customers()
+    page_size = clamp_page_size(limit)
+    customers = await get_all_customers(limit=page_size + 1, after=after)
+    return FastJSONResponse(build_page(customers, page_size))
 
 
 @customers_router.post("/")
@@ -80,7 +87,7 @@ async def create_new_customer(
     validate_password_strength(customer.password_hash)
 
     # Hash the password before storing it in the database
-    customer.password_hash = get_password_hash(customer.password_hash)
+    customer.password_hash = await get_password_hash_async(customer.password_hash)
 
     try:
         customer_data = customer.dict()
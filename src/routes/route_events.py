@@ -1,10 +1,21 @@
+from datetime import datetime, timedelta
 from typing import Optional
 from db.db_base_classes import Event
+from db.db_enums import EventType
 from db.CRUD.create import create_event
 from db.CRUD.update import update_event
 from db.CRUD.delete import delete_event
 from utils.utils_token_auth import get_current_user
-from db.CRUD.read import get_event_by_id, get_all_events
+from db.CRUD.read import get_event_by_id, get_all_events, get_events_calendar, get_location_bookings
+from utils.utils_pagination import (
+    DEFAULT_PAGE_SIZE,
+    build_page,
+    clamp_page_size,
+    decode_time_cursor,
+    encode_time_cursor,
+)
+from utils.utils_json import FastJSONResponse
+from utils.utils_scheduling import free_slots
 from fastapi import APIRouter, HTTPException, status, Depends, Query, Body
 
 events_router = APIRouter(prefix="/events", tags=["Events"])
@@ -13,17 +24,21 @@ events_router = APIRouter(prefix="/events", tags=["Events"])
 @events_router.get("/")
 async def get_events(
     event_id: Optional[int] = Query(None, description="The event identifier"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, description="Maximum number of events per page"),
+    after: Optional[int] = Query(None, ge=0, description="Cursor returned as 'next_cursor' by the previous page"),
     current_user: dict = Depends(get_current_user),
 ):
     """
-    Retrieves all events or a specific event if 'event_id' is provided.
+    Retrieves a page of events or a specific event if 'event_id' is provided.
 
     Args:
         event_id (Optional[int]): The event identifier (query parameter).
+        limit (int): Maximum number of events per page, capped at MAX_PAGE_SIZE.
+        after (Optional[int]): Cursor from the previous page's 'next_cursor'.
         current_user (dict): The authenticated user.
 
     Returns:
-        dict or list: Event details if 'event_id' is provided, otherwise a list of all events.
+        dict: Event details if 'event_id' is provided, otherwise a page with 'items' and 'next_cursor'.
 
     Raises:
         HTTPException: If the event is not found.
@@ -34,8 +49,97 @@ async def get_events(
             raise HTTPException(status_code=404, detail="Event not found")
         return event
 
-    # if no event_id is provided, return all events
-    return await get_all_events()
+    # if no event_id is provided, return a page of events
+    page_size = clamp_page_size(limit)
+    events = await get_all_events(limit=page_size + 1, after=after)
+    return FastJSONResponse(build_page(events, page_size))
+
+
+@events_router.get("/calendar")
+async def get_calendar(
+    date_from: datetime = Query(..., alias="from", description="Start of the range (inclusive)"),
+    date_to: datetime = Query(..., alias="to", description="End of the range (exclusive)"),
+    location: Optional[str] = Query(None, description="Only events at this location"),
+    event_type: Optional[EventType] = Query(None, description="Only events of this type"),
+    compact: bool = Query(False, description="Only return id, event_date, location and guest_count"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, description="Maximum number of events per page"),
+    after: Optional[str] = Query(None, description="Cursor returned as 'next_cursor' by the previous page"),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Retrieves a page of the events taking place between two dates, ordered by date.
+
+    Args:
+        date_from (datetime): Start of the range (inclusive), sent as 'from'.
+        date_to (datetime): End of the range (exclusive), sent as 'to'.
+        location (Optional[str]): Only events at this exact location.
+        event_type (Optional[EventType]): Only events of this type.
+        compact (bool): Only return id, event_date, location and guest_count, for month views.
+        limit (int): Maximum number of events per page, capped at MAX_PAGE_SIZE.
+        after (Optional[str]): Cursor from the previous page's 'next_cursor'.
+        current_user (dict): The authenticated user.
+
+    Returns:
+        dict: A page with 'items' and 'next_cursor'.
+
+    Raises:
+        HTTPException: If 'to' is not after 'from' or the cursor is invalid (400).
+    """
+    if date_to <= date_from:
+        raise HTTPException(status_code=400, detail="'to' must be after 'from'")
+    try:
+        cursor = decode_time_cursor(after) if after else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    page_size = clamp_page_size(limit)
+    events = await get_events_calendar(
+        date_from,
+        date_to,
+        location=location,
+        event_type=event_type.value if event_type else None,
+        compact=compact,
+        limit=page_size + 1,
+        after=cursor,
+    )
+    return FastJSONResponse(build_page(events, page_size, lambda row: encode_time_cursor(row, "event_date")))
+
+
+@events_router.get("/availability")
+async def get_availability(
+    location: str = Query(..., description="The location"),
+    date_from: datetime = Query(..., alias="from", description="Start of the range (inclusive)"),
+    date_to: datetime = Query(..., alias="to", description="End of the range (exclusive)"),
+    min_hours: float = Query(0, ge=0, description="Leave out free periods shorter than this"),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Retrieves the booked and free periods of a location between two dates.
+
+    Args:
+        location (str): The location.
+        date_from (datetime): Start of the range (inclusive), sent as 'from'.
+        date_to (datetime): End of the range (exclusive), sent as 'to'.
+        min_hours (float): Minimum length of the free periods returned, in hours.
+        current_user (dict): The authenticated user.
+
+    Returns:
+        dict: The 'booked' events ('id', 'start', 'end') and the 'free' periods ('start', 'end').
+
+    Raises:
+        HTTPException: If 'to' is not after 'from' (400).
+    """
+    if date_to <= date_from:
+        raise HTTPException(status_code=400, detail="'to' must be after 'from'")
+
+    bookings = await get_location_bookings(location, date_from, date_to)
+    return FastJSONResponse({
+        "location": location,
+        "from": date_from,
+        "to": date_to,
+        "booked": bookings,
+        "free": free_slots(bookings, date_from, date_to, timedelta(hours=min_hours)),
+    })
 
 
 @events_router.post("/")
@@ -53,7 +157,8 @@ async def create_new_event(
         dict: Message confirming event creation.
 
     Raises:
-        HTTPException: If the event creation fails.
+        HTTPException: 409 if the location is already booked at that time, 400 if the
+        event creation fails.
     """
     try:
         event.customer_id = current_user["id"]
@@ -62,6 +167,13 @@ async def create_new_event(
             "message": result["message"],
             "event_id": result["event_id"]
         }
+    except HTTPException as exc:
+        if exc.status_code == status.HTTP_409_CONFLICT:
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Error creating event: {str(exc)}",
+        )
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -84,30 +196,15 @@ async def modify_event(
         current_user (dict): The authenticated user.
 
     Returns:
-        dict: Updated event details.
+        dict: The updated event row.
 
     Raises:
-        HTTPException: If the update fails.
+        HTTPException: If the event is not found (404), the location is already booked
+        at the new time (409) or the update fails.
     """
-    # search for the event in the database before updating
-    existing_event = await get_event_by_id(event_id)
-
-    if not existing_event:
-        raise HTTPException(status_code=404, detail="Event not found")
-
-    # take the customer_id from the existing event (in case permission checks are needed later)
-    customer_id = existing_event["customer_id"]
-
-    # Update the event
-    event_data = event.dict()
-    event_data["customer_id"] = customer_id  # add the customer_id to the event data
-
-    updated_event = await update_event(event_id, event_data)
-
-    if not updated_event:
-        raise HTTPException(status_code=500, detail="Event update failed")
-
-    return {"message": "Event updated successfully", "event": updated_event}
+    # a single UPDATE ... RETURNING both checks the event exists and updates it
+    updated = await update_event(event_id, event.dict())
+    return {"message": "Event updated successfully", "event": updated["event"]}
 
 
 @events_router.delete("/")
@@ -128,19 +225,6 @@ async def remove_event(
     Raises:
         HTTPException: If the event is not found or deletion fails.
     """
-    # search for the event in the database before deleting
-    existing_event = await get_event_by_id(event_id)
-
-    if not existing_event:
-        raise HTTPException(status_code=404, detail="Event not found")
-
-    # take the customer_id from the existing event (in case permission checks are needed later)
-    customer_id = existing_event["customer_id"]
-
-    # Delete the event
-    deleted = await delete_event(event_id)
-
-    if not deleted:
-        raise HTTPException(status_code=500, detail="Event could not be deleted")
-
+    # DELETE ... RETURNING reports a missing event as 404, no lookup needed beforehand
+    await delete_event(event_id)
     return {"message": "Event deleted successfully"}
@@ -0,0 +1,117 @@
+import io
+import os
+import csv
+from typing import AsyncIterator, Callable, Dict, List
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from utils.utils_token_auth import get_current_admin
+from utils.utils_json import dumps
+from db.CRUD.read import stream_orders, stream_payments, stream_events
+
+exports_router = APIRouter(prefix="/exports", tags=["Exports"])
+
+# Rows fetched from the server-side cursor per round trip
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+async def _ndjson_lines(batches: AsyncIterator[List[Dict]]) -> AsyncIterator[bytes]:
+    """
+    Formats each batch of rows as newline-delimited JSON.
+    """
+    async for batch in batches:
+        yield b"".join(dumps(row) + b"\n" for row in batch)
+
+
+async def _csv_lines(batches: AsyncIterator[List[Dict]]) -> AsyncIterator[str]:
+    """
+    Formats each batch of rows as CSV, writing the header before the first batch.
+    """
+    writer = None
+    buffer = io.StringIO()
+
+    async for batch in batches:
+        if writer is None:
+            writer = csv.DictWriter(buffer, fieldnames=list(batch[0].keys()))
+            writer.writeheader()
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+
+
+def _export(name: str, stream: Callable, export_format: str) -> StreamingResponse:
+    """
+    Builds a streaming download for one table.
+
+    Args:
+        name (str): Name used for the downloaded file.
+        stream (Callable): Reader from db.CRUD.read yielding batches of rows.
+        export_format (str): 'ndjson' or 'csv'.
+
+    Returns:
+        StreamingResponse: Response that sends each batch as soon as it is fetched.
+    """
+    batches = stream(batch_size=EXPORT_BATCH_SIZE)
+    formatter = _csv_lines if export_format == "csv" else _ndjson_lines
+
+    return StreamingResponse(
+        formatter(batches),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{export_format}"'},
+    )
+
+
+@exports_router.get("/orders")
+async def export_orders(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="'ndjson' or 'csv'"),
+    current_user: dict = Depends(get_current_admin),
+):
+    """
+    Streams every order as NDJSON or CSV.
+
+    Args:
+        format (str): Output format, 'ndjson' or 'csv'.
+        current_user (dict): The authenticated administrator.
+
+    Returns:
+        StreamingResponse: The orders table, read in batches from a server-side cursor.
+    """
+    return _export("orders", stream_orders, format)
+
+
+@exports_router.get("/payments")
+async def export_payments(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="'ndjson' or 'csv'"),
+    current_user: dict = Depends(get_current_admin),
+):
+    """
+    Streams every payment as NDJSON or CSV.
+
+    Args:
+        format (str): Output format, 'ndjson' or 'csv'.
+        current_user (dict): The authenticated administrator.
+
+    Returns:
+        StreamingResponse: The payments table, read in batches from a server-side cursor.
+    """
+    return _export("payments", stream_payments, format)
+
+
+@exports_router.get("/events")
+async def export_events(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="'ndjson' or 'csv'"),
+    current_user: dict = Depends(get_current_admin),
+):
+    """
+    Streams every event as NDJSON or CSV.
+
+    Args:
+        format (str): Output format, 'ndjson' or 'csv'.
+        current_user (dict): The authenticated administrator.
+
+    Returns:
+        StreamingResponse: The events table, read in batches from a server-side cursor.
+    """
+    return _export("events", stream_events, format)
@@ -1,6 +1,9 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
-from db.CRUD.read import get_invoice_by_order_id, get_invoice_pdf
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+from fastapi.responses import FileResponse
+from db.CRUD.create import create_invoice_render_job
+from db.CRUD.read import get_invoice_by_order_id, get_invoice_pdf, get_invoice_render_job
 from utils.utils_token_auth import get_current_user
+from utils.utils_invoice_renderer import invoice_renderer
 
 invoices_router = APIRouter(prefix="/invoices", tags=["Invoices"])
 
@@ -36,20 +39,73 @@ async def download_invoice(
     current_user: dict = Depends(get_current_user),
 ):
     """
-    Retrieves the PDF file path for an invoice.
+    Downloads the rendered PDF of an invoice.
+
+    The file is sent from INVOICE_PDF_DIR, with Range requests supported.
 
     Args:
         invoice_id (int): The invoice ID to download.
         current_user (dict): The authenticated user.
 
     Returns:
-        dict: Path to the invoice PDF.
+        FileResponse: The invoice PDF.
 
     Raises:
-        HTTPException: If the invoice is not found.
+        HTTPException: If the invoice is not found or its PDF was not rendered.
     """
     invoice_pdf = await get_invoice_pdf(invoice_id)
-    if not invoice_pdf:
+    path = invoice_renderer.path(invoice_pdf["pdf_file"]) if invoice_pdf else None
+    if path is None:
         raise HTTPException(status_code=404, detail="Invoice PDF not found")
 
-    return invoice_pdf
+    return FileResponse(path, media_type="application/pdf", filename=invoice_pdf["pdf_file"])
+
+
+@invoices_router.post("/{invoice_id}/render", status_code=status.HTTP_202_ACCEPTED)
+async def render_invoice(invoice_id: int, current_user: dict = Depends(get_current_user)):
+    """
+    Queues the generation of an invoice PDF. The PDF is rendered in the background;
+    poll GET /invoices/render-jobs/{job_id} until its status is 'done' or 'failed'.
+
+    Requests for an invoice whose PDF is already queued or being rendered return
+    that job instead of queuing another one.
+
+    Args:
+        invoice_id (int): The invoice to render.
+        current_user (dict): The authenticated user.
+
+    Returns:
+        dict: The render job, with 'deduplicated' True if it was already queued.
+
+    Raises:
+        HTTPException: If the invoice is not found.
+    """
+    job = await create_invoice_render_job(invoice_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Invoice not found")
+
+    invoice_renderer.wake()
+    return job
+
+
+@invoices_router.get("/render-jobs/{job_id}")
+async def get_render_job(job_id: int, current_user: dict = Depends(get_current_user)):
+    """
+    Returns the status of an invoice PDF render job.
+
+    Args:
+        job_id (int): The job returned by POST /invoices/{invoice_id}/render.
+        current_user (dict): The authenticated user.
+
+    Returns:
+        dict: The job: 'status' ('pending', 'running', 'done' or 'failed'), 'attempts',
+            'error', and the 'pdf_file' once done.
+
+    Raises:
+        HTTPException: If the job is not found.
+    """
+    job = await get_invoice_render_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Render job not found")
+
+    return job
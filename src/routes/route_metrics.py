@@ -0,0 +1,65 @@
+from typing import Iterable, Tuple
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from db.db_sql_connection import get_pool_stats
+from db.db_product_catalog import product_catalog
+from utils.utils_cache import user_cache
+from utils.utils_metrics import registry
+from utils.utils_validation import password_hasher
+
+metrics_router = APIRouter(tags=["Metrics"])
+
+# Content type of the Prometheus text exposition format
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Pool statistics describing the current state; every other statistic only grows
+POOL_GAUGES = {"size", "idle", "in_use", "pool_min", "pool_max", "pool_size", "pool_available", "requests_waiting"}
+
+
+def _metric(prefix: str, key: str, gauges: Iterable[str]) -> Tuple[str, str]:
+    """
+    Returns the name and type of a statistic: counters get the '_total' suffix.
+    """
+    if key in gauges:
+        return f"{prefix}_{key}", "gauge"
+    return f"{prefix}_{key}_total", "counter"
+
+
+def _collect_application_stats():
+    """
+    Exposes the counters kept by the connection pools, the user cache, the product
+    catalog and the password hashing pool at scrape time.
+    """
+    for pool, stats in get_pool_stats().items():
+        for key, value in stats.items():
+            name, kind = _metric("db_pool", key, POOL_GAUGES)
+            yield name, kind, f"Connection pool statistic '{key}'.", {(("pool", pool),): value}
+
+    for key, value in user_cache.stats().items():
+        name, kind = _metric("user_cache", key, ("size",))
+        yield name, kind, f"Authenticated user cache {key}.", {(): value}
+
+    for key, value in product_catalog.stats().items():
+        name, kind = _metric("product_catalog", key, ("size", "listening"))
+        yield name, kind, f"Product catalog {key}.", {(): value}
+
+    yield (
+        "password_hash_rejected_total", "counter",
+        "Password operations rejected because the worker pool queue was full.",
+        {(): password_hasher.rejected},
+    )
+
+
+registry.add_collector(_collect_application_stats)
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Returns every metric in the Prometheus text exposition format.
+
+    Returns:
+        PlainTextResponse: Request and query latency histograms, in-flight requests,
+        connection counters and pool/cache statistics.
+    """
+    return PlainTextResponse(registry.render(), media_type=METRICS_CONTENT_TYPE)
@@ -1,11 +1,13 @@
 from typing import Optional
 from fastapi import APIRouter, HTTPException, status, Depends, Query, Body
-from db.CRUD.create import create_order
+from db.CRUD.create import create_order, create_order_with_items
 from db.CRUD.read import get_order_by_id, get_all_orders
 from db.CRUD.update import update_order
 from db.CRUD.delete import delete_order
 from utils.utils_token_auth import get_current_user
-from db.db_base_classes import Order
+from utils.utils_pagination import DEFAULT_PAGE_SIZE, build_page, clamp_page_size
+from utils.utils_json import FastJSONResponse
+from db.db_base_classes import Order, OrderBatchCreate
 
 orders_router = APIRouter(prefix="/orders", tags=["Orders"])
 
@@ -13,17 +15,21 @@ orders_router = APIRouter(prefix="/orders", tags=["Orders"])
 @orders_router.get("/")
 async def get_orders(
     order_id: Optional[int] = Query(None, description="The order identifier"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, description="Maximum number of orders per page"),
+    after: Optional[int] = Query(None, ge=0, description="Cursor returned as 'next_cursor' by the previous page"),
     current_user: dict = Depends(get_current_user),
 ):
     """
-    Retrieves all orders or a specific order if 'order_id' is provided.
+    Retrieves a page of orders or a specific order if 'order_id' is provided.
 
     Args:
         order_id (Optional[int]): The order identifier (query parameter).
+        limit (int): Maximum number of orders per page, capped at MAX_PAGE_SIZE.
+        after (Optional[int]): Cursor from the previous page's 'next_cursor'.
         current_user (dict): The authenticated user.
 
     Returns:
-        dict or list: Order details if 'order_id' is provided, otherwise a list of all orders.
+        dict: Order details if 'order_id' is provided, otherwise a page with 'items' and 'next_cursor'.
 
     Raises:
         HTTPException: If the order is not found.
@@ -34,7 +40,9 @@ async def get_orders(
             raise HTTPException(status_code=404, detail="Order not found")
         return order
 
-    return await get_all_orders()
+    page_size = clamp_page_size(limit)
+    orders = await get_all_orders(limit=page_size + 1, after=after)
+    return FastJSONResponse(build_page(orders, page_size))
 
 
 @orders_router.post("/")
@@ -65,6 +73,45 @@ async def create_new_order(
         )
 
 
+@orders_router.post("/batch")
+async def create_new_order_batch(
+    order: OrderBatchCreate, current_user: dict = Depends(get_current_user)
+):
+    """
+    Creates an order together with all its items in one transaction.
+
+    Replaces POST /orders/ followed by one POST /order_items/ per item: the
+    products are fetched with one query, prices and the order total are computed
+    from their base prices, and the order and items are inserted at once.
+
+    Args:
+        order (OrderBatchCreate): The order details and its items.
+        current_user (dict): The authenticated user.
+
+    Returns:
+        dict: The created order ID, the item IDs (in request order) and the order total.
+
+    Raises:
+        HTTPException: 404 if a product does not exist, 400 if one is inactive
+            or the order could not be created.
+    """
+    order_data = {
+        "event_id": order.event_id,
+        "order_date": order.order_date,
+        "status": order.status.value,
+    }
+    items = [item.dict() for item in order.items]
+    try:
+        return await create_order_with_items(order_data, items)
+    except HTTPException as http_err:
+        if http_err.status_code != 500:
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Error creating order: {http_err.detail}",
+        )
+
+
 @orders_router.put("/")
 async def modify_order(
     order_id: int = Query(..., description="The order identifier"),
@@ -80,22 +127,13 @@ async def modify_order(
         current_user (dict): The authenticated user.
 
     Returns:
-        dict: Updated order details.
+        dict: The updated order row.
 
     Raises:
-        HTTPException: If the update fails.
+        HTTPException: If the order is not found (404) or the update fails.
     """
-    existing_order = await get_order_by_id(order_id)
-
-    if not existing_order:
-        raise HTTPException(status_code=404, detail="Order not found")
-
-    updated_order = await update_order(order_id, order.dict())
-
-    if not updated_order:
-        raise HTTPException(status_code=500, detail="Order update failed")
-
-    return {"message": "Order updated successfully", "order": updated_order}
+    updated = await update_order(order_id, order.dict())
+    return {"message": "Order updated successfully", "order": updated["order"]}
 
 
 @orders_router.delete("/")
@@ -116,14 +154,5 @@ async def remove_order(
     Raises:
         HTTPException: If the order is not found or deletion fails.
     """
-    existing_order = await get_order_by_id(order_id)
-
-    if not existing_order:
-        raise HTTPException(status_code=404, detail="Order not found")
-
-    deleted = await delete_order(order_id)
-
-    if not deleted:
-        raise HTTPException(status_code=500, detail="Order could not be deleted")
-
+    await delete_order(order_id)
     return {"message": "Order deleted successfully"}
@@ -4,6 +4,8 @@ from db.CRUD.update import update_order_item
 from db.CRUD.delete import delete_order_item
 from utils.utils_token_auth import get_current_user
 from db.db_base_classes import OrderItem, OrderItemCreate
+from utils.utils_pagination import DEFAULT_PAGE_SIZE, build_page, clamp_page_size
+from utils.utils_json import FastJSONResponse
 from fastapi import APIRouter, HTTPException, Depends, Query, Body
 from db.CRUD.read import get_order_item_by_id, get_order_items, get_product_by_id
 
@@ -13,17 +15,21 @@ order_items_router = APIRouter(prefix="/order_items", tags=["Order Items"])
 @order_items_router.get("/")
 async def list_order_items(
     order_item_id: Optional[int] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, description="Maximum number of order items per page"),
+    after: Optional[int] = Query(None, ge=0, description="Cursor returned as 'next_cursor' by the previous page"),
     current_user: dict = Depends(get_current_user),
 ):
     """
-    Get a list of order items or a specific order item by ID.
+    Get a page of order items or a specific order item by ID.
 
     Args:
-        order_item_id (Optional[int]): The ID of the order item to retrieve. If not provided, all order items are returned.
+        order_item_id (Optional[int]): The ID of the order item to retrieve. If not provided, a page of order items is returned.
+        limit (int): Maximum number of order items per page, capped at MAX_PAGE_SIZE.
+        after (Optional[int]): Cursor from the previous page's 'next_cursor'.
         current_user (dict): The current user making the request.
 
     Returns:
-        List[OrderItem]: A list of order items or a single order item if ID is provided.
+        dict: A page with 'items' and 'next_cursor', or a single order item if ID is provided.
 
     HttpException:
         404: If the order item with the specified ID is not found.
@@ -34,7 +40,9 @@ async def list_order_items(
         if not item:
             raise HTTPException(status_code=404, detail="Order item not found")
         return item
-    return await get_order_items()
+    page_size = clamp_page_size(limit)
+    items = await get_order_items(limit=page_size + 1, after=after)
+    return FastJSONResponse(build_page(items, page_size))
 
 
 @order_items_router.post("/")
@@ -5,6 +5,8 @@ from db.CRUD.update import update_product
 from db.CRUD.delete import delete_product
 from db.CRUD.read import get_product_by_id, get_all_products
 from utils.utils_token_auth import get_current_user
+from utils.utils_pagination import DEFAULT_PAGE_SIZE, build_page, clamp_page_size
+from utils.utils_json import FastJSONResponse
 from fastapi import APIRouter, HTTPException, status, Depends, Query, Body
 
 products_router = APIRouter(prefix="/products", tags=["Products"])
@@ -15,17 +17,21 @@ async def get_products(
     product_id: Optional[int] = Query(
         None, description="The unique identifier of the product"
     ),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, description="Maximum number of products per page"),
+    after: Optional[int] = Query(None, ge=0, description="Cursor returned as 'next_cursor' by the previous page"),
     current_user: dict = Depends(get_current_user),
 ):
     """
-    Retrieves a list of all available products or a specific product if 'product_id' is provided.
+    Retrieves a page of available products or a specific product if 'product_id' is provided.
 
     Args:
         product_id (Optional[int]): The unique identifier of the product.
+        limit (int): Maximum number of products per page, capped at MAX_PAGE_SIZE.
+        after (Optional[int]): Cursor from the previous page's 'next_cursor'.
         current_user (dict): The authenticated user.
 
     Returns:
-        dict or list: The product details if 'product_id' is provided, otherwise a list of all products.
+        dict: The product details if 'product_id' is provided, otherwise a page with 'items' and 'next_cursor'.
 
     Raises:
         HTTPException: If the requested product is not found.
@@ -36,7 +42,9 @@ async def get_products(
             raise HTTPException(status_code=404, detail="Product not found")
         return product
 
-    return await get_all_products()
+    page_size = clamp_page_size(limit)
+    products = await get_all_products(limit=page_size + 1, after=after)
+    return FastJSONResponse(build_page(products, page_size))
 
 
 @products_router.post("/")
@@ -84,15 +92,9 @@ async def modify_product(
         dict: Confirmation message with updated product details.
 
     Raises:
-        HTTPException: If the product is not found or the update fails.
+        HTTPException: If the product is not found (404) or the update fails.
     """
-    existing_product = await get_product_by_id(product_id)
-    if not existing_product:
-        raise HTTPException(status_code=404, detail="Product not found")
-
     updated_product = await update_product(product_id, product.dict())
-    if not updated_product:
-        raise HTTPException(status_code=500, detail="Product update failed")
 
     return {"message": "Product updated successfully", "product": updated_product}
 
@@ -115,12 +117,5 @@ async def remove_product(
     Raises:
         HTTPException: If the product is not found or deletion fails.
     """
-    existing_product = await get_product_by_id(product_id)
-    if not existing_product:
-        raise HTTPException(status_code=404, detail="Product not found")
-
-    deleted = await delete_product(product_id)
-    if not deleted:
-        raise HTTPException(status_code=500, detail="Product could not be deleted")
-
+    await delete_product(product_id)
     return {"message": "Product deleted successfully"}
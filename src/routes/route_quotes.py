@@ -0,0 +1,81 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from db.db_base_classes import QuoteScenarios
+from db.CRUD.read import get_all_products, get_event_by_id
+from utils.utils_token_auth import get_current_user
+from utils.utils_json import FastJSONResponse
+from utils.utils_quotes import (
+    QUOTE_MAX_SCENARIOS,
+    build_quote_catalog,
+    estimate_bill_of_materials,
+    estimate_scenarios,
+)
+
+quotes_router = APIRouter(prefix="/quotes", tags=["Quotes"])
+
+
+@quotes_router.get("/estimate")
+async def estimate_event(
+    event_id: Optional[int] = Query(None, description="Event whose guest count and duration are priced"),
+    guest_count: Optional[int] = Query(None, gt=0, description="Guests, instead of the event's"),
+    duration_hours: Optional[int] = Query(None, gt=0, description="Duration in hours, instead of the event's"),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Prices the bill of materials of an event from the active catalog.
+
+    The guest count and duration come from the event; either can be overridden to
+    price a variant of it, or both sent without an event.
+
+    Args:
+        event_id (Optional[int]): The event to price.
+        guest_count (Optional[int]): Guests, instead of the event's.
+        duration_hours (Optional[int]): Duration in hours, instead of the event's.
+        current_user (dict): The authenticated user.
+
+    Returns:
+        dict: 'guest_count', 'duration_hours', 'subtotals' per category,
+            'total_amount' and the priced 'items'.
+
+    Raises:
+        HTTPException: If the event is not found, or neither an event nor both values are sent.
+    """
+    if event_id is not None:
+        event = await get_event_by_id(event_id)
+        if not event:
+            raise HTTPException(status_code=404, detail="Event not found")
+        guest_count = guest_count or event["guest_count"]
+        duration_hours = duration_hours or event["duration_hours"]
+    if guest_count is None or duration_hours is None:
+        raise HTTPException(status_code=400, detail="Send 'event_id' or both 'guest_count' and 'duration_hours'.")
+
+    catalog = build_quote_catalog(await get_all_products())
+    quote = estimate_bill_of_materials(catalog, guest_count, duration_hours)
+    return FastJSONResponse({"event_id": event_id, **quote})
+
+
+@quotes_router.post("/estimate")
+async def estimate_what_if(body: QuoteScenarios, current_user: dict = Depends(get_current_user)):
+    """
+    Prices many guest count / duration combinations against the active catalog at once.
+
+    Args:
+        body (QuoteScenarios): The combinations to price, at most QUOTE_MAX_SCENARIOS.
+        current_user (dict): The authenticated user.
+
+    Returns:
+        list: Per combination, in request order: 'guest_count', 'duration_hours',
+            'subtotals' per category and 'total_amount'.
+
+    Raises:
+        HTTPException: If more than QUOTE_MAX_SCENARIOS combinations are sent.
+    """
+    if len(body.scenarios) > QUOTE_MAX_SCENARIOS:
+        raise HTTPException(status_code=400, detail=f"At most {QUOTE_MAX_SCENARIOS} scenarios per request.")
+
+    catalog = build_quote_catalog(await get_all_products())
+    return FastJSONResponse(estimate_scenarios(
+        catalog,
+        [scenario.guest_count for scenario in body.scenarios],
+        [scenario.duration_hours for scenario in body.scenarios],
+    ))
@@ -0,0 +1,93 @@
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from utils.utils_token_auth import get_current_admin
+from db.db_enums import EventType, OrderStatus, PaymentMethod, PaymentStatus, ProductType
+from db.CRUD.read import get_payments_report, get_product_sales_report, get_revenue_report
+
+reports_router = APIRouter(prefix="/reports", tags=["Reports"])
+
+PERIOD_PATTERN = "^(day|month|year)$"
+
+
+def _value(member: Optional[object]) -> Optional[str]:
+    return member.value if member is not None else None
+
+
+@reports_router.get("/revenue")
+async def revenue_report(
+    period: str = Query("month", pattern=PERIOD_PATTERN, description="'day', 'month' or 'year'"),
+    date_from: Optional[date] = Query(None, description="First order day included"),
+    date_to: Optional[date] = Query(None, description="Last order day included"),
+    event_type: Optional[EventType] = Query(None, description="Only this event type"),
+    status: Optional[OrderStatus] = Query(None, description="Only orders with this status"),
+    current_user: dict = Depends(get_current_admin),
+):
+    """
+    Returns orders and revenue per period, event type and order status.
+
+    Args:
+        period (str): Grouping period, 'day', 'month' or 'year'.
+        date_from (Optional[date]): First order day included.
+        date_to (Optional[date]): Last order day included.
+        event_type (Optional[EventType]): Only this event type.
+        status (Optional[OrderStatus]): Only orders with this status.
+        current_user (dict): The authenticated administrator.
+
+    Returns:
+        list: Rows with 'period', 'event_type', 'status', 'orders' and 'revenue'.
+    """
+    return await get_revenue_report(period, date_from, date_to, _value(event_type), _value(status))
+
+
+@reports_router.get("/products")
+async def product_sales_report(
+    period: str = Query("month", pattern=PERIOD_PATTERN, description="'day', 'month' or 'year'"),
+    date_from: Optional[date] = Query(None, description="First order day included"),
+    date_to: Optional[date] = Query(None, description="Last order day included"),
+    category: Optional[ProductType] = Query(None, description="Only products of this category"),
+    by_product: bool = Query(False, description="Break each category down by product"),
+    current_user: dict = Depends(get_current_admin),
+):
+    """
+    Returns the quantity sold and revenue per period and product category.
+
+    Args:
+        period (str): Grouping period, 'day', 'month' or 'year'.
+        date_from (Optional[date]): First order day included.
+        date_to (Optional[date]): Last order day included.
+        category (Optional[ProductType]): Only products of this category.
+        by_product (bool): Break each category down by product.
+        current_user (dict): The authenticated administrator.
+
+    Returns:
+        list: Rows with 'period', 'category', 'quantity' and 'revenue' (and
+        'product_id' and 'name' with by_product).
+    """
+    return await get_product_sales_report(period, date_from, date_to, _value(category), by_product)
+
+
+@reports_router.get("/payments")
+async def payments_report(
+    period: str = Query("month", pattern=PERIOD_PATTERN, description="'day', 'month' or 'year'"),
+    date_from: Optional[date] = Query(None, description="First payment day included"),
+    date_to: Optional[date] = Query(None, description="Last payment day included"),
+    payment_method: Optional[PaymentMethod] = Query(None, description="Only this payment method"),
+    status: Optional[PaymentStatus] = Query(None, description="Only payments with this status"),
+    current_user: dict = Depends(get_current_admin),
+):
+    """
+    Returns payments and amounts per period, payment method and payment status.
+
+    Args:
+        period (str): Grouping period, 'day', 'month' or 'year'.
+        date_from (Optional[date]): First payment day included.
+        date_to (Optional[date]): Last payment day included.
+        payment_method (Optional[PaymentMethod]): Only this payment method.
+        status (Optional[PaymentStatus]): Only payments with this status.
+        current_user (dict): The authenticated administrator.
+
+    Returns:
+        list: Rows with 'period', 'payment_method', 'status', 'payments' and 'amount'.
+    """
+    return await get_payments_report(period, date_from, date_to, _value(payment_method), _value(status))
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, Request, Response, status, Depends
+from fastapi.responses import FileResponse
 from db.CRUD.read import get_contract_by_event_id, get_contract_pdf
 from db.CRUD.create import create_contract
 from db.db_base_classes import Contract
+from utils.utils_contract_renderer import contract_renderer, render_contract
 from utils.utils_token_auth import get_current_user
 
 contracts_router = APIRouter(prefix="/contracts", tags=["Contracts"])
@@ -12,14 +14,19 @@ async def create_new_contract(
     contract: Contract, current_user: dict = Depends(get_current_user)
 ):
     """
-    Creates a new contract.
+    Creates a new contract. Without a pdf_file, its PDF is rendered from the
+    event and customer data.
+
+    The contract is saved before rendering: if the render fails it is still
+    returned, with a null pdf_file, and POST /contracts/{contract_id}/render
+    renders it later.
 
     Args:
         contract (Contract): The contract details.
         current_user (dict): The authenticated user.
 
     Returns:
-        dict: Success message and contract ID.
+        dict: Success message, contract ID and, when rendered, the PDF file.
 
     Raises:
         HTTPException: If the contract creation fails.
@@ -27,13 +34,21 @@ async def create_new_contract(
     try:
         contract_data = contract.dict()
         new_contract = await create_contract(contract_data)
-        return new_contract
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Error creating contract: {str(exc)}",
         )
 
+    if contract_data["pdf_file"] is None:
+        try:
+            rendered = await render_contract(new_contract["contract_id"])
+            new_contract = {**new_contract, "pdf_file": rendered["pdf_file"]}
+        except Exception as e:
+            print(f"Error rendering contract {new_contract['contract_id']}: {str(e)}")
+            new_contract = {**new_contract, "pdf_file": None}
+    return new_contract
+
 
 @contracts_router.get("/")
 async def get_contract(
@@ -60,26 +75,76 @@ async def get_contract(
     return contract
 
 
+@contracts_router.post("/{contract_id}/render")
+async def render_contract_pdf(
+    contract_id: int,
+    force: bool = False,
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Renders the PDF of a contract from the current event and customer data.
+
+    Rendering unchanged data again returns the stored PDF without rendering it.
+
+    Args:
+        contract_id (int): The contract ID.
+        force (bool): Render even if the data did not change.
+        current_user (dict): The authenticated user.
+
+    Returns:
+        dict: The contract ID, the PDF file and whether it came from the cache.
+
+    Raises:
+        HTTPException: If the contract is not found, or its PDF was sent as a file path.
+    """
+    try:
+        rendered = await render_contract(contract_id, force)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
+    if not rendered:
+        raise HTTPException(status_code=404, detail="Contract not found")
+
+    return rendered
+
+
 @contracts_router.get("/download/")
 async def download_contract(
     contract_id: int,
+    request: Request,
     current_user: dict = Depends(get_current_user),
 ):
     """
-    Retrieves the PDF file path for a contract.
+    Downloads the rendered PDF of a contract.
+
+    The file is sent by the server straight from disk, with Range requests
+    (resumable downloads) supported. Its ETag is the content hash, so a client
+    holding the current version gets a 304 through If-None-Match. Nothing is
+    rendered here: POST /contracts/{contract_id}/render updates the PDF.
 
     Args:
         contract_id (int): The contract ID to download.
+        request (Request): The incoming request.
         current_user (dict): The authenticated user.
 
     Returns:
-        dict: Path to the contract PDF.
+        FileResponse: The contract PDF.
 
     Raises:
-        HTTPException: If the contract is not found.
+        HTTPException: If the contract is not found, or has no PDF in the store.
     """
     contract_pdf = await get_contract_pdf(contract_id)
-    if not contract_pdf:
+    if not contract_pdf or not contract_renderer.store.exists(contract_pdf["pdf_file"]):
         raise HTTPException(status_code=404, detail="Contract PDF not found")
 
-    return contract_pdf
+    pdf_file = contract_pdf["pdf_file"]
+    headers = {"etag": f'"{pdf_file.split(".")[0]}"', "cache-control": "private, no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if headers["etag"] in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return FileResponse(
+        contract_renderer.store.path(pdf_file),
+        media_type="application/pdf",
+        filename=f"contrato_{contract_id:06d}.pdf",
+        headers=headers,
+    )
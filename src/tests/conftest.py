@@ -0,0 +1,12 @@
+import pytest
+from db.db_sql_connection import close_async_pool
+
+
+@pytest.fixture(autouse=True)
+async def close_connection_pool():
+    """
+    Closes the connection pool opened on the test's event loop, so none of its
+    tasks is still connecting when the loop is closed.
+    """
+    yield
+    await close_async_pool()
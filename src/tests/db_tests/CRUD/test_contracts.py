@@ -3,6 +3,7 @@ from faker import Faker
 from src.db.CRUD.create import create_customer, create_event, create_contract
 from src.db.CRUD.read import get_contract_by_event_id, get_contract_pdf
 from src.db.CRUD.delete import delete_event, delete_customer
+from src.utils.utils_contract_renderer import CONTRACT_TEMPLATE_DIR, ContractRenderer
 from src.tests.utils.utils import generate_random_email, generate_cpf, generate_password
 
 fake = Faker()
@@ -90,6 +91,41 @@ async def test_get_contract_pdf():
     assert pdf_data["pdf_file"] == CONTRACT_FILE_NAME
 
 
+@pytest.mark.asyncio
+async def test_render_contract(tmp_path):
+    """Test rendering a contract on a worker process, then again from the cache"""
+    renderer = ContractRenderer(
+        store_dir=str(tmp_path / "store"), template_dir=CONTRACT_TEMPLATE_DIR,
+        cache_dir=str(tmp_path / "templates"), workers=1,
+    )
+    try:
+        await renderer.start()
+        # a PDF sent as a file path is never replaced
+        with pytest.raises(ValueError):
+            await renderer.render(CONTRACT_ID)
+        assert (await get_contract_pdf(CONTRACT_ID))["pdf_file"] == CONTRACT_FILE_NAME
+
+        contract_id = (await create_contract({"event_id": EVENT_ID}))["contract_id"]
+        assert (await get_contract_pdf(contract_id))["pdf_file"] is None
+        rendered = await renderer.render(contract_id)
+        assert rendered["cached"] is False
+        pdf_file = rendered["pdf_file"]
+        assert (await get_contract_pdf(contract_id))["pdf_file"] == pdf_file
+
+        pdf = open(renderer.store.path(pdf_file), "rb").read()
+        assert pdf.startswith(b"%PDF-1.4") and b"Praia do Futuro" in pdf
+
+        # unchanged data: served from the cache; forced: rendered to the same object
+        assert await renderer.render(contract_id) == {"contract_id": contract_id, "pdf_file": pdf_file, "cached": True}
+        assert (await renderer.render(contract_id, force=True))["pdf_file"] == pdf_file
+        assert renderer.rendered == 2 and renderer.cache_hits == 1
+        assert len(list((tmp_path / "store" / "objects").rglob("*.pdf"))) == 1
+    finally:
+        await renderer.stop()
+
+    assert await renderer.render(999999) is None
+
+
 @pytest.mark.asyncio
 async def test_cleanup_contract_event_and_customer():
     """Cleanup test by removing event and customer (contract removed via cascade)"""
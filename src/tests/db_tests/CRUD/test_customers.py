@@ -1,13 +1,24 @@
+import asyncio
+import psycopg
 import pytest
 from faker import Faker
-from src.db.CRUD.create import create_customer
+from src.db.CRUD.create import bulk_create_customers, create_customer
 from src.db.CRUD.update import update_customer
 from src.db.CRUD.delete import delete_customer
+from utils.utils_cache import user_cache, user_cache_listener
+from db.db_sql_connection import get_conninfo
 from src.tests.utils.utils import generate_random_email, generate_cpf, generate_cnpj, generate_password
 from src.db.CRUD.read import (
     get_customer_by_id,
     get_all_customers,
     get_customer_by_email,
+    get_customer_overview,
+    get_events_by_customer_id,
+    get_orders_by_customer_id,
+    get_order_items_by_customer_id,
+    get_payments_by_customer_id,
+    get_invoices_by_customer_id,
+    get_contracts_by_customer_id,
 )
 
 fake = Faker()
@@ -110,8 +121,14 @@ async def test_update_customer():
         "role": fake.random_element(elements=["customer", "admin"]),
     }
 
+    # cache the customer as get_current_user would
+    user_cache.set(CUSTOMER_TEST_DATA_LOGGED["email"], CUSTOMER_TEST_DATA_LOGGED)
+
     message = await update_customer(CUSTOMER_TEST_DATA_LOGGED["id"], new_data)
 
+    # check if the cached customer was invalidated
+    assert user_cache.get(CUSTOMER_TEST_DATA_LOGGED["email"]) is None
+
     # check if the message was returned correctly
     assert message is not None
     assert message["message"] == "Customer successfully updated!"
@@ -127,6 +144,31 @@ async def test_update_customer():
     assert message["customer"][6] == new_data["role"]
 
 
+@pytest.mark.asyncio
+async def test_user_cache_follows_other_workers():
+    """Test that a customer changed outside this process is dropped from the user cache"""
+
+    await user_cache_listener.start(timeout=5)
+    try:
+        assert user_cache_listener.listening
+        user_cache.set("changed@example.com", CUSTOMER_TEST_DATA_LOGGED)
+        user_cache.set("unchanged@example.com", {"id": -1})
+
+        # a write from another worker arrives through the trigger notification
+        async with await psycopg.AsyncConnection.connect(get_conninfo()) as conn:
+            await conn.execute("UPDATE customers SET phone = phone WHERE id = %s;", (CUSTOMER_TEST_DATA_LOGGED["id"],))
+        for _ in range(50):
+            if user_cache.get("changed@example.com") is None:
+                break
+            await asyncio.sleep(0.05)
+
+        assert user_cache.get("changed@example.com") is None
+        assert user_cache.get("unchanged@example.com") == {"id": -1}
+    finally:
+        await user_cache_listener.stop()
+        user_cache.invalidate("unchanged@example.com")
+
+
 @pytest.mark.asyncio
 async def test_delete_customer():
     """Test deleting a customer"""
@@ -140,3 +182,87 @@ async def test_delete_customer():
     # check if the customer was deleted
     customer = await get_customer_by_id(CUSTOMER_TEST_DATA_LOGGED["id"])
     assert customer is None
+
+
+@pytest.mark.asyncio
+async def test_get_customer_overview():
+    """Test that the overview nests the same rows returned by the per-collection readers"""
+
+    customer_id = 1001
+    overview = await get_customer_overview(customer_id)
+    assert len(overview) > 0
+
+    orders = [order for event in overview for order in event["orders"]]
+    nested = {
+        "events": overview,
+        "orders": orders,
+        "contracts": [contract for event in overview for contract in event["contracts"]],
+        "order_items": [item for order in orders for item in order["order_items"]],
+        "payments": [payment for order in orders for payment in order["payments"]],
+        "invoices": [invoice for order in orders for invoice in order["invoices"]],
+    }
+    separate = {
+        "events": await get_events_by_customer_id(customer_id),
+        "orders": await get_orders_by_customer_id(customer_id),
+        "contracts": await get_contracts_by_customer_id(customer_id),
+        "order_items": await get_order_items_by_customer_id(customer_id),
+        "payments": await get_payments_by_customer_id(customer_id),
+        "invoices": await get_invoices_by_customer_id(customer_id),
+    }
+
+    for name, rows in separate.items():
+        assert sorted(row["id"] for row in nested[name]) == sorted(row["id"] for row in rows), name
+
+    # a customer without events gets an empty list
+    assert await get_customer_overview(999999) == []
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_customers_skips_duplicates():
+    """Test loading customers in bulk, reporting duplicate emails and documents"""
+    first = {**CUSTOMER_TEST_DATA, "email": generate_random_email(), "cpf_cnpj": generate_cpf(), "role": "customer"}
+    second = {**first, "email": generate_random_email(), "cpf_cnpj": generate_cnpj()}
+    same_email = {**first, "cpf_cnpj": generate_cpf()}
+    existing = {**first, "email": "ana@example.com", "cpf_cnpj": generate_cpf()}
+
+    async def batches():
+        yield [(2, first), (3, second), (4, same_email), (5, existing)]
+
+    result = await bulk_create_customers(batches())
+    try:
+        assert result["created"] == 2
+        assert result["duplicate_lines"] == [4, 5]
+        created = [await get_customer_by_id(customer_id) for customer_id in result["ids"]]
+        assert [customer["email"] for customer in created] == [first["email"], second["email"]]
+    finally:
+        for customer_id in result["ids"]:
+            await delete_customer(customer_id)
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_customers_reports_concurrent_inserts():
+    """Test that a row registered by a concurrent transaction is reported, not silently dropped"""
+    racing = {**CUSTOMER_TEST_DATA, "email": generate_random_email(), "cpf_cnpj": generate_cpf(), "role": "customer"}
+    other = {**racing, "email": generate_random_email(), "cpf_cnpj": generate_cnpj()}
+
+    async def batches():
+        yield [(2, racing), (3, other)]
+
+    # the concurrent registration is not committed yet when the duplicate check runs
+    async with await psycopg.AsyncConnection.connect(get_conninfo()) as conn:
+        cursor = await conn.execute(
+            "INSERT INTO customers (full_name, email, cpf_cnpj, password_hash) VALUES (%s, %s, %s, 'x') RETURNING id;",
+            (racing["full_name"], racing["email"], generate_cpf()),
+        )
+        racing_id = (await cursor.fetchone())[0]
+        task = asyncio.create_task(bulk_create_customers(batches()))
+        await asyncio.sleep(0.5)
+        await conn.commit()
+    result = await task
+    try:
+        assert result["created"] == 1
+        assert result["duplicate_lines"] == [2]
+    finally:
+        for customer_id in result["ids"]:
+            await delete_customer(customer_id)
+        await delete_customer(racing_id)
@@ -1,13 +1,17 @@
+import uuid
 import pytest
+from fastapi import HTTPException
 from datetime import datetime
 from src.db.CRUD.create import create_event
-from src.db.CRUD.read import get_event_by_id
+from src.db.CRUD.read import get_event_by_id, get_events_calendar, get_location_bookings
 from src.db.CRUD.update import update_event
 from src.db.CRUD.delete import delete_event
 
 EXISTING_EVENT_ID = 2005
 INVALID_EVENT_ID = 999999
 CREATED_EVENT_ID = None
+# bookings left behind by an interrupted run must not collide with this one
+RUN_ID = uuid.uuid4().hex[:8]
 
 BASE_EVENT_DATA = {
     "customer_id": 1005,
@@ -29,7 +33,7 @@ async def test_create_event_success():
         "customer_id": 1001,
         "event_type": "debutante",
         "event_date": "2025-12-25T20:00:00",
-        "location": "Espaço Tropical",
+        "location": f"Espaço Tropical {RUN_ID}",
         "guest_count": 100,
         "duration_hours": 4,
         "budget_approved": True,
@@ -107,6 +111,8 @@ async def test_update_event_success():
 
     result = await update_event(EXISTING_EVENT_ID, updated_data)
     assert result["message"] == "Event successfully updated!"
+    assert result["event"]["id"] == EXISTING_EVENT_ID
+    assert result["event"]["location"] == updated_data["location"]
 
     event = await get_event_by_id(EXISTING_EVENT_ID)
     assert event["event_type"] == updated_data["event_type"]
@@ -119,7 +125,7 @@ async def test_update_event_success():
 @pytest.mark.asyncio
 async def test_update_event_failure():
     """Test updating a non-existing event"""
-    with pytest.raises(Exception):
+    with pytest.raises(HTTPException) as missing:
         await update_event(INVALID_EVENT_ID, {
             "event_type": "other",
             "event_date": "2025-12-01T20:00:00",
@@ -128,6 +134,7 @@ async def test_update_event_failure():
             "duration_hours": 2,
             "budget_approved": False,
         })
+    assert missing.value.status_code == 404
 
 
 @pytest.mark.asyncio
@@ -146,5 +153,74 @@ async def test_delete_event_success():
 @pytest.mark.asyncio
 async def test_delete_event_failure():
     """Test deleting a non-existing event"""
-    result = await delete_event(INVALID_EVENT_ID)
-    assert result is False
+    with pytest.raises(HTTPException) as missing:
+        await delete_event(INVALID_EVENT_ID)
+    assert missing.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_events_calendar():
+    """Test the date range, location filter, compact mode and cursor of the event calendar"""
+    location = f"Calendar Test Hall {RUN_ID}"
+    created = []
+    for event_date, event_type, place in [
+        ("2031-02-03T18:00:00", "wedding", location),
+        ("2031-02-01T10:00:00", "corporate", location),
+        ("2031-02-02T12:00:00", "wedding", f"Other Hall {RUN_ID}"),
+        ("2031-03-01T09:00:00", "wedding", location),
+    ]:
+        result = await create_event({**BASE_EVENT_DATA, "event_date": event_date, "event_type": event_type, "location": place})
+        created.append(result["event_id"])
+
+    try:
+        february = (datetime(2031, 2, 1), datetime(2031, 3, 1))
+        events = await get_events_calendar(*february)
+        assert [e["id"] for e in events if e["id"] in created] == [created[1], created[2], created[0]]
+
+        at_location = await get_events_calendar(*february, location=location)
+        assert [e["id"] for e in at_location] == [created[1], created[0]]
+
+        weddings = await get_events_calendar(*february, location=location, event_type="wedding")
+        assert [e["id"] for e in weddings] == [created[0]]
+
+        compact = await get_events_calendar(*february, compact=True)
+        assert set(compact[0]) == {"id", "event_date", "location", "guest_count"}
+
+        first_page = await get_events_calendar(*february, limit=2)
+        last = first_page[-1]
+        next_page = await get_events_calendar(*february, after=(last["event_date"], last["id"]))
+        assert [e["id"] for e in first_page + next_page] == [e["id"] for e in events]
+    finally:
+        for event_id in created:
+            await delete_event(event_id)
+
+
+@pytest.mark.asyncio
+async def test_event_overlap_rejected():
+    """Test that overlapping bookings of a location are rejected with 409"""
+    location = f"Overlap Test Hall {RUN_ID}"
+    booking = {**BASE_EVENT_DATA, "location": location, "event_date": "2032-05-01T10:00:00", "duration_hours": 5}
+    first = await create_event(booking)
+    created = [first["event_id"]]
+    try:
+        with pytest.raises(HTTPException) as conflict:
+            await create_event({**booking, "event_date": "2032-05-01T12:00:00"})
+        assert conflict.value.status_code == 409
+        assert [c["id"] for c in conflict.value.detail["conflicts"]] == [first["event_id"]]
+
+        # the period is half-open: an event may start when the previous one ends
+        second = await create_event({**booking, "event_date": "2032-05-01T15:00:00"})
+        created.append(second["event_id"])
+
+        with pytest.raises(HTTPException) as moved:
+            await update_event(second["event_id"], {**booking, "event_date": "2032-05-01T14:00:00"})
+        assert moved.value.status_code == 409
+
+        bookings = await get_location_bookings(location, datetime(2032, 5, 1), datetime(2032, 5, 2))
+        assert [(b["id"], b["start"].hour, b["end"].hour) for b in bookings] == [
+            (first["event_id"], 10, 15),
+            (second["event_id"], 15, 20),
+        ]
+    finally:
+        for event_id in created:
+            await delete_event(event_id)
@@ -1,5 +1,9 @@
+import asyncio
 import pytest
-from src.db.CRUD.read import get_invoice_by_order_id, get_invoice_pdf
+from src.db.CRUD.create import create_invoice_render_job
+from src.db.CRUD.read import get_invoice_by_order_id, get_invoice_pdf, get_invoice_render_job
+from src.utils.utils_invoice_renderer import InvoiceRenderer
+from db.db_sql_connection import async_connect
 
 
 @pytest.mark.asyncio
@@ -29,7 +33,7 @@ async def test_get_invoice_pdf_success():
     invoice_id = 7001
     pdf_data = await get_invoice_pdf(invoice_id)
     assert pdf_data is not None
-    assert pdf_data["pdf_file"] == "nf_001.pdf"
+    assert pdf_data["pdf_file"] == "7001-nf_001.pdf"
 
 
 @pytest.mark.asyncio
@@ -39,3 +43,46 @@ async def test_get_invoice_pdf_not_found():
     invoice_id = 999999
     pdf_data = await get_invoice_pdf(invoice_id)
     assert pdf_data is None
+
+
+@pytest.mark.asyncio
+async def test_render_invoice_pdf(tmp_path):
+    """
+    Test that concurrent render requests share one job, rendered on a worker process."""
+    invoice_id = 7001
+    jobs = await asyncio.gather(create_invoice_render_job(invoice_id), create_invoice_render_job(invoice_id))
+    assert jobs[0]["id"] == jobs[1]["id"]
+    assert sorted(job["deduplicated"] for job in jobs) == [False, True]
+    assert jobs[0]["status"] == "pending"
+
+    renderer = InvoiceRenderer(
+        directory=str(tmp_path), workers=1, batch_size=10, poll_seconds=1, stale_seconds=300, max_attempts=3
+    )
+    try:
+        assert await renderer.run_pending() >= 1
+    finally:
+        await renderer.stop()
+
+    job = await get_invoice_render_job(jobs[0]["id"])
+    assert job["status"] == "done"
+    assert job["attempts"] == 1
+    assert job["pdf_file"] == "7001-nf_001.pdf"
+    assert renderer.path("7001-nf_001.pdf") == str(tmp_path / "7001-nf_001.pdf")
+    assert renderer.path("../7001-nf_001.pdf") is None and renderer.path("missing.pdf") is None
+    pdf = (tmp_path / "7001-nf_001.pdf").read_bytes()
+    assert pdf.startswith(b"%PDF-1.4") and pdf.rstrip().endswith(b"%%EOF")
+    assert (await get_invoice_pdf(invoice_id))["pdf_file"] == "7001-nf_001.pdf"
+
+    # once done, a new request queues a new job
+    again = await create_invoice_render_job(invoice_id)
+    assert again["id"] != job["id"] and again["deduplicated"] is False
+    async with async_connect() as conn:
+        await conn.execute("DELETE FROM invoice_render_jobs WHERE invoice_id = %s;", (invoice_id,))
+        await conn.commit()
+
+
+@pytest.mark.asyncio
+async def test_render_invoice_pdf_not_found():
+    """
+    Test queuing the PDF of a non-existent invoice."""
+    assert await create_invoice_render_job(999999) is None
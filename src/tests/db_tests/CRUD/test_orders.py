@@ -1,10 +1,13 @@
 import pytest
+from fastapi import HTTPException
 from faker import Faker
 from datetime import datetime
-from src.db.CRUD.create import create_order
-from src.db.CRUD.read import get_order_by_id, get_all_orders
-from src.db.CRUD.update import update_order
+from src.db.CRUD.create import create_order, create_order_with_items
+from src.db.CRUD.read import get_order_by_id, get_all_orders, get_order_item_by_id, stream_orders
+from src.db.CRUD.update import recompute_order_totals, update_order
 from src.db.CRUD.delete import delete_order
+from utils.utils_metrics import db_query_duration_seconds
+from db.db_sql_connection import async_connect
 
 fake = Faker()
 
@@ -50,6 +53,36 @@ async def test_get_all_orders():
     assert order is not None
 
 
+@pytest.mark.asyncio
+async def test_get_all_orders_paginated():
+    """Test fetching orders page by page with a keyset cursor"""
+    first_page = await get_all_orders(limit=2)
+    assert len(first_page) <= 2
+    assert [o["id"] for o in first_page] == sorted(o["id"] for o in first_page)
+
+    second_page = await get_all_orders(limit=2, after=first_page[-1]["id"])
+    assert all(o["id"] > first_page[-1]["id"] for o in second_page)
+
+
+@pytest.mark.asyncio
+async def test_get_all_orders_records_query_metric():
+    """Test that statements are timed under the name of the CRUD function"""
+    before = db_query_duration_seconds.count(("get_all_orders",))
+    await get_all_orders(limit=1)
+    assert db_query_duration_seconds.count(("get_all_orders",)) == before + 1
+
+
+@pytest.mark.asyncio
+async def test_stream_orders():
+    """Test streaming orders in batches from a server-side cursor"""
+    streamed = []
+    async for batch in stream_orders(batch_size=2):
+        assert len(batch) <= 2
+        streamed.extend(batch)
+
+    assert [o["id"] for o in streamed] == [o["id"] for o in await get_all_orders()]
+
+
 @pytest.mark.asyncio
 async def test_update_order():
     """Test updating an order"""
@@ -62,13 +95,77 @@ async def test_update_order():
 
     result = await update_order(ORDER_ID_LOGGED, new_data)
     assert result["message"] == "Order successfully updated!"
+    assert result["order"]["id"] == ORDER_ID_LOGGED
+    assert result["order"]["status"] == "paid"
 
 
 @pytest.mark.asyncio
 async def test_delete_order():
     """Test deleting an order"""
     result = await delete_order(ORDER_ID_LOGGED)
-    assert result["message"] == "Order successfully deleted!"
+    assert result is True
 
     order = await get_order_by_id(ORDER_ID_LOGGED)
     assert order is None
+
+
+@pytest.mark.asyncio
+async def test_create_order_with_items():
+    """Test creating an order and its items in one transaction"""
+    order_data = {"event_id": 2001, "order_date": datetime.now().isoformat(), "status": "pending"}
+    items = [
+        {"product_id": 4002, "quantity": 2},
+        {"product_id": 4001, "quantity": 3},
+        {"product_id": 4002, "quantity": 1},
+    ]
+
+    result = await create_order_with_items(order_data, items)
+    try:
+        assert len(result["order_item_ids"]) == 3
+        order = await get_order_by_id(result["order_id"])
+        assert float(order["total_amount"]) == 3075.00 == float(result["total_amount"])
+
+        created = [await get_order_item_by_id(item_id) for item_id in result["order_item_ids"]]
+        assert [(item["product_id"], item["quantity"]) for item in created] == [(4002, 2), (4001, 3), (4002, 1)]
+        assert [float(item["total_price"]) for item in created] == [2000.00, 75.00, 1000.00]
+        assert all(item["order_id"] == result["order_id"] for item in created)
+    finally:
+        await delete_order(result["order_id"])
+
+    with pytest.raises(HTTPException) as missing:
+        await create_order_with_items(order_data, [{"product_id": 4001, "quantity": 1}, {"product_id": -1, "quantity": 1}])
+    assert missing.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_missing_order():
+    """Test that a missing order is reported by the update/delete call itself"""
+    with pytest.raises(HTTPException) as missing:
+        await update_order(-1, {**ORDER_TEST_DATA})
+    assert missing.value.status_code == 404
+
+    with pytest.raises(HTTPException) as missing:
+        await delete_order(-1)
+    assert missing.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_recompute_order_totals():
+    """Test that the recompute job resets a drifted total to the sum of the items"""
+    order_data = {"event_id": 2001, "order_date": datetime.now().isoformat(), "status": "pending"}
+    result = await create_order_with_items(order_data, [{"product_id": 4001, "quantity": 4}])
+    try:
+        async with async_connect() as conn:
+            await conn.execute("UPDATE orders SET total_amount = 1 WHERE id = %s;", (result["order_id"],))
+            await conn.commit()
+
+        recomputed = await recompute_order_totals()
+        assert result["order_id"] in recomputed["order_ids"]
+        assert recomputed["fixed"] == len(recomputed["order_ids"])
+
+        order = await get_order_by_id(result["order_id"])
+        assert float(order["total_amount"]) == 100.00
+
+        assert result["order_id"] not in (await recompute_order_totals())["order_ids"]
+    finally:
+        await delete_order(result["order_id"])
@@ -4,7 +4,7 @@ from datetime import datetime
 from src.db.CRUD.create import create_order, create_order_item
 from src.db.CRUD.update import update_order_item
 from src.db.CRUD.delete import delete_order_item
-from src.db.CRUD.read import get_order_item_by_id, get_order_items, get_product_by_id
+from src.db.CRUD.read import get_order_by_id, get_order_item_by_id, get_order_items, get_product_by_id
 
 
 fake = Faker()
@@ -53,6 +53,10 @@ async def test_create_order_item():
 
     ORDER_ITEM_ID_LOGGED = result["order_item_id"]
 
+    # the order total is the sum of its items, whatever the order was created with
+    order = await get_order_by_id(ORDER_ID_LOGGED)
+    assert float(order["total_amount"]) == total_price
+
 
 @pytest.mark.asyncio
 async def test_get_order_item_by_id():
@@ -84,6 +88,9 @@ async def test_update_order_item():
     assert result is not None
     assert result["quantity"] == 3
 
+    order = await get_order_by_id(ORDER_ID_LOGGED)
+    assert float(order["total_amount"]) == 299.97
+
 
 @pytest.mark.asyncio
 async def test_delete_order_item():
@@ -92,3 +99,6 @@ async def test_delete_order_item():
 
     item = await get_order_item_by_id(ORDER_ITEM_ID_LOGGED)
     assert item is None
+
+    order = await get_order_by_id(ORDER_ID_LOGGED)
+    assert float(order["total_amount"]) == 0
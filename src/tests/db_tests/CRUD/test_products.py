@@ -1,6 +1,13 @@
+import asyncio
 import pytest
+from fastapi import HTTPException
+import psycopg
 from faker import Faker
-from src.db.CRUD.create import create_product
+from db.db_notifications import notification_listen_port
+from db.db_product_catalog import ProductCatalog, product_catalog
+from db.db_sql_connection import get_conninfo
+from utils.utils_metrics import db_query_duration_seconds
+from src.db.CRUD.create import bulk_create_products, create_product
 from src.db.CRUD.read import get_product_by_id, get_all_products
 from src.db.CRUD.update import update_product
 from src.db.CRUD.delete import delete_product
@@ -83,3 +90,88 @@ async def test_delete_product():
     # Check if product no longer exists
     product = await get_product_by_id(PRODUCT_ID_LOGGED)
     assert product is None
+
+
+@pytest.mark.asyncio
+async def test_product_catalog_follows_notifications():
+    """Test serving products from memory and invalidating them on NOTIFY"""
+    await product_catalog.start()
+    try:
+        assert product_catalog.is_live()
+
+        created = await create_product(dict(PRODUCT_TEST_DATA))
+        # local invalidation: visible at once in this worker
+        product = await get_product_by_id(created["id"])
+        assert product["name"] == PRODUCT_TEST_DATA["name"]
+
+        queries = db_query_duration_seconds.count(("get_product_by_id",))
+        for _ in range(5):
+            assert (await get_product_by_id(created["id"]))["id"] == created["id"]
+        assert db_query_duration_seconds.count(("get_product_by_id",)) == queries
+
+        page = await get_all_products(limit=1, after=created["id"] - 1)
+        assert [p["id"] for p in page] == [created["id"]]
+
+        # a write from another worker arrives through the trigger notification
+        notifications = product_catalog.stats()["notifications"]
+        async with await psycopg.AsyncConnection.connect(get_conninfo()) as conn:
+            await conn.execute("UPDATE products SET name = 'Renamed' WHERE id = %s;", (created["id"],))
+        for _ in range(50):
+            if product_catalog.stats()["notifications"] > notifications:
+                break
+            await asyncio.sleep(0.05)
+        assert (await get_product_by_id(created["id"]))["name"] == "Renamed"
+
+        assert await delete_product(created["id"]) is True
+        assert await get_product_by_id(created["id"]) is None
+    finally:
+        await product_catalog.stop()
+
+    # without the listener reads go back to the database
+    assert not product_catalog.is_live()
+
+
+@pytest.mark.asyncio
+async def test_product_catalog_off_behind_transaction_pooler():
+    """Test that the catalog needs a session-mode port to receive notifications"""
+    assert notification_listen_port("", port="5432") == "5432"
+    assert notification_listen_port("", port="6543") is None
+    assert notification_listen_port("5432", port="6543") == "5432"
+
+    catalog = ProductCatalog(channel="products_changed", retry_seconds=1, listen_port=None)
+    await catalog.start(timeout=1)
+    try:
+        assert not catalog.is_live()
+        assert catalog.stats()["listening"] == 0
+    finally:
+        await catalog.stop()
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_products():
+    """Test loading products through COPY and a set-based insert"""
+
+    async def batches():
+        yield [(2, {**PRODUCT_TEST_DATA, "name": "Bulk A"}), (3, {**PRODUCT_TEST_DATA, "name": "Bulk B"})]
+        yield [(5, {**PRODUCT_TEST_DATA, "name": "Bulk C", "description": None})]
+
+    result = await bulk_create_products(batches())
+    try:
+        assert result["created"] == 3
+        names = [(await get_product_by_id(product_id))["name"] for product_id in result["ids"]]
+        assert names == ["Bulk A", "Bulk B", "Bulk C"]
+    finally:
+        for product_id in result["ids"]:
+            await delete_product(product_id)
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_missing_product():
+    """Test that a missing product is reported as 404 by the update and delete calls themselves"""
+    with pytest.raises(HTTPException) as missing:
+        await update_product(-1, dict(PRODUCT_TEST_DATA))
+    assert missing.value.status_code == 404
+
+    with pytest.raises(HTTPException) as missing:
+        await delete_product(-1)
+    assert missing.value.status_code == 404
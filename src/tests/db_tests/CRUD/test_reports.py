@@ -0,0 +1,65 @@
+import pytest
+from datetime import date
+from src.db.CRUD.create import create_order_with_items, create_payment
+from src.db.CRUD.read import get_payments_report, get_product_sales_report, get_revenue_report
+from src.db.CRUD.update import update_order
+from src.db.CRUD.delete import delete_order
+
+# A day without other activity, so the rollups only reflect this test
+REPORT_DAY = date(2001, 3, 15)
+REPORT_DATE = "2001-03-15T10:00:00"
+
+
+async def _revenue():
+    rows = await get_revenue_report("day", REPORT_DAY, REPORT_DAY, event_type="wedding")
+    return {row["status"]: (row["orders"], float(row["revenue"])) for row in rows}
+
+
+async def _product_sales():
+    rows = await get_product_sales_report("month", REPORT_DAY, REPORT_DAY, by_product=True)
+    return {row["product_id"]: (row["quantity"], float(row["revenue"])) for row in rows}
+
+
+async def _payments():
+    rows = await get_payments_report("year", REPORT_DAY, REPORT_DAY, payment_method="pix")
+    return {row["status"]: (row["payments"], float(row["amount"])) for row in rows}
+
+
+@pytest.mark.asyncio
+async def test_reports_follow_order_changes():
+    """Test that the report rollups are updated by creating, updating and deleting an order"""
+    assert await _revenue() == {}
+    assert await _product_sales() == {}
+    assert await _payments() == {}
+
+    order_data = {"event_id": 2001, "order_date": REPORT_DATE, "status": "pending"}
+    result = await create_order_with_items(order_data, [
+        {"product_id": 4001, "quantity": 3},
+        {"product_id": 4002, "quantity": 1},
+    ])
+    try:
+        assert await _revenue() == {"pending": (1, 1075.00)}
+        assert await _product_sales() == {4001: (3, 75.00), 4002: (1, 1000.00)}
+
+        await create_payment({
+            "order_id": result["order_id"],
+            "amount": "1075.00",
+            "payment_method": "pix",
+            "status": "approved",
+            "payment_date": REPORT_DATE,
+        })
+        assert await _payments() == {"approved": (1, 1075.00)}
+
+        await update_order(result["order_id"], {**order_data, "total_amount": 1075.00, "status": "paid"})
+        assert await _revenue() == {"paid": (1, 1075.00)}
+
+        monthly = await get_revenue_report("month", REPORT_DAY, REPORT_DAY)
+        assert [(row["period"], row["event_type"], row["status"]) for row in monthly] == [
+            (date(2001, 3, 1), "wedding", "paid")
+        ]
+    finally:
+        await delete_order(result["order_id"])
+
+    assert await _revenue() == {}
+    assert await _product_sales() == {}
+    assert await _payments() == {}
@@ -0,0 +1,51 @@
+import pytest
+from src.db.db_prepared_statements import StatementRegistry, prepared_statements_enabled
+from db.db_prepared_statements import statement_registry
+from db.db_sql_connection import async_connect
+from db.CRUD.read import get_order_by_id
+
+
+def test_prepared_statements_setting():
+    """
+    Tests that 'auto' turns prepared statements off on the transaction pooler port.
+    """
+    assert prepared_statements_enabled("auto", port="5432") is True
+    assert prepared_statements_enabled("auto", port="6543") is False
+    assert prepared_statements_enabled("false", port="5432") is False
+    assert prepared_statements_enabled("true", port="6543") is True
+
+
+def test_statement_registry_prepare_flag():
+    """
+    Tests the prepare argument chosen for registered, unregistered and disabled statements.
+    """
+    registry = StatementRegistry(enabled=True)
+    query = registry.register("get_thing", "SELECT * FROM things WHERE id = %s;")
+    assert registry.prepare_flag(query) is True
+    assert registry.prepare_flag("SELECT 1;") is None
+    assert registry.statements() == {"get_thing": query}
+    assert registry.connection_kwargs() == {}
+
+    disabled = StatementRegistry(enabled=False)
+    disabled.register("get_thing", query)
+    assert disabled.prepare_flag(query) is False
+    assert disabled.connection_kwargs() == {"prepare_threshold": None}
+
+
+@pytest.mark.asyncio
+async def test_hot_statement_is_prepared_on_first_use():
+    """
+    Tests that a registered CRUD statement is prepared by the server the first time
+    a connection runs it.
+    """
+    await get_order_by_id(3001)
+    query = statement_registry.statements()["get_order_by_id"]
+
+    async with async_connect() as conn:
+        async with conn.cursor() as cursor:
+            await cursor.execute(query, {"order_id": 3001})
+            await cursor.execute("SELECT statement FROM pg_prepared_statements;")
+            statements = [row[0] for row in await cursor.fetchall()]
+
+    assert statement_registry.enabled
+    assert any("FROM orders WHERE id = $1" in statement for statement in statements)
@@ -0,0 +1,60 @@
+import pytest
+from src.db.db_slow_query_log import MASK, SlowQueryLog, mask_params
+from db.db_slow_query_log import slow_query_log
+from db.CRUD.read import get_customer_by_email
+
+
+def test_mask_params_insert_columns():
+    """
+    Tests that positional INSERT parameters are masked by the column they fill.
+    """
+    query = """
+        INSERT INTO customers (full_name, email, phone, address, cpf_cnpj, password_hash, role)
+        VALUES (%s, %s, %s, %s, %s, %s, %s);
+    """
+    params = ("Ana", "ana@example.com", "119", "Rua A", "12345678901", "secret", "customer")
+    assert mask_params(query, params) == ["Ana", MASK, "119", "Rua A", MASK, MASK, "customer"]
+
+
+def test_mask_params_compared_columns_and_values():
+    """
+    Tests masking of 'column = %s' placeholders, named parameters and PII-looking values.
+    """
+    query = "UPDATE customers SET full_name = %s, email = %s WHERE id = %s;"
+    assert mask_params(query, ("Ana", "x", 1)) == ["Ana", MASK, 1]
+
+    assert mask_params("SELECT 1 WHERE a = %(email)s", {"email": "x", "id": 3}) == {"email": MASK, "id": 3}
+
+    # values recognized on their own, whatever the column
+    assert mask_params("SELECT %s, %s, %s", ("a@b.com", "123.456.789-09", "$2b$12$abc")) == [MASK, MASK, MASK]
+
+
+def test_slow_query_log_is_a_ring_buffer():
+    """
+    Tests that only the most recent entries are kept, newest first.
+    """
+    log = SlowQueryLog(threshold_ms=0, size=2)
+    for index in range(3):
+        log.record(f"function_{index}", "SELECT %s;", (index,), 0.5)
+
+    entries = log.entries()
+    assert [entry["function"] for entry in entries] == ["function_2", "function_1"]
+    assert entries[0]["duration_ms"] == 500
+    assert log.entries(limit=1) == entries[:1]
+
+
+@pytest.mark.asyncio
+async def test_slow_statement_is_logged_masked():
+    """
+    Tests that a CRUD statement over the threshold lands in the log with masked parameters.
+    """
+    threshold = slow_query_log.threshold_ms
+    slow_query_log.threshold_ms = 0
+    try:
+        await get_customer_by_email("ana@example.com")
+    finally:
+        slow_query_log.threshold_ms = threshold
+
+    entry = next(entry for entry in slow_query_log.entries() if entry["function"] == "get_customer_by_email")
+    assert entry["params"] == [MASK]
+    assert "FROM customers" in entry["query"]
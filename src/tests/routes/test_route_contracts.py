@@ -94,9 +94,9 @@ def test_get_contract_by_event_id():
     assert contract["pdf_file"] in ["test_contract_sample.pdf", "contrato_001.pdf"]
 
 
-def test_download_contract_pdf():
+def test_download_contract_pdf_external_file():
     """
-    Test downloading the PDF file for a contract using its contract_id.
+    Test that a contract created with a file path has no PDF to download.
     """
     assert CONTRACT_ID is not None
 
@@ -104,8 +104,33 @@ def test_download_contract_pdf():
         BASE_URL + CONTRACT_ROUTE + f"/download/?contract_id={CONTRACT_ID}",
         headers=HEADERS,
     )
+    assert response.status_code == 404
+
+
+def test_download_rendered_contract_pdf():
+    """
+    Test downloading the PDF rendered for a contract created without a file.
+    """
+    response = requests.post(
+        BASE_URL + CONTRACT_ROUTE + "/", json={"event_id": EVENT_ID}, headers=HEADERS
+    )
     assert response.status_code == 200
-    assert response.json()["pdf_file"] == PDF_FILE_NAME
+    contract_id = response.json()["contract_id"]
+
+    response = requests.get(
+        BASE_URL + CONTRACT_ROUTE + f"/download/?contract_id={contract_id}",
+        headers=HEADERS,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.content.startswith(b"%PDF-1.4")
+
+    # the same version again is not sent
+    cached = requests.get(
+        BASE_URL + CONTRACT_ROUTE + f"/download/?contract_id={contract_id}",
+        headers={**HEADERS, "If-None-Match": response.headers["etag"]},
+    )
+    assert cached.status_code == 304
 
 
 def test_get_contract_not_found():
@@ -1,3 +1,4 @@
+import uuid
 import requests
 from faker import Faker
 from datetime import datetime
@@ -20,6 +21,8 @@ TOKEN = None
 HEADERS = {}
 CREATED_EVENT_ID = None
 INVALID_EVENT_ID = 999999
+# bookings left behind by an interrupted run must not collide with this one
+RUN_ID = uuid.uuid4().hex[:8]
 
 CUSTOMER_TEST_API = {
     "full_name": fake.name(),
@@ -62,7 +65,7 @@ def test_create_event_success():
         "customer_id": 1001,
         "event_type": "debutante",
         "event_date": "2025-12-01T20:00:00",
-        "location": "Espaço Glamour",
+        "location": f"Espaço Glamour {RUN_ID}",
         "guest_count": 120,
         "duration_hours": 5,
         "budget_approved": True,
@@ -132,7 +135,7 @@ def test_update_event_success():
     payload = {
         "event_type": "wedding",
         "event_date": "2025-12-31T22:00:00",
-        "location": "Villa Lobos Hall",
+        "location": f"Villa Lobos Hall {RUN_ID}",
         "guest_count": 200,
         "duration_hours": 6,
         "budget_approved": False,
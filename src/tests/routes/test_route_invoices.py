@@ -1,3 +1,4 @@
+import time
 import pytest
 import requests
 from faker import Faker
@@ -73,11 +74,20 @@ def test_get_invoice_route_not_found():
     assert response.json()["detail"] == "Invoice not found"
 
 def test_download_invoice_route_success():
-    """Test retrieving the PDF file path for an invoice using its invoice_id."""
+    """Test downloading the PDF of an invoice once it is rendered."""
     invoice_id = 7001
+    job = requests.post(BASE_URL + f"/invoices/{invoice_id}/render", headers=HEADERS).json()
+    for _ in range(50):
+        job = requests.get(BASE_URL + f"/invoices/render-jobs/{job['id']}", headers=HEADERS).json()
+        if job["status"] in ("done", "failed"):
+            break
+        time.sleep(0.2)
+    assert job["status"] == "done"
+
     response = requests.get(BASE_URL + f"/invoices/download/?invoice_id={invoice_id}", headers=HEADERS)
     assert response.status_code == 200
-    assert response.json()["pdf_file"] == "nf_001.pdf"
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.content.startswith(b"%PDF-1.4")
 
 def test_download_invoice_route_not_found():
     """Test retrieving the PDF file path for a non-existent invoice_id."""
@@ -1,11 +1,46 @@
+import os
 import pytest
+import asyncio
+from datetime import datetime, timedelta
 from fastapi import HTTPException
 from src.utils.utils_validation import (
+    PasswordHasher,
     get_password_hash,
     verify_password,
     validate_password_strength,
     validate_email_format,
 )
+from src.utils.utils_scheduling import free_slots
+from src.utils.utils_pagination import (
+    MAX_PAGE_SIZE,
+    build_page,
+    clamp_page_size,
+    decode_time_cursor,
+    encode_time_cursor,
+)
+from src.utils.utils_cache import TTLCache
+from src.utils.utils_json import FastJSONResponse, dumps
+from src.utils.utils_metrics import MetricsMiddleware, Registry
+from src.utils.utils_single_flight import single_flight, single_flight_collapsed_total
+from src.utils.utils_bulk_import import detect_format, iter_batches, spool_batches, spool_rows, validate_rows
+from src.utils.utils_file_store import ContentStore
+from src.utils.utils_contract_renderer import (
+    CONTRACT_TEMPLATE_DIR,
+    compile_contract_templates,
+    load_contract_template,
+    render_contract_pdf,
+)
+from src.utils.utils_quotes import (
+    QUOTE_DRINKS_PER_GUEST_HOUR,
+    QUOTE_GUESTS_PER_SERVICE,
+    QUOTE_GUESTS_PER_STRUCTURE,
+    build_quote_catalog,
+    estimate_bill_of_materials,
+    estimate_scenarios,
+)
+from src.utils.utils_pdf import LINES_PER_PAGE, render_text_pdf
+from src.utils.utils_invoice_renderer import invoice_file_name
+from src.db.db_base_classes import Product
 
 
 def test_get_password_hash():
@@ -28,6 +63,36 @@ def test_verify_password():
     assert verify_password("WrongPass", hashed_password) is False
 
 
+@pytest.mark.asyncio
+async def test_password_hasher_runs_on_worker_pool():
+    """
+    Tests that hashing and verification through the worker pool match the sync helpers.
+    """
+    hasher = PasswordHasher(workers=2, queue_limit=4)
+    hashed_password = await hasher.hash("StrongPass123!")
+    assert verify_password("StrongPass123!", hashed_password) is True
+    assert await hasher.verify("StrongPass123!", hashed_password) is True
+    assert await hasher.verify("WrongPass", hashed_password) is False
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_rejects_when_queue_is_full():
+    """
+    Tests that calls beyond the queue limit fail fast with 503 instead of waiting.
+    """
+    hasher = PasswordHasher(workers=1, queue_limit=2)
+    results = await asyncio.gather(
+        *(hasher.hash("StrongPass123!") for _ in range(3)), return_exceptions=True
+    )
+
+    rejected = [result for result in results if isinstance(result, HTTPException)]
+    assert len(rejected) == 1
+    assert rejected[0].status_code == 503
+    assert hasher.rejected == 1
+    hasher.shutdown()
+
+
 def test_validate_password_strength():
     """
     Tests if weak passwords raise an HTTPException and strong passwords pass validation.
@@ -72,3 +137,490 @@ def test_validate_email_format():
             "The email must be in the format 'name@domain.com' or 'name@domain.br'."
             in str(excinfo.value.detail)
         )
+
+
+def test_clamp_page_size():
+    """
+    Tests that page sizes are capped at MAX_PAGE_SIZE.
+    """
+    assert clamp_page_size(10) == 10
+    assert clamp_page_size(MAX_PAGE_SIZE + 1) == MAX_PAGE_SIZE
+
+
+def test_build_page():
+    """
+    Tests that the extra row fetched by the reader only sets 'next_cursor'.
+    """
+    rows = [{"id": 1}, {"id": 2}, {"id": 3}]
+
+    page = build_page(rows, 2)
+    assert page == {"items": [{"id": 1}, {"id": 2}], "next_cursor": 2}
+
+    last_page = build_page(rows, 3)
+    assert last_page == {"items": rows, "next_cursor": None}
+
+
+def test_time_cursor_round_trip():
+    """
+    Tests that a date-ordered page cursor decodes to the last row's date and ID.
+    """
+    row = {"id": 42, "event_date": datetime(2030, 5, 1, 18, 30)}
+    rows = [{"id": 41, "event_date": datetime(2030, 5, 1)}, row, {"id": 7, "event_date": datetime(2030, 6, 1)}]
+
+    page = build_page(rows, 2, lambda r: encode_time_cursor(r, "event_date"))
+    assert page["next_cursor"] == "2030-05-01T18:30:00_42"
+    assert decode_time_cursor(page["next_cursor"]) == (datetime(2030, 5, 1, 18, 30), 42)
+
+    with pytest.raises(ValueError):
+        decode_time_cursor("not-a-cursor")
+
+
+def test_free_slots():
+    """
+    Tests that the free periods are the gaps between bookings inside the range.
+    """
+    day = datetime(2030, 5, 1)
+    bookings = [
+        {"start": day - timedelta(hours=2), "end": day + timedelta(hours=9)},
+        {"start": day + timedelta(hours=10), "end": day + timedelta(hours=14)},
+        {"start": day + timedelta(hours=14), "end": day + timedelta(hours=20)},
+    ]
+
+    slots = free_slots(bookings, day, day + timedelta(days=1))
+    assert slots == [
+        {"start": day + timedelta(hours=9), "end": day + timedelta(hours=10)},
+        {"start": day + timedelta(hours=20), "end": day + timedelta(days=1)},
+    ]
+
+    long_slots = free_slots(bookings, day, day + timedelta(days=1), min_duration=timedelta(hours=2))
+    assert long_slots == slots[1:]
+    assert free_slots([], day, day + timedelta(hours=1)) == [{"start": day, "end": day + timedelta(hours=1)}]
+
+
+def test_ttl_cache_hits_and_misses():
+    """
+    Tests that the cache counts hits and misses and returns stored values.
+    """
+    cache = TTLCache(max_size=10, ttl=60)
+
+    assert cache.get("ana@example.com") is None
+    cache.set("ana@example.com", {"id": 1})
+    assert cache.get("ana@example.com") == {"id": 1}
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """
+    Tests that the least recently used entry is evicted when the cache is full.
+    """
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_cache_expires_entries():
+    """
+    Tests that entries older than the TTL are treated as misses.
+    """
+    cache = TTLCache(max_size=10, ttl=0)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_ttl_cache_invalidate_where():
+    """
+    Tests that entries can be invalidated by value, as done when a customer changes.
+    """
+    cache = TTLCache(max_size=10, ttl=60)
+    cache.set("ana@example.com", {"id": 1})
+    cache.set("carlos@example.com", {"id": 2})
+
+    cache.invalidate_where(lambda customer: customer["id"] == 1)
+
+    assert cache.get("ana@example.com") is None
+    assert cache.get("carlos@example.com") == {"id": 2}
+
+
+def test_ttl_cache_skips_values_read_before_an_invalidation():
+    """
+    Tests that a value loaded before an invalidation arrived is not cached after it.
+    """
+    cache = TTLCache(max_size=10, ttl=60)
+    generation = cache.generation()
+    # the customer changes while its row is being read
+    cache.invalidate_where(lambda customer: customer["id"] == 1)
+    cache.set("ana@example.com", {"id": 1, "role": "admin"}, generation)
+    assert cache.get("ana@example.com") is None
+
+    cache.set("ana@example.com", {"id": 1, "role": "customer"}, cache.generation())
+    assert cache.get("ana@example.com") == {"id": 1, "role": "customer"}
+
+
+def test_json_dumps_database_types():
+    """
+    Tests that Decimal, datetime and enum values serialize like jsonable_encoder did.
+    """
+    import json
+    from enum import Enum
+    from decimal import Decimal
+    from datetime import date, datetime
+    from fastapi.encoders import jsonable_encoder
+
+    class Status(str, Enum):
+        PAID = "paid"
+
+    row = {
+        "id": 1,
+        "total_amount": Decimal("5000.50"),
+        "order_date": datetime(2025, 6, 10, 18, 30, 5),
+        "event_day": date(2025, 6, 10),
+        "status": Status.PAID,
+        "payment_date": None,
+    }
+
+    assert json.loads(dumps(row)) == jsonable_encoder(row)
+    assert json.loads(FastJSONResponse([row]).body) == [jsonable_encoder(row)]
+
+    with pytest.raises(TypeError):
+        dumps({"value": object()})
+
+
+def test_histogram_render():
+    """
+    Tests that histogram buckets are rendered cumulatively with sum and count.
+    """
+    registry = Registry()
+    histogram = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(("/a",), 0.05)
+    histogram.observe(("/a",), 0.5)
+    histogram.observe(("/a",), 5)
+
+    output = registry.render()
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in output
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in output
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in output
+    assert 'latency_seconds_count{route="/a"} 3' in output
+    assert "# TYPE latency_seconds histogram" in output
+
+
+def test_metrics_middleware_labels_route_template():
+    """
+    Tests that requests are labelled with the route template instead of the raw path.
+    """
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from src.utils.utils_metrics import http_request_duration_seconds, http_requests_total
+
+    app = FastAPI()
+
+    @app.get("/things/{thing_id}")
+    async def read_thing(thing_id: int):
+        return {"thing_id": thing_id}
+
+    app.add_middleware(MetricsMiddleware)
+    before = http_request_duration_seconds.count(("GET", "/things/{thing_id}"))
+
+    with TestClient(app) as client:
+        client.get("/things/1")
+        client.get("/things/2")
+        client.get("/missing")
+
+    assert http_request_duration_seconds.count(("GET", "/things/{thing_id}")) == before + 2
+    assert http_requests_total.value(("GET", "unmatched", "404")) >= 1
+
+
+def test_application_counters_end_in_total():
+    """
+    Tests that the pool, cache and catalog counters follow the Prometheus '_total' naming.
+    """
+    from src.routes.route_metrics import _collect_application_stats
+
+    metrics = {name: kind for name, kind, _, _ in _collect_application_stats()}
+
+    assert metrics["user_cache_hits_total"] == "counter"
+    assert metrics["user_cache_size"] == "gauge"
+    assert "user_cache_hits" not in metrics
+    assert all(name.endswith("_total") for name, kind in metrics.items() if kind == "counter")
+
+
+@pytest.mark.asyncio
+async def test_single_flight_collapses_identical_calls():
+    """
+    Tests that concurrent identical calls share one execution and different ones do not.
+    """
+    calls = []
+
+    @single_flight
+    async def read_thing(thing_id, limit=None):
+        calls.append((thing_id, limit))
+        await asyncio.sleep(0.01)
+        return {"id": thing_id}
+
+    collapsed = single_flight_collapsed_total.value(("read_thing",))
+    results = await asyncio.gather(*(read_thing(1, limit=5) for _ in range(10)), read_thing(2, limit=5))
+
+    assert calls == [(1, 5), (2, 5)]
+    assert results[0] is results[9]
+    assert results[10] == {"id": 2}
+    assert single_flight_collapsed_total.value(("read_thing",)) == collapsed + 9
+
+    # once finished, the next call runs again
+    await read_thing(1, limit=5)
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_exceptions():
+    """
+    Tests that every waiting caller receives the exception of the shared call.
+    """
+
+    @single_flight
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(failing(), failing(), return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_single_flight_binds_arguments_and_invalidates():
+    """
+    Tests that positional and keyword calls share one execution, and that calls made
+    after invalidate() do not join an execution that started before it.
+    """
+    calls = []
+
+    @single_flight
+    async def read_thing(thing_id, limit=None):
+        calls.append(thing_id)
+        call = len(calls)
+        await asyncio.sleep(0.01)
+        return {"id": thing_id, "call": call}
+
+    results = await asyncio.gather(read_thing(1), read_thing(thing_id=1), read_thing(1, None))
+    assert calls == [1]
+    assert results[0] is results[1] is results[2]
+
+    before_write = asyncio.ensure_future(read_thing(1))
+    await asyncio.sleep(0)
+    read_thing.invalidate()
+    after_write = await read_thing(1)
+    assert (await before_write)["call"] == 2
+    assert after_write["call"] == 3
+
+
+@pytest.mark.asyncio
+async def test_validate_rows_reports_errors_per_line():
+    """
+    Tests that bulk import rows are validated one by one and that invalid rows
+    are reported with their line instead of stopping the import.
+    """
+    import io
+
+    fields = ("name", "description", "base_price", "category", "active")
+    csv_file = io.BytesIO(
+        b"name,description,base_price,category,active\n"
+        b"Mojito,,18.5,drink,true\n"
+        b"Broken,Bad price,-1,drink,true\n"
+        b"Tent,,900,structure,\n"
+    )
+    errors = []
+    rows = list(validate_rows(csv_file, "csv", Product, errors, fields))
+    assert [line for line, _ in rows] == [2, 4]
+    assert rows[0][1] == {"name": "Mojito", "description": None, "base_price": 18.5, "category": "drink", "active": True}
+    assert rows[1][1]["active"] is True
+    assert errors[0]["line"] == 3 and errors[0]["errors"][0].startswith("base_price")
+
+    ndjson_file = io.BytesIO(b'{"name": "Gin", "base_price": 30, "category": "drink"}\n\nnot json\n{"name": "X", "base_price": 1, "category": "food"}\n')
+    errors = []
+    rows = list(validate_rows(ndjson_file, "ndjson", Product, errors, fields))
+    assert [line for line, _ in rows] == [1]
+    assert [error["line"] for error in errors] == [3, 4]
+
+    batches = [batch async for batch in iter_batches(iter(range(5)), size=2)]
+    assert batches == [[0, 1], [2, 3], [4]]
+    assert detect_format("venue.ndjson", None) == "ndjson"
+    assert detect_format("venue.csv", "text/csv") == "csv"
+
+
+@pytest.mark.asyncio
+async def test_spool_batches_prepares_every_row_first():
+    """
+    Tests that spooled batches are fully consumed before the rows are read back,
+    including when they spill to disk.
+    """
+    consumed = []
+
+    async def batches():
+        for start in range(0, 10, 4):
+            batch = [(line, {"email": f"user{line}@example.com"}) for line in range(start, min(start + 4, 10))]
+            consumed.extend(batch)
+            yield batch
+
+    spooled = await spool_batches(batches(), size=3, max_bytes=64)
+    assert len(consumed) == 10
+    read = [batch async for batch in spooled]
+    assert [len(batch) for batch in read] == [3, 3, 3, 1]
+    assert [row for batch in read for row in batch] == consumed
+
+
+@pytest.mark.asyncio
+async def test_spool_rows_validates_on_a_thread():
+    """
+    Tests that spool_rows consumes the whole upload off the event loop before
+    returning the batches.
+    """
+    import threading
+
+    threads = []
+
+    def rows():
+        for line in range(7):
+            threads.append(threading.current_thread())
+            yield line, {"name": f"Product {line}"}
+
+    spooled = await spool_rows(rows(), size=3, max_bytes=64)
+    assert len(threads) == 7
+    assert threading.main_thread() not in threads
+    read = [batch async for batch in spooled]
+    assert [len(batch) for batch in read] == [3, 3, 1]
+    assert read[2] == [(6, {"name": "Product 6"})]
+
+
+QUOTE_PRODUCTS = [
+    {"id": 1, "name": "Moscow Mule", "category": "drink", "base_price": 25.00, "active": True},
+    {"id": 2, "name": "Pina Descolada", "category": "drink", "base_price": 20.00, "active": True},
+    {"id": 3, "name": "Bar de Gin", "category": "structure", "base_price": 1000.00, "active": True},
+    {"id": 4, "name": "Bartender", "category": "service", "base_price": 500.00, "active": True},
+    {"id": 5, "name": "Old bar", "category": "structure", "base_price": 10.00, "active": False},
+]
+
+
+def test_estimate_bill_of_materials():
+    """
+    Tests that drinks are shared per guest and hour, and structures and services sized per guests.
+    """
+    catalog = build_quote_catalog(QUOTE_PRODUCTS)
+    quote = estimate_bill_of_materials(catalog, guest_count=120, duration_hours=5)
+
+    quantities = {item["product_id"]: item["quantity"] for item in quote["items"]}
+    drinks = -(-120 * 5 * QUOTE_DRINKS_PER_GUEST_HOUR // 2)
+    assert quantities == {
+        1: drinks,
+        2: drinks,
+        3: -(-120 // QUOTE_GUESTS_PER_STRUCTURE),
+        4: -(-120 // QUOTE_GUESTS_PER_SERVICE),
+    }
+    for item in quote["items"]:
+        assert item["total_price"] == round(item["quantity"] * item["unit_price"], 2)
+    assert quote["subtotals"]["drink"] == drinks * 45.00
+    assert quote["total_amount"] == round(sum(item["total_price"] for item in quote["items"]), 2)
+
+
+def test_estimate_scenarios_matches_single_estimates():
+    """
+    Tests that a what-if run prices every combination like a single estimate.
+    """
+    catalog = build_quote_catalog(QUOTE_PRODUCTS)
+    guests = [1, 50, 100, 101, 350]
+    hours = [1, 4, 5, 6, 12]
+
+    results = estimate_scenarios(catalog, guests, hours)
+    assert [(r["guest_count"], r["duration_hours"]) for r in results] == list(zip(guests, hours))
+    for result, guest_count, duration in zip(results, guests, hours):
+        single = estimate_bill_of_materials(catalog, guest_count, duration)
+        assert result["total_amount"] == single["total_amount"]
+        assert result["subtotals"] == single["subtotals"]
+
+    assert build_quote_catalog([]).products == []
+    assert estimate_scenarios(build_quote_catalog([]), [10], [2])[0]["total_amount"] == 0
+
+
+def test_render_text_pdf():
+    """
+    Tests the PDF layout: page breaks, escaping and a cross-reference table pointing at each object.
+    """
+    lines = ["Nota fiscal (NF-001) \\ Ação"] + [f"line {n}" for n in range(LINES_PER_PAGE)] + ["\f", "last page"]
+    pdf = render_text_pdf(lines, title="NF-001")
+
+    assert pdf.startswith(b"%PDF-1.4") and pdf.endswith(b"%%EOF\n")
+    assert b"/Count 3" in pdf
+    assert b"(Nota fiscal \\(NF-001\\) \\\\ A\xe7\xe3o) Tj" in pdf
+
+    xref = int(pdf.rsplit(b"startxref\n", 1)[1].split(b"\n")[0])
+    entries = pdf[xref:].split(b"\n")[3:]
+    for number, entry in enumerate(entries[:3 + 2 * 3 + 1], start=1):
+        offset = int(entry.split()[0])
+        assert pdf[offset:].startswith(b"%d 0 obj" % number)
+
+    assert invoice_file_name(7001, "NF-001") == "7001-nf_001.pdf"
+    assert invoice_file_name(7002, "NF 2025/07") == "7002-nf_2025_07.pdf"
+    # numbers that only differ in punctuation still get their own file
+    assert invoice_file_name(7003, "NF/001") != invoice_file_name(7001, "NF-001")
+
+
+def test_content_store(tmp_path):
+    """
+    Tests that identical content is stored once and that refs point at stored objects only.
+    """
+    store = ContentStore(str(tmp_path))
+    name = store.put(b"%PDF-1.4 contract")
+    assert store.put(b"%PDF-1.4 contract") == name
+    assert name.endswith(".pdf") and len(list(tmp_path.rglob("*.pdf"))) == 1
+    assert open(store.path(name), "rb").read() == b"%PDF-1.4 contract"
+
+    key = "a" * 64
+    assert store.lookup(key) is None
+    store.link(key, name)
+    assert store.lookup(key) == name
+    os.remove(store.path(name))
+    assert store.lookup(key) is None and not store.exists(name)
+
+    assert not store.exists("contrato_001.pdf")
+    with pytest.raises(ValueError):
+        store.path("../../etc/passwd")
+
+
+def test_render_contract_pdf(tmp_path):
+    """
+    Tests that the templates are compiled once per version and render the same bytes for the same data.
+    """
+    compiled = compile_contract_templates(CONTRACT_TEMPLATE_DIR, str(tmp_path))
+    assert compile_contract_templates(CONTRACT_TEMPLATE_DIR, str(tmp_path)) == compiled
+    assert os.listdir(tmp_path) == [os.path.basename(compiled)]
+
+    data = {
+        "contract_id": 8001,
+        "event": {
+            "id": 2001, "event_type": "wedding", "event_date": "2025-06-10T18:00:00", "location": "Espaço Verde",
+            "guest_count": 200, "duration_hours": 6, "budget_approved": True,
+        },
+        "customer": {
+            "full_name": "Ana Souza", "email": "ana@example.com", "phone": None,
+            "address": "Rua das Flores, 123", "cpf_cnpj": "12345678901",
+        },
+        "items": [{"product_name": "Moscow Mule", "category": "drink", "quantity": 100, "total_price": 2500.0}],
+        "total_amount": 2500.0,
+    }
+    template = load_contract_template(compiled)
+    text = template.render(**data)
+    assert "Nº 008001" in text and "10/06/2025 18:00" in text and "R$ 2.500,00" in text
+    assert all(len(line) <= 78 for line in text.splitlines())
+
+    pdf = render_contract_pdf(template, data)
+    assert pdf == render_contract_pdf(template, data)
+    assert pdf.startswith(b"%PDF-1.4") and b"(Contrato 008001)" in pdf
@@ -0,0 +1,206 @@
+import io
+import os
+import asyncio
+import csv
+import json
+import tempfile
+from typing import AsyncIterable, AsyncIterator, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Type
+from dotenv import load_dotenv
+from pydantic import BaseModel, ValidationError
+
+# load variables from .env file
+load_dotenv()
+
+# Valid rows sent to the database per COPY (and hashed together, for customers)
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", 1000))
+# Prepared rows kept in memory before spool_batches() moves them to a temporary file
+IMPORT_SPOOL_MAX_BYTES = int(os.getenv("IMPORT_SPOOL_MAX_BYTES", 8 * 1024 * 1024))
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> str:
+    """
+    Guesses the format of an upload from its file name or content type.
+
+    Args:
+        filename (Optional[str]): Name of the uploaded file.
+        content_type (Optional[str]): Content type sent by the client.
+
+    Returns:
+        str: 'ndjson' for .ndjson/.jsonl files or JSON content types, otherwise 'csv'.
+    """
+    if (filename or "").lower().endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    if content_type in ("application/x-ndjson", "application/jsonl", "application/json"):
+        return "ndjson"
+    return "csv"
+
+
+def _csv_records(file: BinaryIO) -> Iterator[Tuple[int, object]]:
+    """
+    Yields (line, record) for each CSV row. Empty cells are left out, so the
+    model defaults apply to them.
+    """
+    reader = csv.DictReader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+    for row in reader:
+        if None in row:
+            yield reader.line_num, ValueError("Row has more cells than the header")
+            continue
+        yield reader.line_num, {key: value for key, value in row.items() if value not in ("", None)}
+
+
+def _ndjson_records(file: BinaryIO) -> Iterator[Tuple[int, object]]:
+    """
+    Yields (line, record) for each non-empty NDJSON line.
+    """
+    for line, raw in enumerate(file, start=1):
+        if not raw.strip():
+            continue
+        try:
+            record = json.loads(raw)
+        except ValueError as e:
+            yield line, ValueError(f"Invalid JSON: {e}")
+            continue
+        yield line, record if isinstance(record, dict) else ValueError("Each line must be a JSON object")
+
+
+def _format_errors(error: Exception) -> List[str]:
+    if isinstance(error, ValidationError):
+        return [
+            f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}" if detail["loc"] else detail["msg"]
+            for detail in error.errors()
+        ]
+    return [str(error)]
+
+
+def validate_rows(
+    file: BinaryIO,
+    file_format: str,
+    model: Type[BaseModel],
+    errors: List[Dict],
+    fields: Iterable[str],
+) -> Iterator[Tuple[int, Dict]]:
+    """
+    Parses an upload row by row and validates each row with a pydantic model.
+
+    Rows are read from the (spooled) upload as they are consumed, so the file is
+    never held in memory. Invalid rows are appended to `errors` and skipped.
+
+    Args:
+        file (BinaryIO): The uploaded file.
+        file_format (str): 'csv' (with a header row) or 'ndjson'.
+        model (Type[BaseModel]): Model validating each row, e.g. Product.
+        errors (List[Dict]): Receives {'line': ..., 'errors': [...]} for invalid rows.
+        fields (Iterable[str]): Model fields kept in the yielded rows.
+
+    Yields:
+        Tuple[int, Dict]: The line number and the validated row.
+    """
+    fields = tuple(fields)
+    records = _ndjson_records(file) if file_format == "ndjson" else _csv_records(file)
+    for line, record in records:
+        try:
+            if isinstance(record, Exception):
+                raise record
+            validated = model.model_validate(record)
+        except (ValueError, TypeError) as e:
+            errors.append({"line": line, "errors": _format_errors(e)})
+            continue
+        row = validated.model_dump(mode="json", include=set(fields))
+        yield line, {field: row.get(field) for field in fields}
+
+
+async def iter_batches(rows: Iterable[Tuple[int, Dict]], size: int = IMPORT_BATCH_SIZE) -> AsyncIterator[List[Tuple[int, Dict]]]:
+    """
+    Groups validated rows into batches for COPY.
+
+    Args:
+        rows (Iterable[Tuple[int, Dict]]): Rows yielded by validate_rows().
+        size (int): Rows per batch.
+
+    Yields:
+        List[Tuple[int, Dict]]: The next batch of rows.
+    """
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def spool_batches(
+    batches: AsyncIterable[List[Tuple[int, Dict]]],
+    size: int = IMPORT_BATCH_SIZE,
+    max_bytes: int = IMPORT_SPOOL_MAX_BYTES,
+) -> AsyncIterator[List[Tuple[int, Dict]]]:
+    """
+    Consumes every batch before returning, so slow preparation (validation,
+    password hashing) is done before any database transaction is opened.
+
+    The rows are kept as NDJSON in a spooled temporary file: in memory up to
+    `max_bytes`, on disk beyond.
+
+    Args:
+        batches (AsyncIterable[List[Tuple[int, Dict]]]): Batches of (line, row).
+        size (int): Rows per batch read back.
+        max_bytes (int): Size above which the rows are written to disk.
+
+    Returns:
+        AsyncIterator[List[Tuple[int, Dict]]]: The same rows, in batches, read back
+        from the spooled file.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=max_bytes)
+    try:
+        async for batch in batches:
+            for line, row in batch:
+                spool.write(json.dumps([line, row]).encode() + b"\n")
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return _read_spool(spool, size)
+
+
+def _spool_rows_sync(rows: Iterable[Tuple[int, Dict]], max_bytes: int) -> BinaryIO:
+    spool = tempfile.SpooledTemporaryFile(max_size=max_bytes)
+    try:
+        for line, row in rows:
+            spool.write(json.dumps([line, row]).encode() + b"\n")
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
+async def spool_rows(
+    rows: Iterable[Tuple[int, Dict]],
+    size: int = IMPORT_BATCH_SIZE,
+    max_bytes: int = IMPORT_SPOOL_MAX_BYTES,
+) -> AsyncIterator[List[Tuple[int, Dict]]]:
+    """
+    Consumes the rows on a worker thread before returning, so that parsing and
+    validating the upload neither blocks the event loop nor runs while a
+    database transaction is open.
+
+    Args:
+        rows (Iterable[Tuple[int, Dict]]): Rows yielded by validate_rows().
+        size (int): Rows per batch read back.
+        max_bytes (int): Size above which the rows are written to disk.
+
+    Returns:
+        AsyncIterator[List[Tuple[int, Dict]]]: The same rows, in batches, read back
+        from a spooled temporary file (see spool_batches()).
+    """
+    spool = await asyncio.to_thread(_spool_rows_sync, rows, max_bytes)
+    return _read_spool(spool, size)
+
+
+async def _read_spool(spool: BinaryIO, size: int) -> AsyncIterator[List[Tuple[int, Dict]]]:
+    with spool:
+        async for batch in iter_batches((tuple(json.loads(raw)) for raw in spool), size):
+            yield batch
@@ -0,0 +1,188 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+from dotenv import load_dotenv
+from db.db_notifications import DB_LISTEN_RETRY_SECONDS, NotificationListener, notification_listen_port
+
+# load variables from .env file
+load_dotenv()
+
+# configuration of the authenticated user cache
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", 1024))
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", 60))
+USER_CACHE_CHANNEL = os.getenv("USER_CACHE_CHANNEL", "customers_changed")
+
+
+class TTLCache:
+    """
+    In-process cache with a time-to-live per entry and least-recently-used eviction.
+
+    Args:
+        max_size (int): Maximum number of entries; the least recently used one is evicted first.
+        ttl (float): Seconds an entry stays valid after being stored.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        # bumped by every invalidation, so a value read before one is not stored after it
+        self._generation = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Returns the cached value, or None if it is missing or expired.
+
+        Args:
+            key (Hashable): The cache key.
+
+        Returns:
+            Optional[Any]: The cached value.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def generation(self) -> int:
+        """
+        Returns the invalidation counter, to be read before loading a value for set().
+
+        Returns:
+            int: The number of invalidations so far.
+        """
+        with self._lock:
+            return self._generation
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        """
+        Stores a value, evicting the least recently used entry when the cache is full.
+
+        Args:
+            key (Hashable): The cache key.
+            value (Any): The value to store.
+            generation (Optional[int]): generation() read before the value was loaded.
+                If anything was invalidated since, the value may be stale and is not stored.
+        """
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Removes a single entry.
+
+        Args:
+            key (Hashable): The cache key.
+        """
+        with self._lock:
+            self._generation += 1
+            if self._entries.pop(key, None) is not None:
+                self._invalidations += 1
+
+    def invalidate_where(self, predicate: Callable[[Any], bool]) -> None:
+        """
+        Removes every entry whose value matches the predicate.
+
+        Args:
+            predicate (Callable[[Any], bool]): Returns True for values to remove.
+        """
+        with self._lock:
+            self._generation += 1
+            keys = [key for key, (_, value) in self._entries.items() if predicate(value)]
+            for key in keys:
+                del self._entries[key]
+            self._invalidations += len(keys)
+
+    def clear(self) -> None:
+        """
+        Removes every entry and resets the counters.
+        """
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = self._invalidations = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the cache counters.
+
+        Returns:
+            Dict[str, int]: Hits, misses, evictions, invalidations and current size.
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+                "size": len(self._entries),
+            }
+
+
+# Customers resolved by get_current_user, keyed by the token subject (email)
+user_cache = TTLCache(max_size=USER_CACHE_MAX_SIZE, ttl=USER_CACHE_TTL_SECONDS)
+
+
+def invalidate_cached_customer(customer_id: int) -> None:
+    """
+    Drops a customer from the authenticated user cache after it is updated or deleted.
+
+    Args:
+        customer_id (int): The customer ID.
+    """
+    user_cache.invalidate_where(lambda customer: customer["id"] == customer_id)
+
+
+def _drop_all_customers() -> None:
+    user_cache.invalidate_where(lambda customer: True)
+
+
+def _customer_changed(payload: str) -> None:
+    # the payload is the customer ID, or empty when the table was truncated
+    if payload:
+        invalidate_cached_customer(int(payload))
+    else:
+        _drop_all_customers()
+
+
+# Drops customers changed by other workers or scripts, through the trigger of
+# database/migrations/008_customers_notify.sql. Until it connects (or behind a
+# transaction pooler without DB_LISTEN_PORT) such changes show up within the TTL.
+user_cache_listener = NotificationListener(
+    USER_CACHE_CHANNEL,
+    DB_LISTEN_RETRY_SECONDS,
+    notification_listen_port(),
+    on_notify=_customer_changed,
+    on_connect=_drop_all_customers,
+)
+
+
+async def start_user_cache_listener() -> None:
+    """
+    Starts listening for customer changes in the background, unless the cache is disabled.
+    """
+    if USER_CACHE_MAX_SIZE > 0:
+        await user_cache_listener.start(timeout=None)
@@ -0,0 +1,295 @@
+import os
+import json
+import shutil
+import asyncio
+import hashlib
+import tempfile
+import multiprocessing
+from pathlib import Path
+from typing import Dict, Optional
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dotenv import load_dotenv
+from jinja2 import BaseLoader, Environment, FileSystemLoader, ModuleLoader, StrictUndefined, Template
+from db.CRUD.read import get_contract_render_data
+from db.CRUD.update import update_contract_pdf
+from utils.utils_file_store import ContentStore
+from utils.utils_pdf import format_date, format_money, render_text_pdf
+from utils.utils_single_flight import single_flight
+
+# load variables from .env file
+load_dotenv()
+
+# configuration of the contract documents
+CONTRACT_TEMPLATE_DIR = os.getenv(
+    "CONTRACT_TEMPLATE_DIR", str(Path(__file__).resolve().parent.parent / "templates" / "contracts")
+)
+# defaults under the repository root, whatever directory the process starts in
+CONTRACT_TEMPLATE_CACHE_DIR = os.getenv(
+    "CONTRACT_TEMPLATE_CACHE_DIR", str(Path(__file__).resolve().parents[2] / "storage" / "templates")
+)
+CONTRACT_STORE_DIR = os.getenv(
+    "CONTRACT_STORE_DIR", str(Path(__file__).resolve().parents[2] / "storage" / "contracts")
+)
+CONTRACT_RENDER_WORKERS = int(os.getenv("CONTRACT_RENDER_WORKERS", os.cpu_count() or 2))
+
+CONTRACT_TEMPLATE = "contract.txt.j2"
+
+# part of every cache key: bump it when render_text_pdf or the filters change the output
+LAYOUT_VERSION = 1
+
+# the compiled template of a worker process, loaded once by _init_worker
+_worker_template: Optional[Template] = None
+
+
+def contract_environment(loader: BaseLoader) -> Environment:
+    """
+    Returns the Jinja environment of the contract templates, with their filters.
+
+    The same settings are used to compile the templates and to load the compiled
+    modules, since the filters are looked up when rendering.
+
+    Args:
+        loader (BaseLoader): Where the templates come from.
+
+    Returns:
+        Environment: The environment.
+    """
+    env = Environment(
+        loader=loader, trim_blocks=True, lstrip_blocks=True, undefined=StrictUndefined, autoescape=False
+    )
+    env.filters["money"] = format_money
+    env.filters["date_br"] = format_date
+    return env
+
+
+def compile_contract_templates(template_dir: str, cache_dir: str) -> str:
+    """
+    Compiles the contract templates to Python modules, unless it was already done.
+
+    The modules go to a folder named after a hash of the template sources, so an
+    edited template is compiled again and the hash also identifies the template
+    version in the cache keys. The folder is filled under a temporary name and
+    renamed, so API workers starting together never load a partial one.
+
+    Args:
+        template_dir (str): Folder of the .j2 sources.
+        cache_dir (str): Folder the compiled versions are kept in.
+
+    Returns:
+        str: Folder of the compiled modules, for ModuleLoader.
+    """
+    digest = hashlib.sha256(b"%d" % LAYOUT_VERSION)
+    for path in sorted(Path(template_dir).rglob("*.j2")):
+        digest.update(path.relative_to(template_dir).as_posix().encode() + b"\0" + path.read_bytes())
+    target = os.path.join(cache_dir, digest.hexdigest())
+    if os.path.isdir(target):
+        return target
+
+    os.makedirs(cache_dir, exist_ok=True)
+    temporary = tempfile.mkdtemp(dir=cache_dir, prefix=".compiling-")
+    try:
+        contract_environment(FileSystemLoader(template_dir)).compile_templates(
+            temporary, zip=None, filter_func=lambda name: name.endswith(".j2")
+        )
+        os.rename(temporary, target)
+    except OSError:
+        # another process renamed its copy first
+        if not os.path.isdir(target):
+            raise
+    finally:
+        shutil.rmtree(temporary, ignore_errors=True)
+    return target
+
+
+def load_contract_template(compiled_dir: str) -> Template:
+    """
+    Loads the compiled contract template, without parsing the source.
+
+    Args:
+        compiled_dir (str): Folder returned by compile_contract_templates().
+
+    Returns:
+        Template: The contract template.
+    """
+    return contract_environment(ModuleLoader(compiled_dir)).get_template(CONTRACT_TEMPLATE)
+
+
+def render_contract_pdf(template: Template, data: Dict) -> bytes:
+    """
+    Renders a contract to PDF.
+
+    The output only depends on the template and the data (no timestamps), so an
+    unchanged contract always produces the same bytes.
+
+    Args:
+        template (Template): The contract template.
+        data (Dict): The result of get_contract_render_data().
+
+    Returns:
+        bytes: The PDF file.
+    """
+    text = template.render(**data)
+    return render_text_pdf(text.splitlines(), title=f"Contrato {data['contract_id']:06d}")
+
+
+def _init_worker(compiled_dir: str) -> None:
+    """
+    Loads the compiled template once per worker process.
+    """
+    global _worker_template
+    _worker_template = load_contract_template(compiled_dir)
+
+
+def _render_in_worker(data: Dict, store_dir: str) -> str:
+    """
+    Renders a contract and stores it. Runs on the worker processes.
+    """
+    return ContentStore(store_dir).put(render_contract_pdf(_worker_template, data))
+
+
+class ContractRenderer:
+    """
+    Renders contracts from their event and customer data into a content-addressed store.
+
+    The templates are compiled to Python modules once (start()), and each worker
+    process loads them once, so a render does not parse any template. Each render
+    is recorded in the store under a key hashing the template version and the
+    data, so rendering an unchanged contract again reads one small file instead of
+    producing the PDF; identical PDFs share one stored file.
+
+    Args:
+        store_dir (str): Root folder of the ContentStore of the PDFs.
+        template_dir (str): Folder of the template sources.
+        cache_dir (str): Folder of the compiled templates.
+        workers (int): Number of worker processes. 0 renders inline on the event loop.
+    """
+
+    def __init__(self, store_dir: str, template_dir: str, cache_dir: str, workers: int):
+        self.store = ContentStore(store_dir)
+        self.template_dir = template_dir
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self._compiled_dir: Optional[str] = None
+        self._template: Optional[Template] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.rendered = 0
+        self.cache_hits = 0
+
+    async def start(self) -> None:
+        """
+        Compiles the templates, off the event loop.
+        """
+        await asyncio.to_thread(self._compile)
+
+    async def stop(self) -> None:
+        """
+        Stops the worker processes.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def cache_key(self, data: Dict) -> str:
+        """
+        Returns the key of a render: the template version and the contract data.
+
+        Args:
+            data (Dict): The result of get_contract_render_data(), without 'pdf_file'.
+
+        Returns:
+            str: A SHA-256 hex digest.
+        """
+        version = os.path.basename(self._compile())
+        payload = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(f"{version}:{payload}".encode()).hexdigest()
+
+    async def render(self, contract_id: int, force: bool = False) -> Optional[Dict]:
+        """
+        Renders a contract unless the same data was already rendered, and records
+        the PDF on the contract.
+
+        Only contracts without a PDF or whose PDF is in the store are rendered: a
+        file path sent when the contract was created is left alone.
+
+        Args:
+            contract_id (int): The contract ID.
+            force (bool): Render even on a cache hit.
+
+        Returns:
+            Optional[Dict]: 'contract_id', 'pdf_file' (the object name in the store) and
+                'cached', or None if the contract does not exist.
+
+        Raises:
+            ValueError: If the contract's PDF is a file outside the store.
+        """
+        data = await get_contract_render_data(contract_id)
+        if data is None:
+            return None
+        current = data.pop("pdf_file")
+        if current is not None and not self.store.exists(current):
+            raise ValueError(f"Contract {contract_id} has an external PDF: {current}")
+        key = self.cache_key(data)
+
+        pdf_file = None if force else self.store.lookup(key)
+        cached = pdf_file is not None
+        if cached:
+            self.cache_hits += 1
+        else:
+            pdf_file = await self._render(data)
+            self.store.link(key, pdf_file)
+            self.rendered += 1
+
+        if pdf_file != current:
+            await update_contract_pdf(contract_id, pdf_file)
+        return {"contract_id": contract_id, "pdf_file": pdf_file, "cached": cached}
+
+    async def _render(self, data: Dict) -> str:
+        if self.workers <= 0:
+            if self._template is None:
+                self._template = load_contract_template(self._compile())
+            return self.store.put(render_contract_pdf(self._template, data))
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_executor(), _render_in_worker, data, self.store.directory)
+        except BrokenProcessPool:
+            # a worker process died: new ones start on the next render
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            raise
+
+    def _compile(self) -> str:
+        if self._compiled_dir is None:
+            self._compiled_dir = compile_contract_templates(self.template_dir, self.cache_dir)
+        return self._compiled_dir
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """
+        Starts the worker processes on first use, each loading the compiled template.
+        They are spawned rather than forked, as in InvoiceRenderer.
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self._compile(),),
+            )
+        return self._executor
+
+
+contract_renderer = ContractRenderer(
+    store_dir=CONTRACT_STORE_DIR,
+    template_dir=CONTRACT_TEMPLATE_DIR,
+    cache_dir=CONTRACT_TEMPLATE_CACHE_DIR,
+    workers=CONTRACT_RENDER_WORKERS,
+)
+
+
+@single_flight
+async def render_contract(contract_id: int, force: bool = False) -> Optional[Dict]:
+    """
+    Renders a contract with the application's renderer; see ContractRenderer.render().
+    Concurrent requests for the same contract share one render.
+    """
+    return await contract_renderer.render(contract_id, force)
@@ -0,0 +1,115 @@
+import os
+import re
+import hashlib
+import threading
+from typing import Optional
+
+OBJECT_NAME = re.compile(r"^[0-9a-f]{64}\.[a-z0-9]+$")
+
+
+class ContentStore:
+    """
+    Local content-addressed file store.
+
+    A file is stored once, under the SHA-256 of its bytes (objects/ab/abcdef....pdf),
+    so identical documents share one file and a stored file never changes: its name
+    is also a strong ETag. Refs (refs/<key>) map a caller-defined key, such as a hash
+    of the inputs a document was rendered from, to the object it produced, so an
+    unchanged document can be found again without rendering it.
+
+    Writes go to a temporary file renamed into place, so concurrent writers (threads
+    or processes) of the same content are safe and readers never see partial files.
+
+    Args:
+        directory (str): Root folder of the store.
+        extension (str): Extension of the stored objects.
+    """
+
+    def __init__(self, directory: str, extension: str = "pdf"):
+        self.directory = directory
+        self.extension = extension
+
+    def put(self, data: bytes) -> str:
+        """
+        Stores bytes unless an identical file is already stored.
+
+        Args:
+            data (bytes): The file content.
+
+        Returns:
+            str: The object name, '<sha256>.<extension>'.
+        """
+        name = f"{hashlib.sha256(data).hexdigest()}.{self.extension}"
+        path = self.path(name)
+        if not os.path.exists(path):
+            self._write(path, data)
+        return name
+
+    def path(self, name: str) -> str:
+        """
+        Returns the location of an object.
+
+        Args:
+            name (str): The object name returned by put().
+
+        Returns:
+            str: Path of the object file (which may not exist).
+
+        Raises:
+            ValueError: If the name is not an object name.
+        """
+        if not OBJECT_NAME.match(name or ""):
+            raise ValueError(f"Not a stored object: {name!r}")
+        return os.path.join(self.directory, "objects", name[:2], name)
+
+    def exists(self, name: Optional[str]) -> bool:
+        """
+        Tells whether a name refers to an object present in the store.
+
+        Args:
+            name (Optional[str]): A file name, possibly from before the store existed.
+
+        Returns:
+            bool: True if it is an object name and the file exists.
+        """
+        return bool(name) and OBJECT_NAME.match(name) is not None and os.path.exists(self.path(name))
+
+    def link(self, key: str, name: str) -> None:
+        """
+        Records that `key` produced the object `name`.
+
+        Args:
+            key (str): Hex digest identifying the inputs.
+            name (str): The object name returned by put().
+        """
+        self._write(self._ref_path(key), name.encode())
+
+    def lookup(self, key: str) -> Optional[str]:
+        """
+        Returns the object recorded for `key`, if it is still stored.
+
+        Args:
+            key (str): Hex digest identifying the inputs.
+
+        Returns:
+            Optional[str]: The object name, or None on a miss.
+        """
+        try:
+            with open(self._ref_path(key), "rb") as file:
+                name = file.read().decode()
+        except FileNotFoundError:
+            return None
+        return name if self.exists(name) else None
+
+    def _ref_path(self, key: str) -> str:
+        if not re.fullmatch(r"[0-9a-f]{64}", key):
+            raise ValueError(f"Not a SHA-256 key: {key!r}")
+        return os.path.join(self.directory, "refs", key[:2], key)
+
+    @staticmethod
+    def _write(path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(data)
+        os.replace(temporary, path)
@@ -0,0 +1,309 @@
+import os
+import re
+import asyncio
+import multiprocessing
+from pathlib import Path
+from typing import Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dotenv import load_dotenv
+from db.CRUD.read import get_invoice_render_data
+from db.CRUD.update import claim_invoice_render_jobs, finish_invoice_render_jobs
+from utils.utils_pdf import format_date, format_money, render_text_pdf
+
+# load variables from .env file
+load_dotenv()
+
+# configuration of the invoice PDF pipeline
+INVOICE_RENDER_ENABLED = os.getenv("INVOICE_RENDER_ENABLED", "true").lower() in ("1", "true", "yes")
+# under the repository root by default, whatever directory the process starts in
+INVOICE_PDF_DIR = os.getenv("INVOICE_PDF_DIR", str(Path(__file__).resolve().parents[2] / "storage" / "invoices"))
+INVOICE_RENDER_WORKERS = int(os.getenv("INVOICE_RENDER_WORKERS", os.cpu_count() or 2))
+INVOICE_RENDER_BATCH_SIZE = int(os.getenv("INVOICE_RENDER_BATCH_SIZE", 200))
+INVOICE_RENDER_POLL_SECONDS = float(os.getenv("INVOICE_RENDER_POLL_SECONDS", 2))
+INVOICE_RENDER_STALE_SECONDS = float(os.getenv("INVOICE_RENDER_STALE_SECONDS", 300))
+INVOICE_RENDER_MAX_ATTEMPTS = int(os.getenv("INVOICE_RENDER_MAX_ATTEMPTS", 3))
+
+LINE_WIDTH = 78
+
+
+def invoice_file_name(invoice_id: int, invoice_number: str) -> str:
+    """
+    Returns the PDF file name of an invoice: invoice 7001, 'NF-001', is stored as
+    '7001-nf_001.pdf'.
+
+    The number is only normalized for readability ('NF-001' and 'NF 001' both
+    become 'nf_001'); the ID keeps the names of two invoices apart.
+
+    Args:
+        invoice_id (int): The invoice ID.
+        invoice_number (str): The invoice number.
+
+    Returns:
+        str: A file name safe on every file system.
+    """
+    return f"{invoice_id}-" + re.sub(r"[^a-z0-9]+", "_", invoice_number.lower()).strip("_") + ".pdf"
+
+
+def invoice_lines(invoice: Dict) -> List[str]:
+    """
+    Lays out an invoice as lines of text.
+
+    Args:
+        invoice (Dict): An entry of get_invoice_render_data().
+
+    Returns:
+        List[str]: The lines of the invoice, for render_text_pdf().
+    """
+    order, event, customer = invoice["order"], invoice["event"], invoice["customer"]
+    lines = [
+        f"NOTA FISCAL {invoice['invoice_number']}",
+        f"Emissão: {format_date(invoice['issue_date'])}    Pedido: #{order['id']} ({order['status']})"
+        f"    Data do pedido: {format_date(order['order_date'])}",
+        "",
+        f"Cliente:  {customer['full_name']}",
+        f"CPF/CNPJ: {customer['cpf_cnpj']}",
+        f"E-mail:   {customer['email']}" + (f"    Telefone: {customer['phone']}" if customer.get("phone") else ""),
+        f"Endereço: {customer.get('address') or '-'}",
+        "",
+        f"Evento:   {event['event_type']} em {format_date(event['event_date'], with_time=True)}, {event['location']}",
+        f"          {event['guest_count']} convidados, {event['duration_hours']} h",
+        "",
+        f"{'Produto':<40}{'Qtd':>6}{'Unitário':>16}{'Total':>16}",
+        "-" * LINE_WIDTH,
+    ]
+    lines += [
+        f"{item['product_name'][:39]:<40}{item['quantity']:>6}{format_money(item['unit_price']):>16}{format_money(item['total_price']):>16}"
+        for item in invoice["order_items"]
+    ]
+    lines += [
+        "-" * LINE_WIDTH,
+        f"{'Total da nota':<46}{format_money(invoice['total_amount']):>32}",
+        "",
+    ]
+    if invoice["payments"]:
+        lines.append("Pagamentos:")
+        lines += [
+            f"  {format_date(payment['payment_date']):<12}{payment['payment_method']:<16}{payment['status']:<12}"
+            f"{format_money(payment['amount']):>16}"
+            for payment in invoice["payments"]
+        ]
+    return lines
+
+
+def render_invoice_files(invoices: List[Dict], directory: str) -> List[Dict]:
+    """
+    Renders invoices to PDF files. Runs on the worker processes.
+
+    Each file is written under a temporary name and renamed, so readers never see
+    a partial PDF and a re-render replaces the previous file atomically.
+
+    Args:
+        invoices (List[Dict]): Entries of get_invoice_render_data(), each with its 'job_id'.
+        directory (str): Folder the PDFs are written to.
+
+    Returns:
+        List[Dict]: Per invoice, 'job_id' and either 'pdf_file' (relative to directory) or 'error'.
+    """
+    results = []
+    for invoice in invoices:
+        try:
+            file_name = invoice_file_name(invoice["id"], invoice["invoice_number"])
+            pdf = render_text_pdf(invoice_lines(invoice), title=f"Nota fiscal {invoice['invoice_number']}")
+            path = os.path.join(directory, file_name)
+            temporary = f"{path}.{os.getpid()}.tmp"
+            with open(temporary, "wb") as file:
+                file.write(pdf)
+            os.replace(temporary, path)
+            results.append({"job_id": invoice["job_id"], "pdf_file": file_name})
+        except Exception as e:
+            results.append({"job_id": invoice["job_id"], "error": str(e)})
+    return results
+
+
+class InvoiceRenderer:
+    """
+    Drains the invoice_render_jobs queue, rendering the PDFs on a process pool.
+
+    A dispatcher task on the application's event loop claims queued jobs in
+    batches (claim_invoice_render_jobs), loads the data of the whole batch with
+    one query, splits it among the worker processes and records the results in
+    one transaction. It runs whenever a job is queued on this worker (wake()) and
+    every `poll_seconds`, which picks up jobs queued through other API workers and
+    jobs whose worker died.
+
+    Args:
+        directory (str): Folder the PDFs are written to.
+        workers (int): Number of worker processes. 0 renders inline on the event loop.
+        batch_size (int): Jobs claimed at once.
+        poll_seconds (float): Pause between two looks at the queue when idle.
+        stale_seconds (float): Seconds after which a running job is claimed again.
+        max_attempts (int): Attempts per job before it is marked failed.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        workers: int,
+        batch_size: int,
+        poll_seconds: float,
+        stale_seconds: float,
+        max_attempts: int,
+    ):
+        self.directory = directory
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.stale_seconds = stale_seconds
+        self.max_attempts = max_attempts
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self.rendered = 0
+        self.failed = 0
+
+    def path(self, pdf_file: Optional[str]) -> Optional[str]:
+        """
+        Returns the location of a rendered PDF.
+
+        Args:
+            pdf_file (Optional[str]): The file name recorded in invoices.pdf_file.
+
+        Returns:
+            Optional[str]: Path of the file in `directory`, or None if there is no
+            such file (not rendered yet, or a name that is not a plain file name).
+        """
+        if not pdf_file or os.path.basename(pdf_file) != pdf_file or pdf_file.startswith("."):
+            return None
+        path = os.path.join(self.directory, pdf_file)
+        return path if os.path.isfile(path) else None
+
+    def wake(self) -> None:
+        """
+        Tells the dispatcher a job was queued, so it does not wait for the next poll.
+        """
+        if self._wake is not None:
+            self._wake.set()
+
+    async def start(self) -> None:
+        """
+        Starts the dispatcher on the running event loop.
+        """
+        if self._dispatcher is not None:
+            return
+        self._wake = asyncio.Event()
+        self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch())
+
+    async def stop(self) -> None:
+        """
+        Stops the dispatcher and the worker processes. Jobs being rendered are
+        claimed again after `stale_seconds`.
+        """
+        dispatcher, self._dispatcher = self._dispatcher, None
+        if dispatcher is not None:
+            dispatcher.cancel()
+            try:
+                await dispatcher
+            except asyncio.CancelledError:
+                pass
+        self._wake = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def run_pending(self) -> int:
+        """
+        Renders queued jobs until the queue is empty.
+
+        Returns:
+            int: Number of jobs processed, successful or not.
+        """
+        processed = 0
+        while True:
+            jobs = await claim_invoice_render_jobs(self.batch_size, self.stale_seconds, self.max_attempts)
+            if not jobs:
+                return processed
+            await self._render(jobs)
+            processed += len(jobs)
+
+    async def _render(self, jobs: List[Dict]) -> None:
+        invoices = {
+            invoice["id"]: invoice
+            for invoice in await get_invoice_render_data([job["invoice_id"] for job in jobs])
+        }
+        batch, results = [], []
+        for job in jobs:
+            if job["invoice_id"] in invoices:
+                batch.append({**invoices[job["invoice_id"]], "job_id": job["id"]})
+            else:
+                results.append({"job_id": job["id"], "error": "Invoice not found"})
+
+        os.makedirs(self.directory, exist_ok=True)
+        if self.workers <= 0:
+            results += render_invoice_files(batch, self.directory)
+        else:
+            # one chunk per process: a single round trip to each worker per batch
+            loop = asyncio.get_running_loop()
+            chunks = [batch[start::self.workers] for start in range(self.workers)]
+            try:
+                for part in await asyncio.gather(*(
+                    loop.run_in_executor(self._get_executor(), render_invoice_files, chunk, self.directory)
+                    for chunk in chunks if chunk
+                )):
+                    results += part
+            except BrokenProcessPool as e:
+                # a worker process died: the batch counts as a failed attempt, new ones start next time
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+                results += [{"job_id": invoice["job_id"], "error": f"Worker process failed: {str(e)}"} for invoice in batch]
+
+        await finish_invoice_render_jobs(results, self.max_attempts)
+        failed = sum(1 for result in results if "error" in result)
+        self.rendered += len(results) - failed
+        self.failed += failed
+
+    async def _dispatch(self) -> None:
+        """
+        Runs the queue whenever woken up, and at least every `poll_seconds`.
+        """
+        while True:
+            # cleared first, so a job queued while rendering is not missed
+            self._wake.clear()
+            try:
+                await self.run_pending()
+            except Exception as e:
+                print(f"Invoice renderer error: {str(e)}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """
+        Starts the worker processes on first use, so forked API workers get their own.
+        They are spawned rather than forked: the API process runs threads (password
+        hashing, connection pools) whose locks a forked child could inherit held.
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+
+invoice_renderer = InvoiceRenderer(
+    directory=INVOICE_PDF_DIR,
+    workers=INVOICE_RENDER_WORKERS,
+    batch_size=INVOICE_RENDER_BATCH_SIZE,
+    poll_seconds=INVOICE_RENDER_POLL_SECONDS,
+    stale_seconds=INVOICE_RENDER_STALE_SECONDS,
+    max_attempts=INVOICE_RENDER_MAX_ATTEMPTS,
+)
+
+
+async def start_invoice_renderer() -> None:
+    """
+    Starts the invoice PDF dispatcher unless INVOICE_RENDER_ENABLED is false.
+    """
+    if INVOICE_RENDER_ENABLED:
+        await invoice_renderer.start()
@@ -0,0 +1,53 @@
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def json_default(value: Any) -> Any:
+    """
+    Converts the values orjson cannot serialize on its own.
+
+    datetime, date, UUID and Enum values are handled natively by orjson; Decimal
+    columns (total_amount, base_price, amount, ...) become floats, as they did with
+    FastAPI's jsonable_encoder.
+
+    Args:
+        value (Any): The value orjson could not serialize.
+
+    Returns:
+        Any: A JSON-serializable value.
+
+    Raises:
+        TypeError: If the value type is not supported.
+    """
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serializes content to JSON bytes with orjson.
+
+    Args:
+        content (Any): Dicts, lists and database values to serialize.
+
+    Returns:
+        bytes: The UTF-8 encoded JSON document.
+    """
+    return orjson.dumps(content, default=json_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Default response class of the application, rendering content with orjson.
+
+    Routes returning large lists of database rows should return a FastJSONResponse
+    themselves: FastAPI then sends it as is, skipping the jsonable_encoder pass it
+    runs over every other return value.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,77 @@
+import os
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+
+# load variables from .env file
+load_dotenv()
+
+# Page size used when the client does not send 'limit', and the largest page the server returns
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", 50))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", 200))
+
+
+def clamp_page_size(limit: Optional[int]) -> int:
+    """
+    Normalizes the page size requested by the client.
+
+    Args:
+        limit (Optional[int]): Requested number of items per page.
+
+    Returns:
+        int: Page size between 1 and MAX_PAGE_SIZE.
+    """
+    if not limit or limit < 1:
+        return DEFAULT_PAGE_SIZE
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def build_page(rows: List[Dict], page_size: int, cursor: Callable[[Dict], object] = lambda row: row["id"]) -> Dict:
+    """
+    Builds a keyset-paginated response.
+
+    The reader must be called with ``limit=page_size + 1``: the extra row only tells
+    whether another page exists and is not returned.
+
+    Args:
+        rows (List[Dict]): Rows in cursor order, at most page_size + 1 of them.
+        page_size (int): Number of items in the page.
+        cursor (Callable[[Dict], object]): Builds the cursor from the last item. Defaults to its 'id'.
+
+    Returns:
+        Dict: The page items and the 'next_cursor' to send as 'after', or None on the last page.
+    """
+    items = rows[:page_size]
+    next_cursor = cursor(items[-1]) if len(rows) > page_size else None
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def encode_time_cursor(row: Dict, column: str) -> str:
+    """
+    Builds the cursor of a page ordered by a timestamp column and then by ID.
+
+    Args:
+        row (Dict): Last row of the page.
+        column (str): The timestamp column, e.g. 'event_date'.
+
+    Returns:
+        str: '<ISO timestamp>_<id>', to send back as 'after'.
+    """
+    return f"{row[column].isoformat()}_{row['id']}"
+
+
+def decode_time_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Parses a cursor built by encode_time_cursor().
+
+    Args:
+        cursor (str): The cursor sent by the client.
+
+    Returns:
+        Tuple[datetime, int]: The timestamp and ID of the last row already returned.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    timestamp, _, row_id = cursor.rpartition("_")
+    return datetime.fromisoformat(timestamp), int(row_id)
@@ -0,0 +1,106 @@
+from typing import List, Optional, Sequence
+
+# A4 in points, with the text block used by render_text_pdf
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842
+MARGIN = 56
+FONT_SIZE = 10
+LEADING = 14
+LINES_PER_PAGE = (PAGE_HEIGHT - 2 * MARGIN) // LEADING
+
+
+def format_money(value: float) -> str:
+    """
+    Formats an amount in reais: 1234.5 becomes 'R$ 1.234,50'.
+
+    Args:
+        value (float): The amount.
+
+    Returns:
+        str: The formatted amount.
+    """
+    return "R$ " + f"{float(value):,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+def format_date(value: Optional[str], with_time: bool = False) -> str:
+    """
+    Formats an ISO date as DD/MM/YYYY, optionally followed by HH:MM.
+
+    Args:
+        value (Optional[str]): An ISO date or timestamp, as returned by the JSON queries.
+        with_time (bool): Whether to include the time.
+
+    Returns:
+        str: The formatted date, or '-' if there is none.
+    """
+    if not value:
+        return "-"
+    day, _, time = value.partition("T")
+    year, month, day = day.split("-")
+    return f"{day}/{month}/{year}" + (f" {time[:5]}" if with_time and time else "")
+
+
+def _escape(text: str) -> bytes:
+    """
+    Encodes a line for a PDF string literal in WinAnsiEncoding (cp1252), which
+    covers Portuguese accents; other characters become '?'.
+    """
+    encoded = text.encode("cp1252", errors="replace")
+    return encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def render_text_pdf(lines: Sequence[str], title: str = "") -> bytes:
+    """
+    Lays out lines of text on A4 pages in a monospaced font.
+
+    A minimal PDF 1.4 writer: one Courier font object, one content stream per page
+    and the cross-reference table, without any third-party dependency, so it can run
+    in worker processes cheaply.
+
+    Args:
+        lines (Sequence[str]): The lines to print, top to bottom. A line holding only
+            a form feed ('\\f') starts a new page.
+        title (str): Document title, stored in the PDF metadata.
+
+    Returns:
+        bytes: The PDF file.
+    """
+    pages: List[List[str]] = [[]]
+    for line in lines:
+        if line == "\f" or len(pages[-1]) == LINES_PER_PAGE:
+            pages.append([])
+            if line == "\f":
+                continue
+        pages[-1].append(line)
+
+    # objects 1-4 are fixed; each page adds a page object and its content stream
+    objects: List[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # page tree, filled in once the page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding >>",
+        b"<< /Title (" + _escape(title) + b") /Producer (Elo Drinks) >>",
+    ]
+    page_refs = []
+    for page in pages:
+        text = b"\n".join(b"(" + _escape(line) + b") Tj T*" for line in page)
+        stream = (
+            b"BT /F1 %d Tf %d TL %d %d Td\n" % (FONT_SIZE, LEADING, MARGIN, PAGE_HEIGHT - MARGIN)
+            + text + b"\nET"
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Resources << /Font << /F1 3 0 R >> >> "
+            b"/Contents %d 0 R >>" % (PAGE_WIDTH, PAGE_HEIGHT, len(objects))
+        )
+        page_refs.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [" + b" ".join(page_refs) + b"] /Count %d >>" % len(pages)
+
+    output = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R /Info 4 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(output)
@@ -0,0 +1,150 @@
+import os
+from typing import Dict, List, NamedTuple, Sequence
+import numpy as np
+from dotenv import load_dotenv
+
+# load variables from .env file
+load_dotenv()
+
+# consumption rules of the quote estimator
+QUOTE_DRINKS_PER_GUEST_HOUR = float(os.getenv("QUOTE_DRINKS_PER_GUEST_HOUR", 1.0))
+QUOTE_GUESTS_PER_STRUCTURE = float(os.getenv("QUOTE_GUESTS_PER_STRUCTURE", 100))
+QUOTE_GUESTS_PER_SERVICE = float(os.getenv("QUOTE_GUESTS_PER_SERVICE", 50))
+QUOTE_MAX_SCENARIOS = int(os.getenv("QUOTE_MAX_SCENARIOS", 1000))
+
+# Units of every product of a category for one event:
+#   ceil(guests * hours * per_guest_hour + guests / guests_per_unit)
+# A 'shared' category splits its consumption among its products (a guest drinks
+# one drink or another); the others need each of their products in full.
+CONSUMPTION_RULES: Dict[str, Dict] = {
+    "drink": {"per_guest_hour": QUOTE_DRINKS_PER_GUEST_HOUR, "guests_per_unit": 0, "shared": True},
+    "structure": {"per_guest_hour": 0, "guests_per_unit": QUOTE_GUESTS_PER_STRUCTURE, "shared": False},
+    "service": {"per_guest_hour": 0, "guests_per_unit": QUOTE_GUESTS_PER_SERVICE, "shared": False},
+}
+CATEGORIES = list(CONSUMPTION_RULES)
+
+
+class QuoteCatalog(NamedTuple):
+    """
+    The active products as arrays, one position per product, for the estimator.
+
+    Attributes:
+        products (List[Dict]): id, name and category of each product.
+        price_cents (np.ndarray): Base prices in cents (int64), so totals are exact.
+        per_guest_hour (np.ndarray): Units per guest per hour of each product.
+        per_guest (np.ndarray): Units per guest of each product.
+        category_mask (np.ndarray): One row per product, one column per CATEGORIES entry.
+    """
+
+    products: List[Dict]
+    price_cents: np.ndarray
+    per_guest_hour: np.ndarray
+    per_guest: np.ndarray
+    category_mask: np.ndarray
+
+
+def build_quote_catalog(products: Sequence[Dict]) -> QuoteCatalog:
+    """
+    Turns product rows into the arrays the estimator works on.
+
+    Inactive products and categories without a consumption rule are left out.
+
+    Args:
+        products (Sequence[Dict]): Product rows, as returned by get_all_products().
+
+    Returns:
+        QuoteCatalog: The active catalog with the coefficients of its rules.
+    """
+    rows = [product for product in products if product.get("active", True) and product["category"] in CONSUMPTION_RULES]
+    categories = np.array([CATEGORIES.index(product["category"]) for product in rows], dtype=np.int64)
+    counts = np.bincount(categories, minlength=len(CATEGORIES))
+
+    per_guest_hour = np.array([CONSUMPTION_RULES[name]["per_guest_hour"] for name in CATEGORIES], dtype=np.float64)
+    per_guest = np.array(
+        [1 / rule["guests_per_unit"] if rule["guests_per_unit"] else 0.0 for rule in CONSUMPTION_RULES.values()],
+        dtype=np.float64,
+    )
+    shared = np.array([rule["shared"] for rule in CONSUMPTION_RULES.values()])
+    share = np.where(shared, 1 / np.maximum(counts, 1), 1.0)
+
+    return QuoteCatalog(
+        products=[{"product_id": p["id"], "name": p["name"], "category": p["category"]} for p in rows],
+        price_cents=np.array([round(float(p["base_price"]) * 100) for p in rows], dtype=np.int64),
+        per_guest_hour=(per_guest_hour * share)[categories],
+        per_guest=(per_guest * share)[categories],
+        category_mask=(categories[:, None] == np.arange(len(CATEGORIES))).astype(np.int64),
+    )
+
+
+def estimate_quantities(catalog: QuoteCatalog, guest_counts: Sequence[int], duration_hours: Sequence[int]) -> np.ndarray:
+    """
+    Computes the units of every product for every scenario in one pass.
+
+    Args:
+        catalog (QuoteCatalog): The active catalog.
+        guest_counts (Sequence[int]): Guests of each scenario.
+        duration_hours (Sequence[int]): Duration in hours of each scenario.
+
+    Returns:
+        np.ndarray: int64 matrix with one row per scenario and one column per product.
+    """
+    guests = np.asarray(guest_counts, dtype=np.float64)[:, None]
+    hours = np.asarray(duration_hours, dtype=np.float64)[:, None]
+    units = guests * hours * catalog.per_guest_hour + guests * catalog.per_guest
+    # rounded first so that 100 guests / 100 per unit is not 1.0000000001 units
+    return np.ceil(np.round(units, 6)).astype(np.int64)
+
+
+def estimate_scenarios(
+    catalog: QuoteCatalog, guest_counts: Sequence[int], duration_hours: Sequence[int]
+) -> List[Dict]:
+    """
+    Prices many guest count / duration combinations at once.
+
+    Args:
+        catalog (QuoteCatalog): The active catalog.
+        guest_counts (Sequence[int]): Guests of each scenario.
+        duration_hours (Sequence[int]): Duration in hours of each scenario.
+
+    Returns:
+        List[Dict]: Per scenario, in order: 'guest_count', 'duration_hours',
+            'subtotals' per category and 'total_amount'.
+    """
+    quantities = estimate_quantities(catalog, guest_counts, duration_hours)
+    subtotals = (quantities * catalog.price_cents) @ catalog.category_mask
+    totals = subtotals.sum(axis=1)
+    return [
+        {
+            "guest_count": int(guests),
+            "duration_hours": int(hours),
+            "subtotals": {name: int(cents) / 100 for name, cents in zip(CATEGORIES, row)},
+            "total_amount": int(total) / 100,
+        }
+        for guests, hours, row, total in zip(guest_counts, duration_hours, subtotals.tolist(), totals.tolist())
+    ]
+
+
+def estimate_bill_of_materials(catalog: QuoteCatalog, guest_count: int, duration_hours: int) -> Dict:
+    """
+    Prices one event product by product.
+
+    Args:
+        catalog (QuoteCatalog): The active catalog.
+        guest_count (int): Guests of the event.
+        duration_hours (int): Duration of the event in hours.
+
+    Returns:
+        Dict: The scenario totals of estimate_scenarios() plus 'items', with
+            product_id, name, category, quantity, unit_price and total_price.
+    """
+    quantities = estimate_quantities(catalog, [guest_count], [duration_hours])[0]
+    line_totals = quantities * catalog.price_cents
+    quote = estimate_scenarios(catalog, [guest_count], [duration_hours])[0]
+    quote["items"] = [
+        {**product, "quantity": quantity, "unit_price": price / 100, "total_price": total / 100}
+        for product, quantity, price, total in zip(
+            catalog.products, quantities.tolist(), catalog.price_cents.tolist(), line_totals.tolist()
+        )
+        if quantity > 0
+    ]
+    return quote
@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from fastapi import HTTPException
+from db.CRUD.read import get_location_bookings
+
+
+def event_end(event_date: datetime, duration_hours: int) -> datetime:
+    """
+    Returns the moment an event frees its location.
+
+    Args:
+        event_date (datetime): Start of the event.
+        duration_hours (int): Duration of the event in hours.
+
+    Returns:
+        datetime: event_date plus duration_hours.
+    """
+    return event_date + timedelta(hours=duration_hours)
+
+
+def free_slots(
+    bookings: List[Dict],
+    date_from: datetime,
+    date_to: datetime,
+    min_duration: timedelta = timedelta(0),
+) -> List[Dict]:
+    """
+    Computes the free periods of a location between two dates.
+
+    Args:
+        bookings (List[Dict]): Events with 'start' and 'end', ordered by start, as
+            returned by get_location_bookings().
+        date_from (datetime): Start of the range.
+        date_to (datetime): End of the range.
+        min_duration (timedelta): Shorter free periods are left out.
+
+    Returns:
+        List[Dict]: Free periods with 'start' and 'end', in order.
+    """
+    slots = []
+    free_from = date_from
+    for booking in bookings:
+        if booking["start"] > free_from and booking["start"] - free_from >= min_duration:
+            slots.append({"start": free_from, "end": min(booking["start"], date_to)})
+        free_from = max(free_from, booking["end"])
+    if date_to > free_from and date_to - free_from >= min_duration:
+        slots.append({"start": free_from, "end": date_to})
+    return slots
+
+
+async def booking_conflict(
+    location: str,
+    event_date: datetime,
+    duration_hours: int,
+    exclude_event_id: Optional[int] = None,
+) -> HTTPException:
+    """
+    Builds the 409 answer for an event rejected by the events_no_overlap constraint.
+
+    Args:
+        location (str): Location of the rejected event.
+        event_date (datetime): Start of the rejected event.
+        duration_hours (int): Duration of the rejected event in hours.
+        exclude_event_id (Optional[int]): The event being rescheduled, if any.
+
+    Returns:
+        HTTPException: 409 listing the events already booked at that location and time.
+    """
+    if isinstance(event_date, str):
+        event_date = datetime.fromisoformat(event_date)
+    bookings = await get_location_bookings(
+        location, event_date, event_end(event_date, duration_hours), exclude_event_id
+    )
+    return HTTPException(
+        status_code=409,
+        detail={
+            "message": f"'{location}' is already booked at that time.",
+            "conflicts": [
+                {"id": booking["id"], "start": booking["start"].isoformat(), "end": booking["end"].isoformat()}
+                for booking in bookings
+            ],
+        },
+    )
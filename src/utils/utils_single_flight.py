@@ -0,0 +1,107 @@
+import os
+import asyncio
+import inspect
+import functools
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+from dotenv import load_dotenv
+from utils.utils_metrics import registry
+
+# load variables from .env file
+load_dotenv()
+
+# Set to false to run every call on its own, even for functions marked @single_flight
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() in ("1", "true", "yes")
+
+single_flight_calls_total = registry.counter(
+    "single_flight_calls_total", "Calls that ran the wrapped function, by function.", ("function",)
+)
+single_flight_collapsed_total = registry.counter(
+    "single_flight_collapsed_total", "Calls that shared the result of an identical call in flight.", ("function",)
+)
+
+
+def _forget(in_flight: Dict, key: Hashable, task: asyncio.Task) -> None:
+    """
+    Removes a finished call, so the next identical call runs again.
+    """
+    if in_flight.get(key) is task:
+        del in_flight[key]
+    if not task.cancelled():
+        # mark the exception as retrieved even if every caller went away
+        task.exception()
+
+
+def single_flight(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """
+    Makes concurrent calls with the same arguments share one execution.
+
+    The first call starts the function; identical calls made while it is still
+    running wait for it and receive the same result (or exception) instead of
+    running their own query. Nothing is cached: once the call finishes, the next
+    one runs again. Callers share the returned object, so they must not modify it.
+
+    Arguments are matched after binding them to the signature, so f(1) and
+    f(event_id=1) share a call. Calls with unhashable arguments run on their own.
+    Set SINGLE_FLIGHT_ENABLED=false to disable coalescing everywhere.
+
+    A joined call may have started before a write committed. Writers in this
+    process call the wrapper's invalidate() after committing, so later calls start
+    a new execution instead; a write made by another process can still be missed
+    by calls joining a query that was already running, as with any read racing it.
+
+    Args:
+        func (Callable[..., Awaitable[Any]]): The async read function to wrap.
+
+    Returns:
+        Callable[..., Awaitable[Any]]: The wrapped function.
+
+    Example:
+        >>> @single_flight
+        ... async def get_all_products(limit=None, after=None): ...
+    """
+    name = func.__name__
+    signature = inspect.signature(func)
+    # in-flight calls per event loop, since tasks cannot be awaited from another loop
+    in_flight: Dict[Tuple[asyncio.AbstractEventLoop, int, Hashable], asyncio.Task] = {}
+    # bumped by invalidate(): calls made afterwards never join an older execution
+    generation = 0
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        if not SINGLE_FLIGHT_ENABLED:
+            return await func(*args, **kwargs)
+
+        try:
+            bound = signature.bind(*args, **kwargs)
+        except TypeError:
+            # let the function report the wrong arguments
+            return await func(*args, **kwargs)
+        bound.apply_defaults()
+        loop = asyncio.get_running_loop()
+        key = (loop, generation, tuple(bound.arguments.items()))
+        try:
+            task = in_flight.get(key)
+        except TypeError:
+            return await func(*args, **kwargs)
+
+        if task is None:
+            single_flight_calls_total.inc((name,))
+            task = loop.create_task(func(*args, **kwargs))
+            in_flight[key] = task
+            task.add_done_callback(functools.partial(_forget, in_flight, key))
+        else:
+            single_flight_collapsed_total.inc((name,))
+
+        # shield: a caller that goes away must not cancel the query the others wait for
+        return await asyncio.shield(task)
+
+    def invalidate() -> None:
+        """
+        Makes the next calls start a new execution instead of joining one that began
+        before a write. Call it after the write commits.
+        """
+        nonlocal generation
+        generation += 1
+
+    wrapper.invalidate = invalidate
+    return wrapper
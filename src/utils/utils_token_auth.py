@@ -4,6 +4,7 @@ from typing import Dict
 from typing import Optional
 from dotenv import load_dotenv
 from db.CRUD.read import get_customer_by_email
+from utils.utils_cache import user_cache
 from fastapi.security import OAuth2PasswordBearer
 from datetime import datetime, timedelta, timezone
 from fastapi import Depends, HTTPException, status
@@ -49,6 +50,9 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> Dict:
     """
     Decodes the JWT and retrieves the authenticated user data.
 
+    Users are cached in memory (see utils.utils_cache.user_cache) so most requests
+    skip the customers query; the entry is dropped when the customer is updated or deleted.
+
     Args:
         token (str): The JWT token provided in the request.
 
@@ -68,16 +72,22 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> Dict:
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        # Fetch the user from the database using the extracted email
-        user = await get_customer_by_email(email)
+        # Serve the user from the cache, falling back to the database using the extracted email
+        user = user_cache.get(email)
         if user is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-
-        return user
+            # an invalidation arriving while the row is read keeps it out of the cache
+            generation = user_cache.generation()
+            user = await get_customer_by_email(email)
+            if user is None:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="User not found",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+            user_cache.set(email, user, generation)
+
+        # Return a copy so route handlers cannot alter the cached record
+        return dict(user)
 
     except jwt.ExpiredSignatureError:
         raise HTTPException(
@@ -91,3 +101,24 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> Dict:
             detail="Invalid token",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+
+async def get_current_admin(current_user: Dict = Depends(get_current_user)) -> Dict:
+    """
+    Ensures the authenticated user is an administrator.
+
+    Args:
+        current_user (Dict): The authenticated user.
+
+    Returns:
+        Dict: The authenticated administrator's data.
+
+    Raises:
+        HTTPException: If the user is not an administrator.
+    """
+    if current_user.get("role") != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Administrator access required",
+        )
+    return current_user
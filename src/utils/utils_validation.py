@@ -1,11 +1,23 @@
+import os
 import re
+import asyncio
+from typing import Callable, List, Optional
+from dotenv import load_dotenv
 from fastapi import HTTPException
 from passlib.context import CryptContext
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 
+# load variables from .env file
+load_dotenv()
 
 # Initialize the bcrypt context for password hashing and verification
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# configuration of the worker pool that runs bcrypt off the event loop
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 2))
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", 32))
+PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+
 
 def get_password_hash(password: str) -> str:
     """
@@ -34,6 +46,161 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and verification on a bounded worker pool.
+
+    bcrypt costs hundreds of milliseconds of CPU per call, so running it inside an
+    async route stalls every other request on the worker. Calls are handed to a thread
+    pool (bcrypt releases the GIL) or a process pool, and once ``queue_limit`` calls are
+    queued or running, new ones are rejected right away with HTTP 503.
+
+    Args:
+        workers (int): Number of worker threads/processes. 0 runs bcrypt inline.
+        queue_limit (int): Maximum number of calls queued or running at once.
+        use_processes (bool): Use a process pool instead of a thread pool.
+    """
+
+    def __init__(self, workers: int, queue_limit: int, use_processes: bool = False):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.use_processes = use_processes
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self.rejected = 0
+
+    async def hash(self, password: str) -> str:
+        """
+        Generates a bcrypt hash without blocking the event loop.
+
+        Args:
+            password (str): The plain text password to hash.
+
+        Returns:
+            str: The bcrypt hash of the password.
+        """
+        return await self._submit(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Verifies a password against its hash without blocking the event loop.
+
+        Args:
+            plain_password (str): The plain text password.
+            hashed_password (str): The hashed password to verify against.
+
+        Returns:
+            bool: True if the passwords match, False otherwise.
+        """
+        return await self._submit(verify_password, plain_password, hashed_password)
+
+    async def hash_many(self, passwords: List[str]) -> List[str]:
+        """
+        Hashes a batch of passwords in parallel, for bulk imports.
+
+        At most half of the queue is used at once, so logins and registrations
+        running meanwhile are not rejected because of the import.
+
+        Args:
+            passwords (List[str]): The plain text passwords to hash.
+
+        Returns:
+            List[str]: The bcrypt hashes, in the order of `passwords`.
+        """
+        if self.workers <= 0:
+            return [get_password_hash(password) for password in passwords]
+
+        slots = asyncio.Semaphore(max(1, min(self.workers, self.queue_limit // 2)))
+
+        async def hash_one(password: str) -> str:
+            async with slots:
+                return await self.hash(password)
+
+        return list(await asyncio.gather(*(hash_one(password) for password in passwords)))
+
+    def shutdown(self) -> None:
+        """
+        Stops the worker pool. A new one is started on the next call.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _submit(self, func: Callable, *args):
+        """
+        Runs func on the worker pool, rejecting the call if the queue is full.
+        """
+        if self.workers <= 0:
+            return func(*args)
+
+        if self._pending >= self.queue_limit:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Too many password operations in progress, try again shortly.",
+                headers={"Retry-After": "1"},
+            )
+
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._pending -= 1
+
+    def _get_executor(self) -> Executor:
+        """
+        Starts the worker pool on first use, so forked workers get their own.
+        """
+        if self._executor is None:
+            if self.use_processes:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hash"
+                )
+        return self._executor
+
+
+password_hasher = PasswordHasher(
+    workers=PASSWORD_HASH_WORKERS,
+    queue_limit=PASSWORD_HASH_QUEUE_LIMIT,
+    use_processes=PASSWORD_HASH_EXECUTOR == "process",
+)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Generate a bcrypt hash for the given password on the password worker pool.
+
+    Args:
+        password (str): The plain text password to hash.
+
+    Returns:
+        str: The bcrypt hash of the password.
+
+    Raises:
+        HTTPException: If the worker pool queue is full (503).
+    """
+    return await password_hasher.hash(password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password against its hash on the password worker pool.
+
+    Args:
+        plain_password (str): The plain text password.
+        hashed_password (str): The hashed password to verify against.
+
+    Returns:
+        bool: True if the passwords match, False otherwise.
+
+    Raises:
+        HTTPException: If the worker pool queue is full (503).
+    """
+    return await password_hasher.verify(plain_password, hashed_password)
+
+
 def validate_password_strength(password: str) -> None:
     """
     Validate the strength of the given password.